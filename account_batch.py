@@ -0,0 +1,88 @@
+import os
+from sf_api import query_all, child_records, soql_in_lists
+from catalog import product_catalog
+from account_data import PAGE_SIZE, ORDER_SELECT, build_order_data
+from dashboard import ORDERS_RELATIONSHIP, QUOTES_RELATIONSHIP, compute_dashboards
+from quotes import build_quote_lines, quote_lines_in_soql
+from pagination import split_page
+from fanout import fan_out
+
+# Most account names accepted by one batch request
+MAX_BATCH_ACCOUNTS = int(os.getenv('MAX_BATCH_ACCOUNTS', 100))
+
+# First page (plus one row, for next_cursor) of each Account's orders and open
+# quotes, in the same order as /api/account-data
+_ORDERS_SUBQUERY = (f"(SELECT Id, gii__OrderDate__c FROM {ORDERS_RELATIONSHIP} "
+                    f"ORDER BY gii__OrderDate__c DESC NULLS LAST, Id DESC LIMIT {PAGE_SIZE + 1})")
+_QUOTES_SUBQUERY = (f"(SELECT Id, Name, gii__Status__c, gii__QuoteDate__c FROM {QUOTES_RELATIONSHIP} "
+                    f"WHERE gii__Status__c = 'Open' "
+                    f"ORDER BY gii__QuoteDate__c DESC NULLS LAST, Id DESC LIMIT {PAGE_SIZE + 1})")
+
+
+def _records_by_id(soql_for_in_list, ids):
+    records = []
+    for in_list in soql_in_lists(ids):
+        records.extend(query_all(soql_for_in_list(in_list)))
+    return records
+
+
+def load_accounts_batch(account_names, instance_url):
+    """
+    Loads the dashboard and the first orders and quotes page of many
+    Accounts with a fixed number of queries, however many names are given:
+
+    1. Account fields (Name IN (...)) with the newest order Ids and open
+       quotes as subqueries, then the open counts grouped by Account
+       (dashboard.compute_dashboards, two composite batches).
+    2. In parallel, the orders with their lines and shipments (Id IN (...))
+       and the lines of all those quotes (gii__SalesQuote__c IN (...)).
+
+    Returns {"accounts": {name: {...}}, "not_found": [names]}, where each
+    account has "dashboard", "orders", "quotes" and the next_cursor of each
+    list for paging on with /api/account-data.
+    """
+    names = list(dict.fromkeys(name.strip() for name in account_names if name and name.strip()))
+    loaded = compute_dashboards(names, subqueries=[_ORDERS_SUBQUERY, _QUOTES_SUBQUERY])
+
+    pages = {}
+    order_ids, quote_ids = [], []
+    for account_id, (account, body) in loaded.items():
+        orders, orders_cursor = split_page(child_records(account, ORDERS_RELATIONSHIP), "gii__OrderDate__c", PAGE_SIZE)
+        quotes, quotes_cursor = split_page(child_records(account, QUOTES_RELATIONSHIP), "gii__QuoteDate__c", PAGE_SIZE)
+        pages[account_id] = (orders, orders_cursor, quotes, quotes_cursor)
+        order_ids += [order["Id"] for order in orders]
+        quote_ids += [quote["Id"] for quote in quotes]
+
+    order_records, quote_lines = fan_out(
+        lambda: _records_by_id(lambda in_list: f"SELECT {ORDER_SELECT} FROM gii__SalesOrder__c WHERE Id IN ({in_list})",
+                               order_ids),
+        lambda: _records_by_id(quote_lines_in_soql, quote_ids)
+    )
+    orders_by_id = {order["Id"]: order for order in order_records}
+    lines_by_quote = {}
+    for line in quote_lines:
+        lines_by_quote.setdefault(line["gii__SalesQuote__c"], []).append(line)
+    product_details = product_catalog.get_product_details_many(line["gii__Product__c"] for line in quote_lines)
+
+    by_name = {}
+    for account_id, (account, body) in loaded.items():
+        orders, orders_cursor, quotes, quotes_cursor = pages[account_id]
+        by_name[account["Name"].lower()] = {
+            "dashboard": body,
+            "orders": [build_order_data(orders_by_id[order["Id"]], instance_url)
+                       for order in orders if order["Id"] in orders_by_id],
+            "orders_next_cursor": orders_cursor,
+            "quotes": [{"name": quote["Name"],
+                        "status": quote["gii__Status__c"],
+                        "lines": build_quote_lines(lines_by_quote.get(quote["Id"], []), product_details)}
+                       for quote in quotes],
+            "quotes_next_cursor": quotes_cursor,
+        }
+
+    result = {"accounts": {}, "not_found": []}
+    for name in names:
+        if name.lower() in by_name:
+            result["accounts"][name] = by_name[name.lower()]
+        else:
+            result["not_found"].append(name)
+    return result
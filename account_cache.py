@@ -0,0 +1,77 @@
+import os
+import threading
+import time
+from sf_api import query, soql_escape
+
+ACCOUNT_FIELDS = ["Id", "ShippingStreet", "ShippingCity", "ShippingState", "ShippingPostalCode", "ShippingCountry"]
+
+
+class AccountCache:
+    """
+    Caches the Account Id by site name (e.g. "Amazon LAX9").
+
+    Hits live for ACCOUNT_CACHE_TTL seconds and "not found" results for
+    ACCOUNT_CACHE_NEGATIVE_TTL seconds. Only the Id is kept: it never changes,
+    whereas the shipping address can be PATCHed through any gunicorn worker,
+    so routes that show or compare the address call with_address(), which
+    always reads it from Salesforce. Call invalidate() after creating an
+    account that was previously missing; a result whose query started before
+    that is not stored.
+    """
+
+    def __init__(self, ttl=None, negative_ttl=None):
+        self.ttl = ttl if ttl is not None else int(os.getenv('ACCOUNT_CACHE_TTL', 300))
+        self.negative_ttl = (negative_ttl if negative_ttl is not None
+                             else int(os.getenv('ACCOUNT_CACHE_NEGATIVE_TTL', 60)))
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> (expires_at, {"Id": ...} or None)
+        self._invalidated_at = {}  # key -> time of the last invalidate()
+
+    @staticmethod
+    def _key(name):
+        # SOQL Name comparisons are case-insensitive
+        return (name or "").strip().lower()
+
+    def _store(self, name, record, computed_at):
+        record = {"Id": record.get("Id")} if record else None
+        ttl = self.ttl if record else self.negative_ttl
+        key = self._key(name)
+        with self._lock:
+            if computed_at < self._invalidated_at.get(key, 0.0):
+                return
+            self._entries[key] = (time.time() + ttl, record)
+
+    def _fetch(self, name, fields):
+        soql = f"SELECT {', '.join(fields)} FROM Account WHERE Name = '{soql_escape(name)}' LIMIT 1"
+        started = time.time()
+        records = query(soql).get("records", [])
+        record = {field: records[0].get(field) for field in fields} if records else None
+        self._store(name, record, started)
+        return record
+
+    def get(self, name):
+        """Returns {"Id": ...} for the named Account, or None if it does not exist."""
+        entry = self._entries.get(self._key(name))
+        if entry and entry[0] > time.time():
+            return dict(entry[1]) if entry[1] else None
+        return self._fetch(name, ["Id"])
+
+    def with_address(self, name):
+        """Returns {"Id", "Shipping*"...} read from Salesforce now, or None if the Account does not exist."""
+        return self._fetch(name, ACCOUNT_FIELDS)
+
+    def prime(self, name, record, computed_at):
+        """
+        Stores a result another query already fetched (record may be None for
+        "not found"). computed_at is the time.time() taken before that query.
+        """
+        self._store(name, record, computed_at)
+
+    def invalidate(self, name):
+        key = self._key(name)
+        with self._lock:
+            self._invalidated_at[key] = time.time()
+            self._entries.pop(key, None)
+
+
+account_cache = AccountCache()
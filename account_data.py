@@ -0,0 +1,91 @@
+import os
+from sf_api import query, child_records, soql_escape
+from pagination import page_soql, split_page
+
+PAGE_SIZE = 5
+
+# Child relationship names of the gii__SalesOrder__c lookups on order lines and
+# shipments; override them if the org uses different names.
+ORDER_LINES_RELATIONSHIP = os.getenv('SF_ORDER_LINES_RELATIONSHIP', 'gii__SalesOrderLine__r')
+SHIPMENTS_RELATIONSHIP = os.getenv('SF_SHIPMENTS_RELATIONSHIP', 'gii__Shipment__r')
+
+
+def price_to_float(price):
+    # Convert price to float, handle "N/A" case
+    try:
+        return float(price) if price != "N/A" else 0.0
+    except (ValueError, TypeError):
+        return 0.0
+
+
+# Order fields plus the line and shipment subqueries build_order_data() reads
+ORDER_SELECT = f"""Id, Name, gii__Status__c, gii__OrderType__c, gii__OrderStatus__c,
+        gii__SalesQuote__c, gii__SalesQuote__r.Quote_Name__c, gii__OrderDate__c, gii__CustomerPONumber__c,
+        (SELECT Id, gii__Product__c, gii__OrderQuantity__c,
+            gii__Product__r.Name, gii__Product__r.Amazon_Price__c, gii__Product__r.gii__Description__c
+         FROM {ORDER_LINES_RELATIONSHIP}),
+        (SELECT Id, Tracking_Link_Custom__c, gii__ShipmentStatus__c
+         FROM {SHIPMENTS_RELATIONSHIP})"""
+
+
+def orders_page_soql(account_id, page=1, after=None):
+    """
+    One orders-tab page as a single parent-child SOQL query: the orders, their
+    lines (with gii__Product__r fields) and their shipments. `after` is a
+    decoded cursor (see pagination.py) and takes the place of `page`.
+    """
+    keyset, tail = page_soql("gii__OrderDate__c", PAGE_SIZE, page, after)
+    return f"""
+    SELECT {ORDER_SELECT}
+    FROM gii__SalesOrder__c
+    WHERE gii__Account__c = '{soql_escape(account_id)}'{keyset}
+    {tail}
+    """
+
+
+def open_orders_count_soql(account_id):
+    return (f"SELECT COUNT() FROM gii__SalesOrder__c "
+            f"WHERE gii__Account__c = '{soql_escape(account_id)}' AND gii__Status__c = 'Open'")
+
+
+def load_orders_page(account_id, page=1, after=None):
+    """Returns (orders, next_cursor or None)."""
+    records = query(orders_page_soql(account_id, page, after)).get("records", [])
+    return split_page(records, "gii__OrderDate__c", PAGE_SIZE)
+
+
+def build_order_data(order, instance_url):
+    """Turns one record from load_orders_page into the orders-tab JSON shape."""
+    # Get related quote information if exists
+    quote_id = order.get('gii__SalesQuote__c')
+    quote_name = order.get('gii__SalesQuote__r', {}).get('Name') if order.get('gii__SalesQuote__r') else None
+    quote_link = f"{instance_url}/lightning/r/gii__SalesQuote__c/{quote_id}/view" if quote_id else None
+    shipments = [
+        {
+            "tracking_link": rec.get("Tracking_Link_Custom__c"),
+            "shipment_status": rec.get("gii__ShipmentStatus__c"),
+        }
+        for rec in child_records(order, SHIPMENTS_RELATIONSHIP)
+    ]
+
+    order_data = {
+        "name": order['gii__CustomerPONumber__c'],
+        "status": order['gii__Status__c'],
+        "quote_id": quote_id,
+        "quote_name": quote_name,
+        "quote_link": quote_link,
+        "lines": [],
+        "shipments": shipments
+    }
+    if shipments and shipments[0].get("tracking_link") and order_data['status'].lower() == "open":
+        order_data['status'] = "Shipped"
+
+    for line in child_records(order, ORDER_LINES_RELATIONSHIP):
+        product = line.get("gii__Product__r") or {}
+        order_data["lines"].append({
+            "name": product.get("Name", "Unknown"),
+            "qty": line['gii__OrderQuantity__c'],
+            "price": price_to_float(product.get("Amazon_Price__c", "N/A")),
+            "description": product.get("gii__Description__c", "N/A")
+        })
+    return order_data
@@ -1,9 +1,29 @@
-from flask import request, jsonify
+from flask import request, jsonify, Response
 from flask_cors import CORS
 from flask import Flask
 import requests
 import urllib.parse
-from check_sf_token import get_salesforce_access_token
+from check_sf_token import token_manager, salesforce_request
+from http_clients import memberstack_session
+from sf_api import create_sales_quote_with_lines, QuoteGraphError
+from catalog import product_catalog
+from account_cache import account_cache
+from account_data import load_orders_page, build_order_data, open_orders_count_soql
+from account_batch import load_accounts_batch, MAX_BATCH_ACCOUNTS
+from exports import (iter_orders, iter_quotes, to_ndjson, to_csv, load_quotes_pdf_data, quote_pdfs_zip,
+                     MAX_BULK_QUOTES)
+from dashboard import dashboard_cache, load_dashboard, start_snapshot_refresh
+from quotes import (quotes_page_soql, open_quotes_count_soql, quote_lines_soql,
+                    quote_lines_by_name_soql, quote_details_soql, parse_quote_details,
+                    build_quote_lines, build_pdf_data, format_shipping_address)
+from sf_api import query, soql_escape
+from fanout import fan_out
+from pagination import decode_cursor, split_page
+from http_cache import conditional, data_etag, not_modified
+from compression import compress_response
+from pdf_cache import pdf_cache
+from pdf_pool import pdf_render_pool, PdfPoolBusy, PdfRenderTimeout
+from sites import account_mirror
 from datetime import datetime
 import threading
 import smtplib
@@ -13,7 +33,6 @@ import re
 import os
 from dotenv import load_dotenv
 from pdf_creator_1 import (send_test_email_with_pdf, 
-                           build_quote_pdf_bytes, 
                            send_contact_created_email,
                            send_account_address_changed_email,
                            send_account_request_email)
@@ -27,6 +46,15 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app)
 app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', 'supersecretkey')
+app.after_request(compress_response)
+# PDF pool workers re-import this file as __mp_main__ when it is run with
+# `python app.py`; only the real app process starts the background jobs
+if __name__ != '__mp_main__':
+    # Start the PDF workers now so the first quote PDF does not wait for them
+    pdf_render_pool.start()
+    product_catalog.start_background_refresh()
+    account_mirror.start_background_refresh()
+    start_snapshot_refresh(account_mirror.site_names)
 
 @app.route('/', methods=['GET'])
 def welcome():
@@ -45,18 +73,7 @@ def healthcheck():
 def quote():
     #Salesforce Auth
 
-    access_token, instance_url = get_salesforce_access_token(
-        client_id=os.getenv('SALESFORCE_CLIENT_ID'),
-        client_secret=os.getenv('SALESFORCE_CLIENT_SECRET'),
-        username=os.getenv('SALESFORCE_USERNAME'),
-        password=os.getenv('SALESFORCE_PASSWORD'),
-        security_token=os.getenv('SALESFORCE_SECURITY_TOKEN')
-    )
-    print('Generated Access Token and Instance URL')
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
+    _, instance_url = token_manager.get()
     data = request.json
     #print("Incoming quote request:", data)
     
@@ -109,13 +126,6 @@ def quote():
         "Type": "Customer"
     }
 
-    def get_account(account_name):
-        soql = f"SELECT Id, ShippingStreet, ShippingCity, ShippingState, ShippingPostalCode, ShippingCountry FROM Account WHERE Name = '{account_name}' LIMIT 1"
-        url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(soql)}"
-        r = requests.get(url, headers=headers)
-        records = r.json().get('records', [])
-        return records[0] if records else None
-
     def create_account(name, shipping, defaults):
         payload = {
             "Name": name,
@@ -127,7 +137,7 @@ def quote():
             **defaults
         }
         url = f"{instance_url}/services/data/v60.0/sobjects/Account/"
-        r = requests.post(url, headers=headers, json=payload)
+        r = salesforce_request("POST", url, json=payload)
         if r.status_code == 201:
             return r.json()['id']
         print("Account creation failed:", r.text)
@@ -142,7 +152,7 @@ def quote():
             "ShippingPostalCode": shipping["postal_code"],
             "ShippingCountry": 'US'
         }
-        r = requests.patch(url, headers=headers, json=payload)
+        r = salesforce_request("PATCH", url, json=payload)
         return r.status_code == 204
 
     def address_differs(existing, shipping):
@@ -162,7 +172,7 @@ def quote():
             "Sales_Order_Name__c": "DEMO Test Order",
             "Sales_Type__c": "Demo"
         }
-        r = requests.post(url, headers=headers, json=payload)
+        r = salesforce_request("POST", url, json=payload)
         if r.status_code == 201:
             return r.json()['id']
         print("Sales order creation failed:", r.text)
@@ -171,7 +181,7 @@ def quote():
     def get_product_id(partnumber):
         soql = f"SELECT Id FROM gii__Product2Add__c WHERE Name = '{partnumber}' LIMIT 1"
         url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(soql)}"
-        r = requests.get(url, headers=headers)
+        r = salesforce_request("GET", url)
         records = r.json().get('records', [])
         return records[0]['Id'] if records else None
 
@@ -183,7 +193,7 @@ def quote():
             "gii__OrderQuantity__c": qty,
             "gii__StockUM__c": "Each"
         }
-        r = requests.post(url, headers=headers, json=payload)
+        r = salesforce_request("POST", url, json=payload)
         if r.status_code == 201:
             print(f"✅ Created line for {product_id} (Qty: {qty})")
         else:
@@ -191,17 +201,16 @@ def quote():
 
     def query_soql(soql):
         url = f"{instance_url}/services/data/v61.0/query"
-        resp = requests.get(url, headers=headers, params={"q": soql})
+        resp = salesforce_request("GET", url, params={"q": soql})
         resp.raise_for_status()
         return resp.json()
     
-    def create_sales_quote(account_id):
+    def build_sales_quote(account_id):
         email = user.get('auth', {}).get('email', '')
         cts = query_soql(f"SELECT Id, AccountId FROM Contact WHERE Email = '{email}'")
         contact_id = cts["records"][0]["Id"]
         now = datetime.now()
         unique_key = f"{email}_{now.strftime('%Y%m%d%H%M%S%f')}"
-        url = f"{instance_url}/services/data/v60.0/sobjects/gii__SalesQuote__c/"
         payload = {
             "gii__Account__c": account_id,
             "Quote_Name__c": f"Test Quote on {now.strftime('%d %B %Y %H:%M')}",
@@ -211,41 +220,12 @@ def quote():
             "Portal_Request__c": unique_key,
             "Requisitioner__c": contact_id
         }
-        r = requests.post(url, headers=headers, json=payload)
-        if r.status_code == 201:
-            print("✅ Created Sales Quote")
-            print(r.json())
-            return (r.json()['id'], unique_key)
-        else:
-            print("❌ Failed to create Sales Quote:", r.text)
-            return None
+        return payload, unique_key
         
-    def get_sales_quotes_name(quote_id):
-        query = f"""
-        SELECT Id, Name, gii__Status__c, gii__QuoteDate__c 
-        FROM gii__SalesQuote__c 
-        WHERE Id = '{quote_id}'
-        """     
-        url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(query)}"
-        r = requests.get(url, headers=headers)
-        return r.json().get("records", [])
-
-    def create_sales_quote_line(sales_quote_id, product_id, quantity):
-        url = f"{instance_url}/services/data/v60.0/sobjects/gii__SalesQuoteLine__c/"
-        payload = {
-            "gii__SalesQuote__c": sales_quote_id,
-            "gii__Product__c": product_id,
-            "gii__OrderQuantity__c": quantity
-        }
-        r = requests.post(url, headers=headers, json=payload)
-        if r.status_code == 201:
-            print(f"✅ Created quote line for product {product_id}")
-        else:
-            print(f"❌ Failed to create quote line for product {product_id}: {r.text}")
-
 
     # === MAIN FLOW ===
-    account = get_account(account_name)
+    # The address is compared below, so read it from Salesforce rather than a cache
+    account = account_cache.with_address(account_name)
     if account:
         account_id = account['Id']
         print("✅ Account found:", account_id)
@@ -264,25 +244,40 @@ def quote():
         account_id = create_account(account_name, shipping_address, account_defaults)
         if not account_id:
             raise Exception("Failed to create account")
+        account_cache.invalidate(account_name)
     
-    sales_quote_id, portal_key = create_sales_quote(account_id)
-    if not sales_quote_id:
-        raise Exception("Cannot proceed without a sales quote.")
+    quote_fields, portal_key = build_sales_quote(account_id)
 
-    # Step 2: Loop through products and create quote lines
+    # Step 2: Resolve products, then create the quote and its lines in one graph
+    product_ids = product_catalog.get_product_ids_many(product["partnumber"] for product in products)
+    quote_lines = []
+    line_partnumbers = []   # partnumber of each quote_lines entry, to name a line Salesforce rejects
     for product in products:
-        product_id = get_product_id(product["partnumber"])
+        product_id = product_ids.get(product["partnumber"])
         if not product_id:
             print(f"❌ Product not found: {product['partnumber']}")
             continue
-        create_sales_quote_line(
-            sales_quote_id=sales_quote_id,
-            product_id=product_id,
-            quantity=product["qty"]
-        )
+        line_partnumbers.append(product["partnumber"])
+        quote_lines.append({
+            "gii__Product__c": product_id,
+            "gii__OrderQuantity__c": product["qty"]
+        })
+
+    try:
+        sales_quote_id, quote_name = create_sales_quote_with_lines(quote_fields, quote_lines)
+    except QuoteGraphError as e:
+        # Nothing was created; tell the caller which cart item (or the header) Salesforce rejected
+        details = []
+        for failure in e.failures:
+            node = failure["node"] or ""
+            if node.startswith("line") and node[4:].isdigit():
+                failure = {**failure, "partnumber": line_partnumbers[int(node[4:])]}
+            details.append(failure)
+        return jsonify({"status": False, "error": str(e), "details": details}), 500
 
 
     print("✅ Sales Quote and Lines created successfully")
+    dashboard_cache.invalidate(account_name)
     link = f"{instance_url}/lightning/r/gii__SalesQuote__c/{sales_quote_id}/view"
     print("🔗 View Sales Quote:", link)
     
@@ -306,7 +301,6 @@ def quote():
         threading.Thread(target=_go, daemon=True).start()
 
     # At the end of quote() BEFORE return:
-    quote_info = get_sales_quotes_name(sales_quote_id)
     send_email_async({
         "link": link,  # Salesforce quote link
         "created_by_email": user.get('auth', {}).get('email', ''),
@@ -316,7 +310,7 @@ def quote():
         "address_changed": change,
         "shipping_address": shipping_address,
         "products": products,
-        "name": quote_info[0].get("Name") if quote_info else "Unknown",
+        "name": quote_name or "Unknown",
         "portal_request": portal_key
     })
 
@@ -345,20 +339,10 @@ def quote():
 @app.route('/api/send-pdf-email', methods=['POST'])
 def send_pdf_email():
     def get_sales_quote_lines(quote_id):
-        query = f"SELECT Id, gii__Product__c, gii__OrderQuantity__c FROM gii__SalesQuoteLine__c WHERE gii__SalesQuote__c = '{quote_id}'"
-        url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(query)}"
-        r = requests.get(url, headers=headers)
+        url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(quote_lines_soql(quote_id))}"
+        r = salesforce_request("GET", url)
         return r.json().get("records", [])
     
-    def get_product_details(product_id):
-        query = f"SELECT Name, Amazon_Price__c, gii__Description__c FROM gii__Product2Add__c WHERE Id = '{product_id}' LIMIT 1"
-        url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(query)}"
-        r = requests.get(url, headers=headers)
-        records = r.json().get("records", [])
-        if records:
-            return records[0]["Name"], records[0].get("Amazon_Price__c", "N/A"), records[0].get("gii__Description__c", "N/A")
-        return "Unknown", "N/A", "N/A"
-    
     def get_sales_quotes_name(quote_id):
         query = f"""
         SELECT Id, Name, gii__Status__c, gii__QuoteDate__c 
@@ -366,60 +350,33 @@ def send_pdf_email():
         WHERE Id = '{quote_id}'
         """     
         url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(query)}"
-        r = requests.get(url, headers=headers)
+        r = salesforce_request("GET", url)
         return r.json().get("records", [])
-    def format_shipping_address(addr: dict) -> str:
-        """Safely combine address parts into a single string with newlines."""
-        parts = [
-            addr.get("street", ""),
-            " ".join([addr.get("city",""), addr.get("state",""), addr.get("postal_code","")]).strip(),
-            addr.get("country", "")
-        ]
-        return "\n".join([p for p in parts if p])   # remove empty parts
 
-    
-    access_token, instance_url = get_salesforce_access_token(
-        client_id=os.getenv('SALESFORCE_CLIENT_ID'),
-        client_secret=os.getenv('SALESFORCE_CLIENT_SECRET'),
-        username=os.getenv('SALESFORCE_USERNAME'),
-        password=os.getenv('SALESFORCE_PASSWORD'),
-        security_token=os.getenv('SALESFORCE_SECURITY_TOKEN')
-    )
+    _, instance_url = token_manager.get()
     #print('Generated Access Token and Instance URL')
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
     data = request.get_json()
     quote_id = data.get("quote_id")
-    quote_info = get_sales_quotes_name(quote_id)
+    quote_info, quote_lines = fan_out(
+        lambda: get_sales_quotes_name(quote_id),
+        lambda: get_sales_quote_lines(quote_id)
+    )
     quote_data = {
                     "name": quote_info[0]['Name'],
                     "status": quote_info[0]['gii__Status__c'],
-                    "shipping_address":format_shipping_address(data.get("shipping_address")),
+                    "shipping_address":format_shipping_address(data.get("shipping_address") or {}),
                     "account_name": data.get("account_name"),
                     "creator": data.get("created_by_email", ""),
                     "first_name": data.get("first_name", ""),
-                    "lines": []
                 }
-    quote_lines = get_sales_quote_lines(quote_id)
-    for ql in quote_lines:
-        pname, pprice, pdescription = get_product_details(ql["gii__Product__c"])
-        # Convert price to float, handle "N/A" case
-        try:
-            price_float = float(pprice) if pprice != "N/A" else 0.0
-        except (ValueError, TypeError):
-            price_float = 0.0
-            
-        line_data = {
-            "name": pname,
-            "qty": ql['gii__OrderQuantity__c'],
-            "price": price_float,
-            "description": pdescription
-        }
-        quote_data["lines"].append(line_data)
+    product_details = product_catalog.get_product_details_many(ql["gii__Product__c"] for ql in quote_lines)
+    quote_data["lines"] = build_quote_lines(quote_lines, product_details)
     print("Quote data prepared for PDF:", quote_data)    
-    send_test_email_with_pdf(quote_data)
+    try:
+        pdf, _ = pdf_cache.render(quote_data)
+    except (PdfPoolBusy, PdfRenderTimeout) as e:
+        return jsonify({"error": str(e)}), 503
+    send_test_email_with_pdf(quote_data, pdf)
     return jsonify(quote_data)
     
 
@@ -442,22 +399,7 @@ def fetch_address():
     first_name = data.get('first_name'," ")
     last_name = data.get('last_name'," ")
     # Connect to Salesforce and fetch address (pseudo-code below)
-    access_token, instance_url = get_salesforce_access_token(
-        client_id=os.getenv('SALESFORCE_CLIENT_ID'),
-        client_secret=os.getenv('SALESFORCE_CLIENT_SECRET'),
-        username=os.getenv('SALESFORCE_USERNAME'),
-        password=os.getenv('SALESFORCE_PASSWORD'),
-        security_token=os.getenv('SALESFORCE_SECURITY_TOKEN')
-    )
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
-    soql = f"SELECT Id, ShippingStreet, ShippingCity, ShippingState, ShippingPostalCode, ShippingCountry FROM Account WHERE Name = '{account_name}' LIMIT 1"
-    url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(soql)}"
-    r = requests.get(url, headers=headers)
-    records = r.json().get('records',[])
-    address = records[0] if records else None
+    address = account_cache.with_address(account_name)
     if not address:
         return jsonify({"status": False, "error": "Address not found for the given account"}), 404
     address1 = address.get('ShippingStreet', '')
@@ -549,99 +491,20 @@ def send_quote_email():
         return jsonify({"status": False, "error": str(e)}), 500
 
 @app.route('/api/account-data', methods=['GET'])
+@conditional("private, no-cache")
 def get_account_data():
-    access_token, instance_url = get_salesforce_access_token(
-        client_id=os.getenv('SALESFORCE_CLIENT_ID'),
-        client_secret=os.getenv('SALESFORCE_CLIENT_SECRET'),
-        username=os.getenv('SALESFORCE_USERNAME'),
-        password=os.getenv('SALESFORCE_PASSWORD'),
-        security_token=os.getenv('SALESFORCE_SECURITY_TOKEN')
-    )
-    print('Generated Access Token and Instance URL')
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
+    _, instance_url = token_manager.get()
     def get_account_id(account_name):
-        query = f"SELECT Id FROM Account WHERE Name = '{account_name}' LIMIT 1"
-        url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(query)}"
-        r = requests.get(url, headers=headers)
-        print(r.json())
-        records = r.json().get("records", [])
-        return records[0]["Id"] if records else None
-
-    def get_product_details(product_id):
-        query = f"SELECT Name, Amazon_Price__c, gii__Description__c FROM gii__Product2Add__c WHERE Id = '{product_id}' LIMIT 1"
-        url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(query)}"
-        r = requests.get(url, headers=headers)
-        records = r.json().get("records", [])
-        if records:
-            return records[0]["Name"], records[0].get("Amazon_Price__c", "N/A"), records[0].get("gii__Description__c", "N/A")
-        return "Unknown", "N/A", "N/A"
-
-    def get_sales_orders(account_id, page=1):
-        offset = (page - 1) * 5
-        query = f"""
-        SELECT Id, Name, gii__Status__c, gii__OrderType__c, gii__OrderStatus__c, 
-            gii__SalesQuote__c, gii__SalesQuote__r.Quote_Name__c, gii__OrderDate__c,gii__CustomerPONumber__c
-        FROM gii__SalesOrder__c 
-        WHERE gii__Account__c = '{account_id}'
-        ORDER BY gii__OrderDate__c DESC
-        LIMIT 5 OFFSET {offset}
-        """
-        url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(query)}"
-        r = requests.get(url, headers=headers)
-        return r.json().get("records", [])
-
-    def get_sales_order_lines(sales_order_id):
-        query = f"SELECT Id, gii__Product__c, gii__OrderQuantity__c FROM gii__SalesOrderLine__c WHERE gii__SalesOrder__c = '{sales_order_id}'"
-        url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(query)}"
-        r = requests.get(url, headers=headers)
-        return r.json().get("records", [])
-
-    def get_sales_quotes(account_id, page=1):
-        offset = (page - 1) * 5
-        query = f"""
-        SELECT Id, Name, gii__Status__c, gii__QuoteDate__c 
-        FROM gii__SalesQuote__c 
-        WHERE gii__Account__c = '{account_id}' and
-        gii__Status__c	= 'Open'
-        ORDER BY gii__QuoteDate__c DESC
-        LIMIT 5 OFFSET {offset}
-        """
-        url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(query)}"
-        r = requests.get(url, headers=headers)
-        return r.json().get("records", [])
+        account = account_cache.get(account_name)
+        return account["Id"] if account else None
 
-    def get_shipments_for_order(sales_order_id):
-        """
-        Returns a list of dicts with gii__TrackingLink__c and gii__ShipmentStatus__c
-        for all shipments related to a sales order.
-        """
-        query = (
-            "SELECT Id, Tracking_Link_Custom__c, gii__ShipmentStatus__c "
-            f"FROM gii__Shipment__c WHERE gii__SalesOrder__c = '{sales_order_id}'"
-        )
-        url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(query)}"
-        r = requests.get(url, headers=headers)
-        if r.status_code != 200:
-            return []
-        records = r.json().get("records", [])
-        shipments = [
-            {
-                "tracking_link": rec.get("Tracking_Link_Custom__c"),
-                "shipment_status": rec.get("gii__ShipmentStatus__c"),
-            }
-            for rec in records
-        ]
-        return shipments
 
+    def get_sales_quotes(account_id, page=1, after=None):
+        records = query(quotes_page_soql(account_id, page, after)).get("records", [])
+        return split_page(records, "gii__QuoteDate__c", 5)
 
     def get_sales_quote_lines(quote_id):
-        query = f"SELECT Id, gii__Product__c, gii__OrderQuantity__c FROM gii__SalesQuoteLine__c WHERE gii__SalesQuote__c = '{quote_id}'"
-        url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(query)}"
-        r = requests.get(url, headers=headers)
-        return r.json().get("records", [])
+        return query(quote_lines_soql(quote_id)).get("records", [])
     
     def get_order_stats(account_id):
         """Returns total orders and open orders count for an account"""
@@ -652,10 +515,7 @@ def get_account_data():
         # total_orders = total_response.json().get("totalSize", 0)
         
         # Open orders
-        open_query = f"SELECT COUNT() FROM gii__SalesOrder__c WHERE gii__Account__c = '{account_id}' AND gii__Status__c = 'Open'"
-        open_url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(open_query)}"
-        open_response = requests.get(open_url, headers=headers)
-        open_orders = open_response.json().get("totalSize", 0)
+        open_orders = query(open_orders_count_soql(account_id)).get("totalSize", 0)
         
         return open_orders, open_orders
     
@@ -668,10 +528,7 @@ def get_account_data():
         # total_quotes = total_response.json().get("totalSize", 0)
         
         # Open quotes
-        open_query = f"SELECT COUNT() FROM gii__SalesQuote__c WHERE gii__Account__c = '{account_id}' AND gii__Status__c = 'Open'"
-        open_url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(open_query)}"
-        open_response = requests.get(open_url, headers=headers)
-        open_quotes = open_response.json().get("totalSize", 0)
+        open_quotes = query(open_quotes_count_soql(account_id)).get("totalSize", 0)
         
         return open_quotes, open_quotes
     
@@ -689,6 +546,13 @@ def get_account_data():
             page = 1
     except ValueError:
         page = 1
+
+    # A next_cursor from a previous response continues from there instead of page
+    cursor = request.args.get('cursor')
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
     
     # Get account ID
     account_id = get_account_id(account_name)
@@ -699,8 +563,9 @@ def get_account_data():
     result = {
         "orders": [],
         "quotes": [],
-        "page": page,
+        "page": None if after else page,
         "page_size": 5,
+        "next_cursor": None,
         "total_orders": 0,
         "total_quotes": 0,
         "open_orders": 0,
@@ -710,76 +575,34 @@ def get_account_data():
     try:
         if tab == 'orders':
             # --- SALES ORDERS ---
-            orders = get_sales_orders(account_id, page)
-            total_orders, open_orders = get_order_stats(account_id)
+            # Orders, lines and shipments come back in one parent-child query
+            (orders, result["next_cursor"]), (total_orders, open_orders) = fan_out(
+                lambda: load_orders_page(account_id, page, after),
+                lambda: get_order_stats(account_id)
+            )
             for order in orders:
-                # Get related quote information if exists
-                quote_id = order.get('gii__SalesQuote__c')
-                quote_name = order.get('gii__SalesQuote__r', {}).get('Name') if order.get('gii__SalesQuote__r') else None
-                quote_link = f"{instance_url}/lightning/r/gii__SalesQuote__c/{quote_id}/view" if quote_id else None
-                shipments = get_shipments_for_order(order["Id"])
-                
-                order_data = {
-                    "name": order['gii__CustomerPONumber__c'],
-                    "status": order['gii__Status__c'],
-                    "quote_id": quote_id,
-                    "quote_name": quote_name,
-                    "quote_link": quote_link,
-                    "lines": []
-                }
-                order_data["shipments"] = shipments
-                print(order_data)
-                if shipments and shipments[0].get("tracking_link") and order_data['status'].lower() == "open":
-                    order_data['status'] = "Shipped"
-                
-                lines = get_sales_order_lines(order["Id"])
-                for line in lines:
-                    product_name, product_price, product_description = get_product_details(line["gii__Product__c"])
-                    # Convert price to float, handle "N/A" case
-                    try:
-                        price_float = float(product_price) if product_price != "N/A" else 0.0
-                    except (ValueError, TypeError):
-                        price_float = 0.0
-                        
-                    line_data = {
-                        "name": product_name,
-                        "qty": line['gii__OrderQuantity__c'],
-                        "price": price_float,
-                        "description": product_description
-                    }
-                    order_data["lines"].append(line_data)
-                
-                result["orders"].append(order_data)
+                result["orders"].append(build_order_data(order, instance_url))
             result["total_orders"] = total_orders
             result["open_orders"] = open_orders
         else:    
             # --- SALES QUOTES ---
-            quotes = get_sales_quotes(account_id, page)
-            total_quotes, open_quotes = get_quote_stats(account_id)
+            (quotes, result["next_cursor"]), (total_quotes, open_quotes) = fan_out(
+                lambda: get_sales_quotes(account_id, page, after),
+                lambda: get_quote_stats(account_id)
+            )
+            quote_lines_by_id = dict(zip(
+                [quote["Id"] for quote in quotes],
+                fan_out(*[lambda quote_id=quote["Id"]: get_sales_quote_lines(quote_id) for quote in quotes])
+            ))
+            product_details = product_catalog.get_product_details_many(
+                ql["gii__Product__c"] for lines in quote_lines_by_id.values() for ql in lines
+            )
             for quote in quotes:
                 quote_data = {
                     "name": quote['Name'],
                     "status": quote['gii__Status__c'],
-                    "lines": []
+                    "lines": build_quote_lines(quote_lines_by_id[quote["Id"]], product_details)
                 }
-                
-                quote_lines = get_sales_quote_lines(quote["Id"])
-                for ql in quote_lines:
-                    pname, pprice, pdescription = get_product_details(ql["gii__Product__c"])
-                    # Convert price to float, handle "N/A" case
-                    try:
-                        price_float = float(pprice) if pprice != "N/A" else 0.0
-                    except (ValueError, TypeError):
-                        price_float = 0.0
-                        
-                    line_data = {
-                        "name": pname,
-                        "qty": ql['gii__OrderQuantity__c'],
-                        "price": price_float,
-                        "description": pdescription
-                    }
-                    quote_data["lines"].append(line_data)
-                
                 result["quotes"].append(quote_data)
             result["total_quotes"] = total_quotes
             result["open_quotes"] = open_quotes
@@ -788,122 +611,73 @@ def get_account_data():
     except Exception as e:
         return jsonify({"error": f"An error occurred: {str(e)}"}), 500
 
+@app.route('/api/account-data/batch', methods=['POST'])
+def get_account_data_batch():
+    # For managed-account users: dashboards plus the first orders/quotes page of
+    # many sites in one call, e.g. {"account_names": ["Amazon LAX9", "Amazon ONT8"]}
+    data = request.get_json(silent=True) or {}
+    account_names = data.get('account_names')
+    if not isinstance(account_names, list) or not account_names:
+        return jsonify({"error": "account_names must be a non-empty list"}), 400
+    if len(account_names) > MAX_BATCH_ACCOUNTS:
+        return jsonify({"error": f"At most {MAX_BATCH_ACCOUNTS} account_names per request"}), 400
+
+    _, instance_url = token_manager.get()
+    try:
+        return jsonify(load_accounts_batch([str(name) for name in account_names], instance_url))
+    except Exception as e:
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+
+@app.route('/api/account-data/export', methods=['GET'])
+def export_account_data():
+    # Full order or quote history of one account, streamed as NDJSON (default)
+    # or CSV while it is read from Salesforce page by page
+    account_name = request.args.get('account_name')
+    tab = request.args.get('type', 'orders')
+    fmt = request.args.get('format', 'ndjson')
+    if not account_name:
+        return jsonify({"error": "account_name parameter is required"}), 400
+    if tab not in ('orders', 'quotes'):
+        return jsonify({"error": "type must be orders or quotes"}), 400
+    if fmt not in ('ndjson', 'csv'):
+        return jsonify({"error": "format must be ndjson or csv"}), 400
+
+    account = account_cache.get(account_name)
+    if not account:
+        return jsonify({"error": "Account not found"}), 404
+
+    _, instance_url = token_manager.get()
+    items = iter_orders(account["Id"], instance_url) if tab == 'orders' else iter_quotes(account["Id"])
+    body, mimetype = (to_csv(items, tab), 'text/csv') if fmt == 'csv' else (to_ndjson(items), 'application/x-ndjson')
+    filename = re.sub(r'[^A-Za-z0-9_-]+', '_', account_name) + f"_{tab}.{fmt}"
+    return Response(body, mimetype=mimetype, headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Cache-Control": "no-store",
+    })
+
 @app.route('/api/dashboard', methods=['GET'])
+@conditional("private, no-cache")
 def dashboard():
-    CURRENT_YEAR = datetime.now().year
-    
-    def get_account_data(instance_url, access_token, amazon_site_code):
-    # Prepare SOQL
-        fields = [
-            "Battery_Blade_Connector_Count__c", "Battery_POGO_Connector_Count__c",
-            "Charger_Blade_Connector_Count__c", "Charger_POGO_Connector_Count__c",
-            "Controller_Blade_Connector_Count__c", "Controller_POGO_Connector_Count__c",
-            "DTG_Retrofit_Kit_Count__c", "PS_Security_Cart_Count__c",
-            "PS_Slam_Cart_Count__c", "PS_Cart_Count__c", "PS_Loss_Prevention_Cart_Count__c",
-            "Battery_Expiration_2022__c", "Battery_Expiration_2023__c",
-            "Battery_Expiration_2024__c", "Battery_Expiration_2025__c",
-            "Battery_Expiration_2026__c", "Battery_Expiration_2027__c",
-            "Battery_Expiration_2028__c", "Battery_Expiration_2029__c"
-        ]
-        field_str = ", ".join(fields)
-        soql = (
-            f"SELECT {field_str} FROM Account "
-            f"WHERE Name = '{amazon_site_code}'"
-        )
-        url = f"{instance_url}/services/data/v60.0/query"
-        headers = {"Authorization": f"Bearer {access_token}"}
-        params = {"q": soql}
-        resp = requests.get(url, headers=headers, params=params)
-        resp.raise_for_status()
-        results = resp.json()
-        if not results["records"]:
-            raise ValueError(f"No account found for Amazon_Site_Code__c = {amazon_site_code}")
-        # Get the first record (should only be one)
-        account_info = {}
-        account_info['product'] = results["records"][0]
-        # Open orders
-        open_query = (
-            f"SELECT COUNT() FROM gii__SalesOrder__c "
-            f"WHERE gii__Account__r.Name = '{amazon_site_code}' AND gii__Status__c = 'Open'"
-        )
-        open_url = f"{instance_url}/services/data/v60.0/query"
-        open_response = requests.get(open_url, headers=headers, params={"q": open_query})
-        open_orders = open_response.json().get("totalSize", 0)
-        account_info['open_order'] = open_orders
-        
-        # Open quotes
-        open_query = (
-            f"SELECT COUNT() FROM gii__SalesQuote__c "
-            f"WHERE gii__Account__r.Name = '{amazon_site_code}' AND gii__Status__c = 'Open'"
-        )
-        open_url = f"{instance_url}/services/data/v60.0/query"
-        open_response = requests.get(open_url, headers=headers, params={"q": open_query})
-        open_quotes = open_response.json().get("totalSize", 0)
-        account_info['open_quote'] = open_quotes
-
-        return account_info
-
-
-    def process_account_data(account):
-        # --- Product Summary ---
-        product_types = {
-            "Battery Blade Connector": "Battery_Blade_Connector_Count__c",
-            "Battery Pogo Connector": "Battery_POGO_Connector_Count__c",
-            "Charger - Blade Connector": "Charger_Blade_Connector_Count__c",
-            "Charger - Pogo Connector": "Charger_POGO_Connector_Count__c",
-            "Controller - Blade Connector": "Controller_Blade_Connector_Count__c",
-            "Controller - Pogo Connector": "Controller_POGO_Connector_Count__c",
-            "DTG Power Retrofit Kit": "DTG_Retrofit_Kit_Count__c",
-            "DTG Problem Solver Security Cart": "PS_Security_Cart_Count__c",
-            "DTG Slam Cart": "PS_Slam_Cart_Count__c",
-            "Problem Solver Cart": "PS_Cart_Count__c",
-            "Problem Solver Loss Prevention Cart": "PS_Loss_Prevention_Cart_Count__c"
-        }
-        product_summary = []
-        for name, field in product_types.items():
-            qty = account.get(field, 0) or 0
-            if qty > 0:
-                product_summary.append({"type": name, "quantity": qty})
-
-        blade_expiry = []
-        for year in range(2025, 2030):
-            field = f"Battery_Expiration_{year}__c"
-            qty = account.get(field, 0) or 0
-            status = "good"
-            if year == CURRENT_YEAR and qty > 0:
-                status = "upgrade"
-            blade_expiry.append({"year": year, "quantity": qty, "status":status})
-            # If you have separate Pogo expiry, replace above line with real field
-            # For now, treat all as Blade if that's your convention
-
-        return {
-            "product_summary": product_summary,
-            "batch_expiry": blade_expiry,
-        }
-    access_token, instance_url = get_salesforce_access_token(
-        client_id=os.getenv('SALESFORCE_CLIENT_ID'),
-        client_secret=os.getenv('SALESFORCE_CLIENT_SECRET'),
-        username=os.getenv('SALESFORCE_USERNAME'),
-        password=os.getenv('SALESFORCE_PASSWORD'),
-        security_token=os.getenv('SALESFORCE_SECURITY_TOKEN')
-    )
     site_code =  request.args.get('site_code')
     name = "Amazon " + site_code
-    account_data = {}
 
-    account = get_account_data(instance_url, access_token, name)
-    dashboard_data = process_account_data(account['product'])
-    account_data["part1"] = {"order":account["open_order"], "quotes":account["open_quote"]}
-    account_data["part_2"] = dashboard_data
-    insights = {"text":"No Batteries To Replace", "quantity":None, "type":"positive"}
-    for x in dashboard_data['batch_expiry']:
-        if int(x['year']) == CURRENT_YEAR and x['status'] == 'upgrade':
-            insights = {"text":"Batteries Expiring Soon", "quantity":x['quantity'], "type":"alert"}
-            break
+    # Served from the snapshot in dashboard_cache; a miss costs one Salesforce query.
+    # snapshot_age is how many seconds old the served data is.
+    account_data, age = load_dashboard(name)
+
+    response = jsonify({**account_data, "snapshot_age": round(age, 1)})
+    # The ETag leaves out snapshot_age, so polling gets a 304 until the data changes
+    response.set_etag(data_etag(account_data))
+    return response, 200
 
-    account_data["part_3"] = insights
 
-    return jsonify(account_data), 200
+@app.route('/api/dashboard/refresh', methods=['POST'])
+def refresh_dashboard():
+    # Drops one site's cached dashboard, or every site's when no site_code is given.
+    # Only on the worker that serves this request (see DashboardCache)
+    site_code = (request.get_json(silent=True) or {}).get("site_code")
+    dashboard_cache.invalidate("Amazon " + site_code if site_code else None)
+    return jsonify({"status": True, "message": "Dashboard cache cleared"}), 200
 
 @app.route('/update-address', methods=['POST'])
 def update_address():
@@ -939,33 +713,21 @@ def update_address():
     d_send['accountName'] = account_name
 
     # Authenticate with Salesforce
-    access_token, instance_url = get_salesforce_access_token(
-        client_id=os.getenv('SALESFORCE_CLIENT_ID'),
-        client_secret=os.getenv('SALESFORCE_CLIENT_SECRET'),
-        username=os.getenv('SALESFORCE_USERNAME'),
-        password=os.getenv('SALESFORCE_PASSWORD'),
-        security_token=os.getenv('SALESFORCE_SECURITY_TOKEN')
-    )
+    _, instance_url = token_manager.get()
 
     # Find Account ID by Name
-    soql = f"SELECT Id FROM Account WHERE Name = '{account_name}'"
-    soql_url = f"{instance_url}/services/data/v60.0/query"
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
-    resp = requests.get(soql_url, headers=headers, params={'q': soql})
-    if resp.status_code != 200:
-        return jsonify({'error': 'Failed to query Account', 'details': resp.text}), 500
+    try:
+        account = account_cache.get(account_name)
+    except Exception as e:
+        return jsonify({'error': 'Failed to query Account', 'details': str(e)}), 500
 
-    records = resp.json().get('records', [])
-    if not records:
+    if not account:
         return jsonify({'error': f"Account '{account_name}' not found"}), 404
-    account_id = records[0]['Id']
+    account_id = account['Id']
     d_send['accountId'] = account_id
     # Update Shipping Address
     update_url = f"{instance_url}/services/data/v60.0/sobjects/Account/{account_id}"
-    update_resp = requests.patch(update_url, json=shipping_data, headers=headers)
+    update_resp = salesforce_request("PATCH", update_url, json=shipping_data)
     if update_resp.status_code == 204:
         print(type(d_send))
         print(d_send)
@@ -983,7 +745,7 @@ def update_member():
 
     def get_member_id_by_email(email):
         url = f"{BASE_URL}/members/{urllib.parse.quote(email)}"
-        resp = requests.get(url, headers=HEADERS, timeout=10)
+        resp = memberstack_session.get(url, headers=HEADERS, timeout=10)
         resp.raise_for_status()
         data = resp.json()
         return data.get("id") or (data.get("data") or {}).get("id")
@@ -1021,7 +783,7 @@ def update_member():
                 "managed-accounts": m_a_str
             }
         }
-        resp = requests.patch(
+        resp = memberstack_session.patch(
             f"{BASE_URL}/members/{member_id}",
             headers=HEADERS,
             json=payload,
@@ -1053,7 +815,7 @@ def update_member_drop():
             }
         }
         print("Payload:", payload)
-        resp = requests.patch(
+        resp = memberstack_session.patch(
             f"{BASE_URL}/members/{member_id}",
             headers=HEADERS,
             json=payload,
@@ -1065,863 +827,27 @@ def update_member_drop():
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-ALL_SITES =  ["Amazon ABE2",
- "Amazon ABE3",
- "Amazon ABE8",
- "Amazon ABQ1",
- "Amazon ABQ2",
- "Amazon ABQ5",
- "Amazon ACY1",
- "Amazon ACY2",
- "Amazon ACY5",
- "Amazon ACY8",
- "Amazon ACY9",
- "Amazon AFW1",
- "Amazon AFW2",
- "Amazon AFW5",
- "Amazon AGS1",
- "Amazon AGS2",
- "Amazon AGS5",
- "Amazon AKC1",
- "Amazon AKH4",
- "Amazon AKR1",
- "Amazon ALB1",
- "Amazon AMA1",
- "Amazon AMZ9",
- "Amazon ATL2",
- "Amazon ATL5",
- "Amazon ATL6",
- "Amazon ATL7",
- "Amazon ATS3",
- "Amazon ATS5",
- "Amazon AUN2",
- "Amazon AUS3",
- "Amazon AUS5",
- "Amazon AUV1",
- "Amazon AVP1",
- "Amazon AVP8",
- "Amazon AVP9",
- "Amazon AZA4",
- "Amazon AZA5",
- "Amazon BAN2",
- "Amazon BDL2",
- "Amazon BDL3",
- "Amazon BDL4",
- "Amazon BDL6",
- "Amazon BDL7",
- "Amazon BDU2",
- "Amazon BFi3",
- "Amazon BFI4",
- "Amazon BFI5",
- "Amazon BFI7",
- "Amazon BFI9",
- "Amazon BFL1",
- "Amazon BFL2",
- "Amazon BHM1",
- "Amazon BJX1",
- "Amazon BLV2",
- "Amazon BNA2",
- "Amazon BNA3",
- "Amazon BNA5",
- "Amazon BNA6",
- "Amazon BNA7",
- "Amazon BNA8",
- "Amazon BNE1",
- "Amazon BOI2",
- "Amazon BOI5",
- "Amazon BOS12",
- "Amazon BOS27",
- "Amazon BOS3",
- "Amazon BOS4",
- "Amazon BTR1",
- "Amazon BUF5",
- "Amazon BUF9",
- "Amazon BUR7",
- "Amazon BWI1",
- "Amazon BWI2",
- "Amazon BWI4",
- "Amazon BWI5",
- "Amazon BWU1",
- "Amazon BWU6",
- "Amazon CAE1",
- "Amazon CAE3",
- "Amazon CAK4",
- "Amazon CDW5",
- "Amazon CHA1",
- "Amazon CHA2",
- "Amazon CHM5",
- "Amazon CLE2",
- "Amazon CLE3",
- "Amazon CLE5",
- "Amazon CLE7",
- "Amazon CLE9",
- "Amazon CLT2",
- "Amazon CLT3",
- "Amazon CLT4",
- "Amazon CLT5",
- "Amazon CLT6",
- "Amazon CLT9",
- "Amazon CMH1",
- "Amazon CMH3",
- "Amazon CMH4",
- "Amazon CMH5",
- "Amazon CNO5",
- "Amazon CNO8",
- "Amazon COS5",
- "Amazon CRG1",
- "Amazon CSG1",
- "Amazon CVG2",
- "Amazon CVG5",
- "Amazon CVG9",
- "Amazon DAB2",
- "Amazon DAE1",
- "Amazon DAE3",
- "Amazon DAL2",
- "Amazon DAL3",
- "Amazon DAL9",
- "Amazon DAU1",
- "Amazon DAU2",
- "Amazon DAZ4",
- "Amazon DBA5",
- "Amazon DBA8",
- "Amazon DBK1",
- "Amazon DBL1",
- 
- "Amazon DBO6",
- "Amazon DBO7",
- "Amazon DBU1",
- "Amazon DBV1",
- "Amazon DCA1",
- "Amazon DCA2",
- "Amazon DCA6",
- "Amazon DCD6",
- "Amazon DCG2",
- "Amazon DCG4",
- "Amazon DCH6",
- "Amazon DCK1",
- "Amazon DCL2",
- "Amazon DCL3",
- "Amazon DCL4",
- "Amazon DCM2",
- "Amazon DCS3",
- "Amazon DCW1",
- "Amazon DCW8",
- "Amazon DDC3",
- "Amazon DDC4",
- "Amazon DDE6",
- "Amazon DDE8",
- "Amazon DDF2",
- "Amazon DDT1",
- "Amazon DEN2",
- "Amazon DEN3",
- "Amazon DEN5",
- "Amazon DEN7",
- "Amazon DEN8",
- "Amazon DET1",
- "Amazon DET2",
- "Amazon DET3",
- "Amazon DET6",
- "Amazon DET7",
- "Amazon DEW5",
- "Amazon DFH3",
- "Amazon DFL4",
- "Amazon DFM3",
- "Amazon DFT4",
- "Amazon DFW5",
- "Amazon DFW6",
- "Amazon DFW7",
- "Amazon DFX3",
- "Amazon DGE7",
- "Amazon DGI3",
- 
- "Amazon DHT4",
- "Amazon DIB7",
- "Amazon DID2",
- "Amazon DIL3",
- "Amazon DIL5",
- "Amazon DIN3",
- "Amazon DJE1",
- "Amazon DJE2",
- "Amazon DJE3",
- "Amazon DJE9",
- "Amazon DJX2",
- "Amazon DJX4",
- "Amazon DJZ3",
- "Amazon DJZ6",
- "Amazon DKC3",
- "Amazon DKO9",
- "Amazon DKS3",
- "Amazon DKY9",
- "Amazon DLC8",
- "Amazon DLD1",
- "Amazon DLI4",
- "Amazon DLI6",
- "Amazon DLN2",
- "Amazon DLN3",
- "Amazon DLT3",
- "Amazon DLT6",
- "Amazon DLV3",
- "Amazon DMD2",
- "Amazon DMD9",
- "Amazon DMI7",
- "Amazon DML1",
- "Amazon DML6",
- "Amazon DMO3",
- "Amazon DMO4",
- "Amazon DMP1",
- "Amazon DMT1",
- "Amazon DMW1",
- "Amazon DNA6",
- "Amazon DNH2",
- "Amazon DNK7",
- "Amazon DOI4",
- "Amazon DOI6",
- "Amazon DOK2",
- "Amazon DON3",
- "Amazon DON9",
- "Amazon DPD2",
- "Amazon DPD4",
- "Amazon DPH7",
- "Amazon DPL2.",
- "Amazon DPP1",
- "Amazon DRC6",
- "Amazon DRT3",
- "Amazon DRT8",
- "Amazon DSC3",
- "Amazon DSC4",
- "Amazon DSD4",
- "Amazon DSF5",
- "Amazon DSM5",
- "Amazon DSM9",
- "Amazon DSW3",
- "Amazon DSX7",
- "Amazon DTB4",
- "Amazon DTN6",
- "Amazon DTO3",
- "Amazon DTO5",
- "Amazon DTO9",
- "Amazon DTU2",
- "Amazon DTU8",
- "Amazon DTW1",
- "Amazon DTW3",
- "Amazon DTW8",
- "Amazon DTW9",
- "Amazon DUT2",
- "Amazon DUT4",
- "Amazon DVB8",
- "Amazon DVY2",
- "Amazon DWA6",
- "Amazon DWD6",
- "Amazon DXT5",
- "Amazon DYN3",
- "Amazon DYT3",
- "Amazon DYY6",
- "Amazon ELP1",
- "Amazon EUG5",
- "Amazon EWR4",
- "Amazon EWR7",
- "Amazon EWR8",
- "Amazon FAR1",
- "Amazon FAT1",
- "Amazon FAT2",
- "Amazon FAT5",
- "Amazon FOE1",
- "Amazon FR1",
- "Amazon FSD1",
- "Amazon FTW1",
- "Amazon FTW2",
- "Amazon FTW3",
- "Amazon FTW5",
- "Amazon FTW6",
- "Amazon FTW7",
- "Amazon FTW8",
- "Amazon FTW9",
- "Amazon FTY9",
- "Amazon FWA4",
- "Amazon FWA6",
- "Amazon GDL1",
- "Amazon GDL2",
- "Amazon GEG1",
- "Amazon GEG2",
- "Amazon GEU2",
- "Amazon GEU3",
- "Amazon GEU5",
- "Amazon GLD2",
- "Amazon GRR1",
- "Amazon GRU8",
- "Amazon GSO1",
- "Amazon GSP1",
- "Amazon GYR1",
- "Amazon GYR2",
- "Amazon GYR3",
- "Amazon GYR4",
- "Amazon HAT2",
- "Amazon HAT9",
- "Amazon HBA3",
- "Amazon HBA9",
- "Amazon HBF5",
- "Amazon HBI2",
- "Amazon HBN9",
- "Amazon HCE2",
- "Amazon HCH2",
- "Amazon HCL9",
- "Amazon HCM9",
- "Amazon HCN1",
- "Amazon HDA3",
- "Amazon HDA9",
- "Amazon HDC3",
- "Amazon HDS9",
- "Amazon HDT9",
- "Amazon HEA1",
- "Amazon HEA2",
- "Amazon HEW9",
- "Amazon HFD5",
- "Amazon HGA3",
- "Amazon HGA6",
- "Amazon HGE2",
- "Amazon HGR2",
- "Amazon HGR5",
- "Amazon HGR6",
- "Amazon HHO2",
- "Amazon HHO3",
- "Amazon HIA1",
- "Amazon HIL3",
- "Amazon HIO2",
- "Amazon HLA6",
- "Amazon HLA8",
- "Amazon HLA9",
- "Amazon HLI1",
- "Amazon HLI2",
- "Amazon HLO9",
- "Amazon HLR1",
- "Amazon HLX1",
- "Amazon HMC9",
- "Amazon HMD3",
- "Amazon HME9",
- "Amazon HMI2",
- "Amazon HMK9",
- "Amazon HMO2",
- "Amazon HMO3",
- "Amazon HMS9",
- "Amazon HMW1",
- "Amazon HMW3",
- "Amazon HMW4",
- "Amazon HMY1",
- "Amazon HNC3",
- "Amazon HNE1",
- "Amazon HNY2",
- "Amazon HOU1",
- "Amazon HOU2",
- "Amazon Hou3",
- "Amazon HOU5",
- "Amazon HOU6",
- "Amazon HOU7",
- "Amazon HOU8",
- "Amazon HOU9",
- "Amazon HRN2",
- "Amazon HSD1",
- "Amazon HSE1",
- "Amazon HSF2",
- "Amazon HSL9",
- "Amazon HSV1",
- "Amazon HSV2",
- "Amazon HTC2",
- "Amazon HTP2",
- "Amazon HWA4",
- "Amazon HWE2",
- "Amazon HYC2",
- "Amazon HYE1",
- "Amazon HYO1",
- "Amazon HYV1",
- "Amazon IAH1",
- "Amazon IAH3",
- "Amazon IAH5",
- "Amazon ICT2",
- "Amazon IDT1",
- "Amazon IGQ1",
- "Amazon IGQ2",
- "Amazon IND1",
- "Amazon IND2",
- "Amazon IND5",
- "Amazon IND8",
- "Amazon IND9",
- "Amazon JAN1",
- "Amazon JAN1",
- "Amazon JAX2",
- "Amazon JAX3",
- "Amazon JAX5",
- "Amazon JAX7",
- "Amazon JAX9",
- "Amazon JFK2",
- "Amazon JFK8",
- "Amazon JHW1",
- "Amazon JVL1",
- "Amazon KAFW",
- "Amazon KBWI",
- "Amazon KCVG",
- "Amazon KIL1",
- "Amazon KILN",
- "Amazon KLAL",
- "Amazon KOH2",
- "Amazon KRB1",
- "Amazon KRB2",
- "Amazon KRB3",
- "Amazon KRB4",
- "Amazon KRB5",
- "Amazon KRB7",
- "Amazon KRB9",
- "Amazon KRFD",
- "Amazon KSBD",
- "Amazon Kuiper",
- "Amazon LAL4",
- "Amazon LAN2",
- "Amazon LAS1",
- "Amazon LAS2",
- "Amazon LAS6",
- "Amazon LAS7",
- "Amazon LAS8",
- "Amazon LAX5",
- "Amazon LAX9",
- "Amazon LBB5",
- "Amazon LBE1",
- "Amazon LDJ5",
- "Amazon LEX1",
- "Amazon LFT1",
- "Amazon LGA5",
- "Amazon LGA9",
- "Amazon LGB3",
- "Amazon LGB4",
- "Amazon LGB5",
- "Amazon LGB6",
- "Amazon LGB7",
- "Amazon LGB8",
- "Amazon LGB9",
- "Amazon LIT1",
- "Amazon LIT2",
- "Amazon LUK2",
- "Amazon LUK7",
- "Pillpack MAN1",
- "Amazon MCE1",
- "Amazon MCI3",
- "Amazon MCI7",
- "Amazon MCI9",
- "Amazon MCO1",
- "Amazon MCO2",
- "Amazon MCO3",
- "Amazon MCO4",
- "Amazon MCO5",
- "Amazon MCO9",
- "Amazon MDT4",
- "Amazon MDT5",
- "Amazon MDT9",
- "Amazon MDW2",
- "Amazon MDW4",
- "Amazon MDW5",
- "Amazon MDW7",
- "Amazon MDW8",
- "Amazon MDW9",
- "Amazon MEL1",
- "Amazon MEL5",
- "Amazon MEL8",
- "Amazon MEM1",
- "Amazon MEM2",
- "Amazon MEM3",
- "Amazon MEM4",
- "Amazon MEM5",
- "Amazon MEM6",
- "Amazon MEM8",
- "Amazon MEX1",
- "Amazon MEX2",
- "Amazon MEX5",
- "Amazon MEX6",
- "Amazon MGE1",
- "Amazon MGE3",
- "Amazon MGE5",
- "Amazon MGE8",
- "Amazon MGE9",
- "Amazon MIA1",
- "Amazon MIA2",
- "Amazon MIA5",
- "Amazon MIT2",
- "Amazon MKC4",
- "Amazon MKC6",
- "Amazon MKE1",
- "Amazon MKE2",
- "Amazon MKE5",
- "Amazon MLB1",
- "Amazon MLI1",
- "Amazon MMU9",
- "Amazon MOB5",
- "Amazon MQJ1",
- "Amazon MQJ2",
- "Amazon MQJ5",
- "Amazon MQY1",
- "Amazon MSP1",
- "Amazon MSP6",
- "Amazon MSP7",
- "Amazon MSP8",
- "Amazon MSP9",
- "Amazon MTN1",
- "Amazon MTN2",
- "Amazon MTN3",
- "Amazon MTN6",
- "Amazon MTN7",
- "Amazon MTN8",
- "Amazon MTN9",
- "Amazon MTY1",
- "Amazon MTY2",
- "Amazon MTY5",
- "Amazon MWH1",
- "Amazon OAK3",
- "Amazon OAK4",
- "Amazon OAK5",
- "Amazon OAK7",
- "Amazon OAK9",
- "Amazon OKC1",
- "Amazon OKC2",
- "Amazon OKC5",
- "Amazon OLM1",
- "Amazon OMA2",
- "Amazon OMA5",
- "Amazon ONT1",
- "Amazon ONT2",
- "Amazon ONT5",
- "Amazon ONT6",
- "Amazon ONT8",
- "Amazon ONT9",
- "Amazon ORD2",
- "Amazon ORD4",
- "Amazon ORD5",
- "Amazon ORD9",
- "Amazon ORF2",
- "Amazon ORF3",
- "Amazon ORH3",
- "Amazon ORH5",
- "Amazon Otter",
- "Amazon OWD5",
- "Amazon OWD9",
- "Amazon OXR1",
- "Amazon PAE2",
- "Amazon Parent",
- "Pillpack PAU2",
- "Amazon PBI2",
- "Amazon PBI3",
- "Amazon PCA1",
- "Amazon PCW1",
- "Amazon PDK2",
- "Amazon PDX5",
- "Amazon PDX6",
- "Amazon PDX7",
- "Amazon PDX8",
- "Amazon PDX9",
- "Amazon PER3",
- "Amazon PGA1",
- "Amazon PHL1",
- "Amazon PHL4",
- "Amazon PHL5",
- "Amazon PHL6",
- "Amazon PHL7",
- "Amazon PHL9",
- "Amazon PHX3",
- "Amazon PHX5",
- "Amazon PHX6",
- "Amazon PHX7",
- "Amazon PIN2",
- "Amazon PIT2",
- "Amazon PIT4",
- "Amazon PIT5",
- "Amazon PIT9",
- "Amazon PKC1",
- "Amazon PillPack PMI2",
- "Amazon PNA1",
- "Amazon PNE5",
- "Amazon POC1",
- "Amazon POC2",
- "Amazon POC3",
- "Amazon POH2",
- "Amazon POR2",
- "Amazon PPA2",
- "Amazon PPO4",
- "Amazon PPX1",
- "Amazon PSC2",
- "PillPack PSE1",
- "Amazon PSP1",
- "Amazon PVD2",
- "Amazon QXY8",
- "Amazon RAD1",
- "Amazon RBD5",
- "Amazon RDG1",
- "Amazon RDU1",
- "Amazon RDU2",
- "Amazon RDU4",
- "Amazon RDU5",
- "Amazon RDU9",
- "Amazon RFD1",
- "Amazon RFD2",
- "Amazon RFD3",
- "Amazon RFD4",
- "Amazon RFD7",
- "Amazon RIC1",
- "Amazon RIC2",
- "Amazon RIC3",
- "Amazon RIC5",
- "Amazon RMN3",
- "Amazon RNO4",
- "Amazon RNT9",
- "Amazon Robotics",
- "Amazon ROC1",
- "Amazon RSW5",
- "Amazon RYY2",
- "Amazon SAN3",
- "Amazon SAN5",
- "Amazon SAT1",
- "Amazon SAT2",
- "Amazon SAT3",
- "Amazon SAT4",
- "Amazon SAT9",
- "Amazon SAV3",
- "Amazon SAV4",
- "Amazon SAV7",
- "Amazon SAX1",
- "Amazon SAX2",
- "Amazon SAX3",
- "Amazon SAX5-2",
- "Amazon SAX7-1",
- "Amazon SAZ1",
- "Amazon SAZ2",
- "Amazon SBD2",
- "Amazon SBD3",
- "Amazon SBD5",
- "Amazon SBD6",
- "Amazon SCA2",
- "Amazon SCA3",
- "Amazon SCA5",
- "Amazon SCA7",
- "Amazon SCK1",
- "Amazon SCK3",
- "Amazon SCK4",
- "Amazon SCK6",
- "Amazon SCK8",
- "Amazon SCO1",
- "Amazon SDC1",
- "Amazon SDF1",
- "Amazon SDF6",
- "Amazon SDF8",
- "Amazon SDF9",
- "Amazon SEA124",
- "Amazon SFL1",
- "Amazon SFL3",
- "Amazon SFL4",
- "Amazon SFL6",
- "Amazon SFL7",
- "Amazon SFL8",
- "Amazon SGA1",
- "Amazon SGA2",
- "Amazon SHV1",
- "Amazon SIL1",
- "Amazon SIL3",
- "Amazon SIL4",
- "Amazon SIN8",
- "Amazon SIN9",
- "Amazon SJC7",
- "Amazon SLC1",
- "Amazon SLC2",
- "Amazon SLC3",
- "Amazon SLC4",
- "Amazon SLC9",
- "Amazon SMA1",
- "Amazon SMA2",
- "Amazon SMD1",
- "Amazon SMD2",
- "Amazon SMF1",
- "Amazon SMF3",
- "Amazon SMF5",
- "Amazon SMF6",
- "Amazon SMF7",
- "Amazon SMI1",
- "Amazon SMN1",
- "Amazon SMO1",
- "Amazon SMO2",
- "Amazon SNA3",
- "Amazon SNA4",
- "Amazon SNC3",
- "Amazon SNE1",
- "Amazon SNJ1",
- "Amazon SNJ2",
- "Amazon SNJ3",
- "Amazon SNV1",
- "Amazon SNY1",
- "Amazon SNY2",
- "Amazon SNY5",
- "Amazon SOH1",
- "Amazon SOH2",
- "Amazon SOH3",
- "Amazon SOR3",
- "Amazon STL3",
- "Amazon STL4",
- "Amazon STL5",
- "Amazon STL6",
- "Amazon STL8",
- "Amazon STL9",
- "Amazon STN1",
- "Amazon STP2",
- "Amazon STX2",
- "Amazon STX5",
- "Amazon STX7",
- "Amazon STX8",
- "Amazon STX9",
- "Amazon SUT1",
- "Amazon SUT2",
- "Amazon SWA1",
- "Amazon SWA2",
- "Amazon SWF1",
- "Amazon SWF2",
- "Amazon SWI1",
- "Amazon SXWL",
- "Amazon SYR1",
- "Amazon SYS3",
- "Amazon TCY1",
- "Amazon TCY2",
- "Amazon TCY5",
- "Amazon TCY9",
- "Amazon TEB3",
- "Amazon TEB4",
- "Amazon TEB6",
- "Amazon TEB9",
- "Amazon TEN1",
- "Amazon TIJ1",
- "Amazon TLH2",
- "Amazon TMB8",
- "Amazon TPA1",
- "Amazon TPA2",
- "Amazon TPA3",
- "Amazon TPA4",
- "Amazon TPA6",
- "Amazon TTN2",
- "Amazon TUL2",
- "Amazon TUL5",
- "Amazon TUS1",
- "Amazon TUS2",
- "Amazon TUS5",
- "Amazon TYS1",
- "Amazon TYS5",
- "Amazon UAZ1",
- "Amazon UCA5",
- "Amazon UCO1",
- "Amazon UFL4",
- "Amazon UFL5",
- "Amazon UGA2",
- "Amazon UGA4",
- "Amazon UIN1",
- "Amazon UMD1",
- "Amazon UMN1",
- "Amazon UNC2",
- "Amazon UNC3",
- "Amazon UNJ1",
- "Amazon UNV2",
- "Amazon UNY2",
- "Amazon UOH4",
- "Amazon UOH5",
- "Amazon UOR2",
- "Amazon UPA1",
- "Amazon USD1",
- "Amazon USF1",
- "Amazon USF2",
- "Amazon UTN1",
- "Amazon UTX3",
- "Amazon UTX4",
- "Amazon UTX8",
- "Amazon UTX9",
- "Amazon UVA1",
- "Amazon UVA5",
- "Amazon UWA1",
- "Amazon UWA2",
- "Amazon UWA6",
- "Amazon VGT1",
- "Amazon VGT2",
- "Amazon VGT5",
- "Amazon VUGP",
- "Amazon WBW2",
- "Amazon WFL2",
- "Amazon WGE2",
- "Amazon WID1",
- "Amazon WIL1",
- "Amazon WLF2",
- "Amazon WMS1",
- "Amazon WNE1",
- "Amazon WNY4",
- "Amazon WTX2",
- "Amazon WWY3",
- "Amazon WWY4",
- "Amazon XCA2",
- "Amazon XCH1",
- "Amazon XCL1",
- "Amazon XEW3",
- "Amazon XEW4",
- "Amazon XHH3",
- "Amazon XLX3",
- "Amazon XLX7",
- "Amazon XME1",
- "Amazon XNJ2",
- "Amazon XPH1",
- "Amazon XSE2",
- "Amazon XUSO",
- "Amazon YEG1",
- "Amazon YEG4",
- "Amazon YGK1",
- "Amazon YHM1",
- "Amazon YHM2",
- "Amazon YHM5",
- "Amazon YHM6",
- "Amazon YHM8",
- "Amazon YHM9",
- "Amazon YOW1",
- "Amazon YOW3",
- "Amazon YUL9",
- "Amazon YVR2",
- "Amazon YVR3",
- "Amazon YVR4",
- "Amazon YVR7",
- "Amazon YXU1",
- "Amazon YXX1",
- "Amazon YXX2",
- "Amazon YYC1",
- "Amazon YYC4",
- "Amazon YYC5",
- "Amazon YYC6",
- "Amazon YYZ1",
- "Amazon YYZ3",
- "Amazon YYZ4",
- "Amazon YYZ7",
- "Amazon YYZ9",
-]
 @app.route("/sites_fixed")
+@conditional("public, max-age=300")
 def get_sites_fixed():
-    q = request.args.get("q", "").lower()
-    results = [s for s in ALL_SITES if q in s.lower()] if q else ALL_SITES
-    return jsonify(results[:50])
+    return jsonify(account_mirror.index().rank(request.args.get("q", "")))
 
 @app.route("/sites")
+@conditional("public, max-age=300")
 def get_sites():
-    access_token, instance_url = get_salesforce_access_token(
-        client_id=os.getenv('SALESFORCE_CLIENT_ID'),
-        client_secret=os.getenv('SALESFORCE_CLIENT_SECRET'),
-        username=os.getenv('SALESFORCE_USERNAME'),
-        password=os.getenv('SALESFORCE_PASSWORD'),
-        security_token=os.getenv('SALESFORCE_SECURITY_TOKEN')
-    )
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
     q = request.args.get("q", "").strip()
     if not q:
         return jsonify([])   # don’t return all Accounts blindly
+    # Answered from the in-memory name mirror; Salesforce is only asked before it has loaded
+    if account_mirror.loaded:
+        return jsonify(account_mirror.index().rank(q))
+
+    _, instance_url = token_manager.get()
 
     # Prefix match: site names that start with "Amazon{q}"
-    soql = f"SELECT Name FROM Account WHERE Name LIKE 'Amazon {q}%' LIMIT 50"
+    soql = f"SELECT Name FROM Account WHERE Name LIKE 'Amazon {soql_escape(q)}%' LIMIT 50"
     url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(soql)}"
-    r = requests.get(url, headers=headers)
+    r = salesforce_request("GET", url)
 
     if r.status_code != 200:
         return jsonify({"error": "Salesforce query failed", "details": r.text}), 500
@@ -1933,137 +859,99 @@ def get_sites():
 
 
 @app.route('/api/get-quote-pdf')
+@conditional("private, no-cache")
 def get_quote_pdf():
-    def get_sales_quote_lines(quote_id):
-        query = f"SELECT Id, gii__Product__c, gii__OrderQuantity__c FROM gii__SalesQuoteLine__c WHERE gii__SalesQuote__c = '{quote_id}'"
-        url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(query)}"
-        r = requests.get(url, headers=headers)
-        return r.json().get("records", [])
-    
-    def get_product_details(product_id):
-        query = f"SELECT Name, Amazon_Price__c, gii__Description__c FROM gii__Product2Add__c WHERE Id = '{product_id}' LIMIT 1"
-        url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(query)}"
-        r = requests.get(url, headers=headers)
-        records = r.json().get("records", [])
-        if records:
-            return records[0]["Name"], records[0].get("Amazon_Price__c", "N/A"), records[0].get("gii__Description__c", "N/A")
-        return "Unknown", "N/A", "N/A"
-    
-    def get_quote_details(quote_id: str) -> dict:
-        query = """
-        SELECT Id, Name, gii__Status__c, gii__QuoteDate__c, gii__Account__r.Name, gii__Account__r.ShippingStreet, gii__Account__r.ShippingCity, gii__Account__r.ShippingState, gii__Account__r.ShippingPostalCode, gii__Account__r.ShippingCountry  FROM gii__SalesQuote__c WHERE Id = '{qid}'
-        """.format(qid=quote_id)
+    def get_sales_quote_lines_by_name(quote_name):
+        return query(quote_lines_by_name_soql(quote_name)).get("records", [])
 
-        url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(query)}"
-        r = requests.get(url, headers=headers)
+    def get_quote_details(quote_name: str) -> dict:
+        r = salesforce_request("GET", "/services/data/v60.0/query", params={"q": quote_details_soql(quote_name)})
 
         if r.status_code != 200:
             print("Salesforce query failed:", r.text)
             return {}
 
-        records = r.json().get("records", [])
-        if not records:
-            return {}
-
-        rec = records[0]
-        print(rec)
-        return {
-            "Id": rec.get("Id"),
-            "Name": rec.get("Name"),
-            "Status": rec.get("gii__Status__c"),
-            "QuoteDate": rec.get("gii__QuoteDate__c"),
-            "AccountName": rec.get("gii__Account__r", {}).get("Name", ""),
-            "street": rec.get("gii__Account__r", {}).get("ShippingStreet", ""),
-            "city": rec.get("gii__Account__r", {}).get("ShippingCity", ""),
-            "state": rec.get("gii__Account__r", {}).get("ShippingState", ""),
-            "postal_code": rec.get("gii__Account__r", {}).get("ShippingPostalCode", ""),
-            "country": rec.get("gii__Account__r", {}).get("ShippingCountry", ""),
-        }
-    
-    def get_sales_quotes_name(quote_id):
-        query = f"""
-        SELECT Id, Name, gii__Status__c, gii__QuoteDate__c 
-        FROM gii__SalesQuote__c 
-        WHERE Id = '{quote_id}'
-        """     
-        url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(query)}"
-        r = requests.get(url, headers=headers)
-        return r.json().get("records", [])
-    def format_shipping_address(addr: dict) -> str:
-        """Safely combine address parts into a single string with newlines."""
-        parts = [
-            addr.get("street", ""),
-            " ".join([addr.get("city",""), addr.get("state",""), addr.get("postal_code","")]).strip(),
-            addr.get("country", "")
-        ]
-        return "\n".join([p for p in parts if p])   # remove empty parts
-
-    def get_quote_id(quote_name: str) -> str:
-        query = f"SELECT Id FROM gii__SalesQuote__c WHERE Name = '{quote_name}' LIMIT 1"
-        url = f"{instance_url}/services/data/v60.0/query?q={urllib.parse.quote(query)}"
-        r = requests.get(url, headers=headers)
-
-        if r.status_code != 200:
-            print("Salesforce query failed:", r.text)
-            return None
-
-        records = r.json().get("records", [])
-        if not records:
-            return None
-
-        return records[0]["Id"]
+        return parse_quote_details(r.json().get("records", []))
 
-    
-    access_token, instance_url = get_salesforce_access_token(
-        client_id=os.getenv('SALESFORCE_CLIENT_ID'),
-        client_secret=os.getenv('SALESFORCE_CLIENT_SECRET'),
-        username=os.getenv('SALESFORCE_USERNAME'),
-        password=os.getenv('SALESFORCE_PASSWORD'),
-        security_token=os.getenv('SALESFORCE_SECURITY_TOKEN')
-    )
-    #print('Generated Access Token and Instance URL')
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
     quote_name = request.args.get("quote_name")
     if not quote_name:
         return {"error": "quote_name is required"}, 400
-    quote_id = get_quote_id(quote_name)
-    quote_info = get_quote_details(quote_id)
+    # Header and lines are both looked up by quote Name, so they run in parallel
+    quote_info, quote_lines = fan_out(
+        lambda: get_quote_details(quote_name),
+        lambda: get_sales_quote_lines_by_name(quote_name)
+    )
     print("Fetched quote details:", quote_info)
-    quote_data = {
-                    "name": quote_info['Name'],
-                    "status": quote_info['Status'],
-                    "shipping_address":format_shipping_address(quote_info),
-                    "account_name": quote_info.get("AccountName", ""),
-                    "quote_date": quote_info['QuoteDate'],
-                    "lines": []
-                }
-    quote_lines = get_sales_quote_lines(quote_id)
-    for ql in quote_lines:
-        pname, pprice, pdescription = get_product_details(ql["gii__Product__c"])
-        # Convert price to float, handle "N/A" case
-        try:
-            price_float = float(pprice) if pprice != "N/A" else 0.0
-        except (ValueError, TypeError):
-            price_float = 0.0
-            
-        line_data = {
-            "name": pname,
-            "qty": ql['gii__OrderQuantity__c'],
-            "price": price_float,
-            "description": pdescription
-        }
-        quote_data["lines"].append(line_data)
+    if not quote_info:
+        return {"error": f"Quote '{quote_name}' not found"}, 404
+    product_details = product_catalog.get_product_details_many(ql["gii__Product__c"] for ql in quote_lines)
+    quote_data = build_pdf_data(quote_info, quote_lines, product_details)
+    # The PDF is a pure function of quote_data, so a current client copy skips rendering
+    etag = data_etag(quote_data)
+    if request.if_none_match.contains_weak(etag):
+        return not_modified(etag)
     print("Quote data prepared for PDF:", quote_data)
-    pdf = build_quote_pdf_bytes(quote_data)
-    return send_file(
+    # Repeat downloads of an unchanged quote come from pdf_cache without rendering
+    try:
+        pdf, hit = pdf_cache.render(quote_data)
+    except (PdfPoolBusy, PdfRenderTimeout) as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "5"}
+    response = send_file(
         io.BytesIO(pdf),
         mimetype="application/pdf",
         as_attachment=True,
         download_name=f"{quote_data['name']}.pdf"
     )
+    response.set_etag(etag)
+    response.headers["X-PDF-Cache"] = "hit" if hit else "miss"
+    return response
+
+@app.route('/api/pdf-cache/stats', methods=['GET'])
+def pdf_cache_stats():
+    return jsonify(pdf_cache.stats()), 200
+
+@app.route('/api/pdf-pool/stats', methods=['GET'])
+def pdf_pool_stats():
+    return jsonify(pdf_render_pool.stats()), 200
+
+@app.route('/api/get-quote-pdfs', methods=['GET', 'POST'])
+def get_quote_pdfs():
+    # Many quote PDFs as one streamed ZIP: every open quote of ?account_name=...,
+    # or ?quote_name=A&quote_name=B (as a POST body: {"quote_names": [...]})
+    body = request.get_json(silent=True) if request.method == 'POST' else None
+    if not isinstance(body, dict):
+        body = {}
+    account_name = body.get('account_name') or request.args.get('account_name')
+    quote_names = body.get('quote_names') or request.args.getlist('quote_name')
+
+    if quote_names:
+        if not isinstance(quote_names, list) or not all(isinstance(n, str) and n.strip() for n in quote_names):
+            return jsonify({"error": "quote_names must be a list of quote names"}), 400
+        quote_names = list(dict.fromkeys(n.strip() for n in quote_names))
+        if len(quote_names) > MAX_BULK_QUOTES:
+            return jsonify({"error": f"At most {MAX_BULK_QUOTES} quotes per request"}), 400
+        account_id = None
+    elif account_name:
+        account = account_cache.get(account_name)
+        if not account:
+            return jsonify({"error": "Account not found"}), 404
+        account_id = account["Id"]
+    else:
+        return jsonify({"error": "account_name or quote_name is required"}), 400
+
+    try:
+        pdf_data, missing, truncated = load_quotes_pdf_data(quote_names or None, account_id)
+    except Exception as e:
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+    if not pdf_data:
+        return jsonify({"error": "No quotes found", "not_found": missing}), 404
+
+    filename = re.sub(r'[^A-Za-z0-9_-]+', '_', account_name if account_id else "quotes") + "_quotes.zip"
+    return Response(quote_pdfs_zip(pdf_data, missing, truncated), mimetype="application/zip", headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Cache-Control": "no-store",
+        "X-Quotes-Truncated": "true" if truncated else "false",
+    })
 
 @app.route('/api/delete-quote-hard', methods=['POST'])
 def delete_quote_hard():
@@ -2073,24 +961,14 @@ def delete_quote_hard():
     if not quote_name:
         return {"error": "Quote Name is required"}, 400
 
-    access_token, instance_url = get_salesforce_access_token(
-        client_id=os.getenv('SALESFORCE_CLIENT_ID'),
-        client_secret=os.getenv('SALESFORCE_CLIENT_SECRET'),
-        username=os.getenv('SALESFORCE_USERNAME'),
-        password=os.getenv('SALESFORCE_PASSWORD'),
-        security_token=os.getenv('SALESFORCE_SECURITY_TOKEN')
-    )
+    _, instance_url = token_manager.get()
 
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
 
     # 1. Get the SalesQuote Id by Name
-    soql_quote = f"SELECT Id FROM gii__SalesQuote__c WHERE Name = '{quote_name}'"
+    soql_quote = f"SELECT Id, gii__Account__r.Name FROM gii__SalesQuote__c WHERE Name = '{quote_name}'"
     quote_url = f"{instance_url}/services/data/v60.0/query?q={soql_quote}"
 
-    quote_resp = requests.get(quote_url, headers=headers)
+    quote_resp = salesforce_request("GET", quote_url)
     quote_resp.raise_for_status()
     quote_records = quote_resp.json().get("records", [])
 
@@ -2099,12 +977,14 @@ def delete_quote_hard():
 
     quote_id = quote_records[0]["Id"]
     print("Found SalesQuote Id:", quote_id)
+    # The site's open quote count is about to change
+    dashboard_cache.invalidate((quote_records[0].get("gii__Account__r") or {}).get("Name"))
 
     # 2. Get all SalesQuoteLine Ids for that SalesQuote
     soql_lines = f"SELECT Id FROM gii__SalesQuoteLine__c WHERE gii__SalesQuote__c = '{quote_id}'"
     line_url = f"{instance_url}/services/data/v60.0/query?q={soql_lines}"
 
-    line_resp = requests.get(line_url, headers=headers)
+    line_resp = salesforce_request("GET", line_url)
     line_resp.raise_for_status()
     line_records = line_resp.json().get("records", [])
 
@@ -2112,7 +992,7 @@ def delete_quote_hard():
     for rec in line_records:
         rec_id = rec["Id"]
         del_url = f"{instance_url}/services/data/v60.0/sobjects/gii__SalesQuoteLine__c/{rec_id}"
-        del_resp = requests.delete(del_url, headers=headers)
+        del_resp = salesforce_request("DELETE", del_url)
         if del_resp.status_code == 204:
             print(f"Deleted line {rec_id}")
         else:
@@ -2120,7 +1000,7 @@ def delete_quote_hard():
 
 
     del_quote_url = f"{instance_url}/services/data/v60.0/sobjects/gii__SalesQuote__c/{quote_id}"
-    del_quote_resp = requests.delete(del_quote_url, headers=headers)
+    del_quote_resp = salesforce_request("DELETE", del_quote_url)
 
     if del_quote_resp.status_code == 204:
         print(f"Deleted SalesQuote {quote_id}")
@@ -2139,24 +1019,14 @@ def delete_quote():
     if not quote_name:
         return {"error": "Quote Name is required"}, 400
 
-    access_token, instance_url = get_salesforce_access_token(
-        client_id=os.getenv('SALESFORCE_CLIENT_ID'),
-        client_secret=os.getenv('SALESFORCE_CLIENT_SECRET'),
-        username=os.getenv('SALESFORCE_USERNAME'),
-        password=os.getenv('SALESFORCE_PASSWORD'),
-        security_token=os.getenv('SALESFORCE_SECURITY_TOKEN')
-    )
+    _, instance_url = token_manager.get()
 
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
 
     # 1. Get the SalesQuote Id by Name
-    soql_quote = f"SELECT Id FROM gii__SalesQuote__c WHERE Name = '{quote_name}'"
+    soql_quote = f"SELECT Id, gii__Account__r.Name FROM gii__SalesQuote__c WHERE Name = '{quote_name}'"
     quote_url = f"{instance_url}/services/data/v60.0/query?q={soql_quote}"
 
-    quote_resp = requests.get(quote_url, headers=headers)
+    quote_resp = salesforce_request("GET", quote_url)
     quote_resp.raise_for_status()
     quote_records = quote_resp.json().get("records", [])
 
@@ -2165,6 +1035,8 @@ def delete_quote():
 
     quote_id = quote_records[0]["Id"]
     print("Found SalesQuote Id:", quote_id)
+    # The site's open quote count is about to change
+    dashboard_cache.invalidate((quote_records[0].get("gii__Account__r") or {}).get("Name"))
 
     # Now update the fields instead of deleting
     update_url = f"{instance_url}/services/data/v60.0/sobjects/gii__SalesQuote__c/{quote_id}"
@@ -2173,7 +1045,7 @@ def delete_quote():
         "gii__CloseReason__c": "Portal Cancellation"
     }
 
-    update_resp = requests.patch(update_url, headers=headers, json=payload)
+    update_resp = salesforce_request("PATCH", update_url, json=payload)
 
     if update_resp.status_code == 204:
         print(f"SalesQuote {quote_id} updated successfully")
@@ -2184,6 +1056,15 @@ def delete_quote():
 
 
 
+@app.route('/api/catalog/refresh', methods=['POST'])
+def refresh_catalog():
+    try:
+        product_catalog.refresh()
+    except Exception as e:
+        return jsonify({"status": False, "error": str(e)}), 500
+    return jsonify({"status": True, "message": "Product catalog refreshed"}), 200
+
+
 @app.route('/api/notify', methods=['POST'])
 def notify_asynch():
     data = request.json or {}
@@ -0,0 +1,199 @@
+"""
+Baseline benchmark for pdf_creator_1.build_quote_pdf_bytes across quote
+sizes: 1, 50, 500 and 5,000 lines with the description of pdf_creator_1's
+__main__ sample, and smaller quotes with a much longer description. Reports
+wall time, peak RSS and the tracemalloc peak per case, writes them to JSON
+and flags regressions against an earlier run.
+
+    python benchmarks/pdf_quote_size_bench.py [--lines 1 50 500 5000] [--long-lines 1 50]
+        [--budget SECONDS] [--output results.json] [--baseline old.json] [--tolerance 0.15]
+
+Results go to benchmarks/pdf_quote_size_results.json (git-ignored) unless
+--output is given. Each run is compared against the results already at the
+output path before it replaces them, so running it before and after a
+change is enough to see the difference. To compare several changes against
+one fixed run, copy that results file elsewhere and pass it as --baseline.
+
+Each case runs in a fresh interpreter so peak RSS is that case's alone. A
+case renders once under tracemalloc, then untraced until --budget seconds
+are used (at least once). Render time grows faster than linearly with the
+number of pages (reportlab re-splits the remaining item rows at every page
+break), so the 5,000-line case takes a few minutes.
+Exits with status 1 when a case regressed against the baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Listed in .gitignore: it is the previous run that the next one is compared against
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "pdf_quote_size_results.json")
+
+# The description of the __main__ sample in pdf_creator_1
+SAMPLE_DESCRIPTION = (
+    'CART.PS - Definitive Technology Problem Solver Cart, 18" footprint with additional shelf and printer tray '
+    'for Zebra label printer, 5" locking casters, front handle, lift, DEFINITIVE Battery Controller including '
+    'Inverter.'
+)
+DESCRIPTIONS = {
+    "sample": SAMPLE_DESCRIPTION,
+    # About 2 KB, close to a page per item row; a row taller than a page fails to lay out
+    "long": " ".join([SAMPLE_DESCRIPTION] * 8),
+}
+# Compared against the baseline; the rest is informational
+METRICS = ("wall_ms_median", "peak_rss_kib", "tracemalloc_peak_kib")
+
+
+def sample_quote(lines, description):
+    return {
+        "account_name": "Amazon LAX9",
+        "name": "SQ-20250818-011742",
+        "status": "Open",
+        "quote_date": "August 18, 2025",
+        "shipping_address": "Amazon.com Services, Inc. (LAX9) 10247 Bellegrave",
+        "lines": [{"description": description, "name": f"DTG-PS-{i:05d}", "price": 2183.0, "qty": 3.0}
+                  for i in range(lines)],
+    }
+
+
+def _max_rss_kib():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss   # bytes on macOS, KiB on Linux
+
+
+def run_case(lines, description, budget):
+    """Runs one case in this process and returns its measurements."""
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)   # the logo path is relative
+    from pdf_creator_1 import build_quote_pdf_bytes
+
+    build_quote_pdf_bytes(sample_quote(1, SAMPLE_DESCRIPTION))   # one-time render context
+    data = sample_quote(lines, DESCRIPTIONS[description])
+    rss_before = _max_rss_kib()
+
+    # Traced separately: tracing slows rendering down
+    tracemalloc.start()
+    build_quote_pdf_bytes(data)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    times = []
+    while not times or (sum(times) < budget and len(times) < 50):
+        start = time.perf_counter()
+        pdf = build_quote_pdf_bytes(data)
+        times.append(time.perf_counter() - start)
+    peak_rss = _max_rss_kib()
+
+    return {
+        "lines": lines,
+        "description": description,
+        "runs": len(times),
+        "wall_ms_min": round(min(times) * 1000, 1),
+        "wall_ms_median": round(statistics.median(times) * 1000, 1),
+        "peak_rss_kib": peak_rss,
+        "rss_growth_kib": peak_rss - rss_before,
+        "tracemalloc_peak_kib": traced_peak // 1024,
+        "pdf_kib": len(pdf) // 1024,
+        "pages": pdf.count(b"/Type /Page\n"),
+    }
+
+
+def _case_in_subprocess(lines, description, budget):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--case", str(lines), description, "--budget", str(budget)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """Prints each metric against the baseline; returns the regressed (case, metric) pairs."""
+    old_cases = {(c["lines"], c["description"]): c for c in baseline["cases"]}
+    regressions = []
+    print(f"\nvs baseline {baseline.get('commit') or ''} ({baseline.get('created', '?')}), "
+          f"tolerance {tolerance:.0%}")
+    for case in results["cases"]:
+        old = old_cases.get((case["lines"], case["description"]))
+        if not old:
+            continue
+        changes = []
+        for metric in METRICS:
+            if not old.get(metric):
+                continue
+            change = case[metric] / old[metric] - 1
+            flag = ""
+            if change > tolerance:
+                regressions.append((case["lines"], case["description"], metric))
+                flag = " REGRESSION"
+            changes.append(f"{metric} {change:+.0%}{flag}")
+        print(f"{case['lines']:>6} {case['description']:<7} " + ", ".join(changes))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, nargs="+", default=[1, 50, 500, 5000],
+                        help="quote sizes with the sample description")
+    parser.add_argument("--long-lines", type=int, nargs="*", default=[1, 50],
+                        help="quote sizes with the long description")
+    parser.add_argument("--budget", type=float, default=5.0, help="seconds of timed renders per case")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the results JSON")
+    parser.add_argument("--baseline", help="results JSON to compare against (default: the current --output file)")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown/growth, 0.15 = 15%%")
+    parser.add_argument("--case", nargs=2, metavar=("LINES", "DESCRIPTION"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(int(args.case[0]), args.case[1], args.budget)))
+        return
+
+    baseline = None
+    baseline_path = args.baseline or (args.output if os.path.exists(args.output) else None)
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+
+    import reportlab
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "reportlab": reportlab.Version,
+        "machine": f"{platform.system()} {platform.machine()}",
+        "cases": [],
+    }
+    print(f"{'lines':>6} {'desc':<7}{'median ms':>11}{'min ms':>9}{'peak RSS MiB':>14}{'traced MiB':>12}"
+          f"{'pages':>7}{'PDF KiB':>9}")
+    cases = [(lines, "sample") for lines in args.lines] + [(lines, "long") for lines in args.long_lines]
+    for lines, description in cases:
+        case = _case_in_subprocess(lines, description, args.budget)
+        results["cases"].append(case)
+        print(f"{lines:>6} {description:<7}{case['wall_ms_median']:>11.1f}{case['wall_ms_min']:>9.1f}"
+              f"{case['peak_rss_kib'] / 1024:>14.1f}{case['tracemalloc_peak_kib'] / 1024:>12.1f}"
+              f"{case['pages']:>7}{case['pdf_kib']:>9}", flush=True)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if baseline and compare(results, baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark for pdf_creator_1's one-time render context: rendering quote PDFs
+with the styles, logo and table styles rebuilt on every call (and ASCII85
+streams, as before) against the shared RenderContext with binary streams.
+
+    python benchmarks/pdf_render_context_bench.py [--number N]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)   # the logo path is relative
+
+from reportlab import rl_config  # noqa: E402
+from pdf_creator_1 import build_quote_pdf_bytes, render_context  # noqa: E402
+
+LINE = {
+    "description": 'CART.PS - Definitive Technology Problem Solver Cart, 18" footprint with additional shelf and '
+                   'printer tray for Zebra label printer, 5" locking casters, front handle, lift, DEFINITIVE '
+                   'Battery Controller including Inverter.',
+    "name": "DTG-PS-001-16DTG.",
+    "price": 2183.0,
+    "qty": 3.0,
+}
+
+
+def sample_quote(lines):
+    return {
+        "account_name": "Amazon LAX9",
+        "name": "SQ-20250818-011742",
+        "status": "Open",
+        "quote_date": "August 18, 2025",
+        "shipping_address": "Amazon.com Services, Inc. (LAX9) 10247 Bellegrave",
+        "lines": [LINE] * lines,
+    }
+
+
+def per_call_context(data):
+    render_context.cache_clear()
+    return build_quote_pdf_bytes(data)
+
+
+# (label, ASCII85 streams, render function)
+MODES = [
+    ("per-call setup, A85", 1, per_call_context),
+    ("shared context, A85", 1, build_quote_pdf_bytes),
+    ("shared context, binary", 0, build_quote_pdf_bytes),
+]
+
+
+def measure(render, data, number):
+    render(data)   # warm up
+    start = time.perf_counter()
+    for _ in range(number):
+        pdf = render(data)
+    elapsed = (time.perf_counter() - start) / number
+
+    tracemalloc.start()
+    render(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, len(pdf)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20, help="renders per quote size and mode")
+    parser.add_argument("--lines", type=int, nargs="+", default=[1, 10, 50], help="quote sizes to render")
+    args = parser.parse_args()
+
+    print(f"{'lines':>6}  {'mode':<24}{'ms/pdf':>9}{'peak KiB':>10}{'pdf KiB':>9}")
+    try:
+        for lines in args.lines:
+            data = sample_quote(lines)
+            baseline = None
+            for label, a85, render in MODES:
+                rl_config.useA85 = a85
+                elapsed, peak, size = measure(render, data, args.number)
+                baseline = baseline or elapsed
+                print(f"{lines:>6}  {label:<24}{elapsed * 1000:>9.1f}{peak / 1024:>10.0f}{size / 1024:>9.0f}"
+                      f"  {baseline / elapsed:.1f}x")
+    finally:
+        rl_config.useA85 = 0
+        render_context.cache_clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Micro-benchmark for the /sites_fixed typeahead: the old linear scan over
+ALL_SITES against SiteIndex.search() (substring) and SiteIndex.rank()
+(ranked, typo-tolerant; what /sites and /sites_fixed serve).
+
+    python benchmarks/sites_fixed_bench.py [--number N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sites import ALL_SITES, SiteIndex, site_index  # noqa: E402
+
+# What users type into the picker, keystroke by keystroke
+QUERIES = ["l", "la", "lax", "lax9", "lax 9", "lxa9", "amazon", "amazon d", "amazon dfw", "x9", "9", "yyz", "zzz"]
+
+
+def linear_scan(q):
+    q = q.lower()
+    results = [s for s in ALL_SITES if q in s.lower()] if q else ALL_SITES
+    return results[:50]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="runs per query")
+    args = parser.parse_args()
+
+    build = timeit.timeit(lambda: SiteIndex(ALL_SITES), number=10) / 10
+    print(f"{len(ALL_SITES)} sites, index build {build * 1000:.1f} ms (once at import)")
+    print(f"{'query':<14}{'scan us':>10}{'index us':>10}{'speedup':>9}{'rank us':>10}")
+    total_scan = total_index = total_rank = 0.0
+    for q in QUERIES:
+        scan = timeit.timeit(lambda: linear_scan(q), number=args.number) / args.number
+        index = timeit.timeit(lambda: site_index.search(q), number=args.number) / args.number
+        rank = timeit.timeit(lambda: site_index.rank(q), number=args.number) / args.number
+        total_scan += scan
+        total_index += index
+        total_rank += rank
+        print(f"{q!r:<14}{scan * 1e6:>10.1f}{index * 1e6:>10.1f}{scan / index:>8.1f}x{rank * 1e6:>10.1f}")
+    print(f"{'all':<14}{total_scan * 1e6:>10.1f}{total_index * 1e6:>10.1f}"
+          f"{total_scan / total_index:>8.1f}x{total_rank * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
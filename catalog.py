@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+from sf_api import query_all, get_product_details_many, get_product_ids_many, PRODUCT_FIELDS, UNKNOWN_PRODUCT
+
+
+class ProductCatalog:
+    """
+    In-memory copy of gii__Product2Add__c, indexed by Name and by Id.
+
+    The whole catalog is loaded with one paginated SOQL query and swapped in
+    atomically, so readers never see a half-built index.
+    start_background_refresh() reloads it every PRODUCT_CATALOG_TTL seconds
+    while the previous copy keeps serving; refresh() reloads on demand.
+    Without the background job, the first lookup loads it, and after a failed
+    load lookups wait PRODUCT_CATALOG_RETRY seconds before trying again.
+    Lookups that miss (e.g. a product created since the last load) fall back
+    to a composite batch query; products found are added to the index and
+    ones that do not exist are remembered for PRODUCT_CATALOG_NEGATIVE_TTL
+    seconds (or until the next load).
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl if ttl is not None else int(os.getenv('PRODUCT_CATALOG_TTL', 900))
+        self.retry = int(os.getenv('PRODUCT_CATALOG_RETRY', 30))
+        self.negative_ttl = int(os.getenv('PRODUCT_CATALOG_NEGATIVE_TTL', 60))
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._by_name = {}
+        self._by_id = {}
+        self._missing_ids = {}    # product Id -> expires_at, for Ids that do not exist
+        self._missing_names = {}  # name key -> expires_at, for part numbers that do not exist
+        self._loaded_at = 0.0
+        self._failed_at = 0.0
+
+    @staticmethod
+    def _name_key(name):
+        # SOQL Name comparisons are case-insensitive
+        return (name or "").strip().lower()
+
+    @staticmethod
+    def _details(rec):
+        return rec["Name"], rec.get("Amazon_Price__c", "N/A"), rec.get("gii__Description__c", "N/A")
+
+    def refresh(self):
+        """Reloads the full catalog from Salesforce."""
+        with self._load_lock:
+            try:
+                self._load()
+            except Exception:
+                self._failed_at = time.time()
+                raise
+
+    def _load(self):
+        records = query_all(f"SELECT Id, {PRODUCT_FIELDS} FROM gii__Product2Add__c")
+        by_id = {rec["Id"]: rec for rec in records}
+        by_name = {self._name_key(rec["Name"]): rec for rec in records}
+        with self._lock:
+            self._by_id, self._by_name = by_id, by_name
+            self._missing_ids, self._missing_names = {}, {}
+        self._loaded_at = time.time()
+        print(f"Product catalog loaded: {len(by_id)} products")
+
+    def _ensure_loaded(self):
+        # Only the first use loads in the request thread; later reloads come from
+        # start_background_refresh(). Misses are served by the fallback queries
+        # while a load keeps failing.
+        if self._loaded_at or time.time() - self._failed_at < self.retry:
+            return
+        with self._load_lock:
+            if self._loaded_at or time.time() - self._failed_at < self.retry:
+                return
+            try:
+                self._load()
+            except Exception as e:
+                self._failed_at = time.time()
+                print("❌ Product catalog load failed:", e)
+
+    def start_background_refresh(self):
+        """Loads the catalog now and keeps it refreshed every ttl seconds (every retry seconds after a failure)."""
+        def _loop():
+            while True:
+                try:
+                    self.refresh()
+                    time.sleep(self.ttl)
+                except Exception as e:
+                    print("❌ Product catalog refresh failed:", e)
+                    time.sleep(self.retry)
+        threading.Thread(target=_loop, daemon=True).start()
+
+    @staticmethod
+    def _known_missing(missing, key, now):
+        expires_at = missing.get(key)
+        return expires_at is not None and expires_at > now
+
+    def get_product_details_many(self, product_ids):
+        """Same contract as sf_api.get_product_details_many, served from memory."""
+        self._ensure_loaded()
+        details, missing = {}, []
+        now = time.time()
+        for product_id in product_ids:
+            rec = self._by_id.get(product_id)
+            if rec:
+                details[product_id] = self._details(rec)
+            elif product_id and not self._known_missing(self._missing_ids, product_id, now):
+                missing.append(product_id)
+            else:
+                details[product_id] = UNKNOWN_PRODUCT
+        if missing:
+            fetched = get_product_details_many(missing)
+            with self._lock:
+                for product_id, (name, price, description) in fetched.items():
+                    if (name, price, description) != UNKNOWN_PRODUCT:
+                        rec = {"Id": product_id, "Name": name, "Amazon_Price__c": price,
+                               "gii__Description__c": description}
+                        self._by_id[product_id] = rec
+                        self._by_name[self._name_key(name)] = rec
+                    else:
+                        self._missing_ids[product_id] = now + self.negative_ttl
+            details.update(fetched)
+        return details
+
+    def get_product_ids_many(self, partnumbers):
+        """Same contract as sf_api.get_product_ids_many, served from memory."""
+        self._ensure_loaded()
+        ids, missing = {}, []
+        now = time.time()
+        for partnumber in partnumbers:
+            rec = self._by_name.get(self._name_key(partnumber))
+            if rec:
+                ids[partnumber] = rec["Id"]
+            elif not partnumber:
+                continue
+            elif self._known_missing(self._missing_names, self._name_key(partnumber), now):
+                ids[partnumber] = None
+            else:
+                missing.append(partnumber)
+        if missing:
+            fetched = get_product_ids_many(missing)
+            with self._lock:
+                for partnumber, product_id in fetched.items():
+                    if product_id is None:
+                        self._missing_names[self._name_key(partnumber)] = now + self.negative_ttl
+            ids.update(fetched)
+        return ids
+
+
+product_catalog = ProductCatalog()
@@ -1,4 +1,11 @@
-import requests
+import os
+import threading
+import time
+import urllib.parse
+from http_clients import salesforce_session
+from singleflight import SingleFlight
+
+DEFAULT_TOKEN_URL = 'https://test.salesforce.com/services/oauth2/token'
 
 # Function to get Salesforce access token using password grant type
 def get_salesforce_access_token(
@@ -7,7 +14,7 @@ def get_salesforce_access_token(
     username,
     password,
     security_token,
-    token_url='https://test.salesforce.com/services/oauth2/token',
+    token_url=DEFAULT_TOKEN_URL,
     existing_token=None,
     instance_url=None
 ):
@@ -28,7 +35,7 @@ def get_salesforce_access_token(
         'username': username,
         'password': full_password
     }
-    response = requests.post(token_url, data=payload)
+    response = salesforce_session.post(token_url, data=payload)
     if response.status_code == 200:
         token_data = response.json()
         return token_data['access_token'], token_data['instance_url']
@@ -44,5 +51,118 @@ def is_token_valid(access_token, instance_url):
         "Authorization": f"Bearer {access_token}",
         "Content-Type": "application/json"
     }
-    response = requests.get(url, headers=headers)
+    response = salesforce_session.get(url, headers=headers)
     return response.status_code == 200
+
+
+class SalesforceTokenManager:
+    """
+    Process-wide holder for the Salesforce access token and instance_url.
+
+    The password grant does not return an expiry, so the token is treated as
+    valid for SALESFORCE_TOKEN_TTL seconds (the org session timeout) and is
+    refreshed SALESFORCE_TOKEN_REFRESH_MARGIN seconds before that. A single
+    lock makes sure only one refresh runs when many requests see an expired
+    token at the same time; the others wait and reuse its result.
+    """
+
+    def __init__(self, ttl=None, refresh_margin=None):
+        self.ttl = ttl if ttl is not None else int(os.getenv('SALESFORCE_TOKEN_TTL', 7200))
+        self.refresh_margin = (refresh_margin if refresh_margin is not None
+                               else int(os.getenv('SALESFORCE_TOKEN_REFRESH_MARGIN', 300)))
+        self._lock = threading.Lock()
+        self._access_token = None
+        self._instance_url = None
+        self._expires_at = 0.0
+
+    def _is_fresh(self):
+        return self._access_token is not None and time.time() < self._expires_at - self.refresh_margin
+
+    def _refresh(self):
+        # Credentials are read at refresh time so load_dotenv() may run after import
+        access_token, instance_url = get_salesforce_access_token(
+            client_id=os.getenv('SALESFORCE_CLIENT_ID'),
+            client_secret=os.getenv('SALESFORCE_CLIENT_SECRET'),
+            username=os.getenv('SALESFORCE_USERNAME'),
+            password=os.getenv('SALESFORCE_PASSWORD'),
+            security_token=os.getenv('SALESFORCE_SECURITY_TOKEN'),
+            token_url=os.getenv('SALESFORCE_TOKEN_URL', DEFAULT_TOKEN_URL)
+        )
+        self._access_token = access_token
+        self._instance_url = instance_url
+        self._expires_at = time.time() + self.ttl
+        print('Generated Access Token and Instance URL')
+
+    def get(self):
+        """Returns (access_token, instance_url), refreshing them if needed."""
+        if self._is_fresh():
+            return self._access_token, self._instance_url
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            if not self._is_fresh():
+                self._refresh()
+            return self._access_token, self._instance_url
+
+    def invalidate(self, stale_token=None):
+        """
+        Forces the next get() to refresh. When stale_token is given the cache is
+        only dropped if it still holds that token, so a burst of 401s caused by
+        one expired token triggers a single refresh.
+        """
+        with self._lock:
+            if stale_token is None or stale_token == self._access_token:
+                self._expires_at = 0.0
+
+
+token_manager = SalesforceTokenManager()
+
+
+_query_flights = SingleFlight()
+
+
+def _query_key(method, url, params):
+    """Returns a key for SOQL query GETs (API path + whitespace-normalized SOQL), else None."""
+    if method.upper() != 'GET':
+        return None
+    parts = urllib.parse.urlsplit(url)
+    if not parts.path.endswith(('/query', '/queryAll', '/query/', '/queryAll/')):
+        return None
+    soql = (params or {}).get('q') or urllib.parse.parse_qs(parts.query).get('q', [None])[0]
+    if not soql:
+        return None
+    return parts.path.split('/services/data/', 1)[-1].rstrip('/') + '|' + ' '.join(soql.split())
+
+
+def salesforce_request(method, url, **kwargs):
+    """
+    Sends a request to Salesforce with the shared access token. `url` may be a
+    full URL or a path starting with "/services/...". On a 401 the token is
+    refreshed once and the request is retried.
+
+    Identical SOQL queries that are already in flight in this worker are not
+    sent again: callers wait for the running one and share its response.
+    """
+    key = _query_key(method, url, kwargs.get('params'))
+    if key:
+        return _query_flights.do(key, lambda: _send_salesforce_request(method, url, **kwargs))
+    return _send_salesforce_request(method, url, **kwargs)
+
+
+def _send_salesforce_request(method, url, **kwargs):
+    access_token, instance_url = token_manager.get()
+    extra_headers = kwargs.pop('headers', None) or {}
+    # Keep only the path so a retry goes to the (possibly new) instance_url
+    path = url[len(instance_url):] if url.startswith(instance_url) else url
+
+    def _send(token, base_url):
+        full_url = base_url + path if path.startswith('/') else path
+        headers = {"Content-Type": "application/json", **extra_headers,
+                   "Authorization": f"Bearer {token}"}
+        return salesforce_session.request(method, full_url, headers=headers, **kwargs)
+
+    response = _send(access_token, instance_url)
+    if response.status_code == 401:
+        token_manager.invalidate(access_token)
+        access_token, instance_url = token_manager.get()
+        response = _send(access_token, instance_url)
+    return response
@@ -0,0 +1,117 @@
+import gzip
+import hashlib
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from flask import request
+
+# gzip for JSON, CSV/NDJSON exports and PDFs, registered with app.after_request
+
+# Bodies smaller than this are sent as-is (gzip overhead outweighs the saving)
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))
+# How many compressed bodies of responses with a strong ETag to keep, and
+# their total size (quote PDFs can be several MB each)
+COMPRESS_CACHE_SIZE = int(os.getenv('COMPRESS_CACHE_SIZE', 64))
+COMPRESS_CACHE_BYTES = int(os.getenv('COMPRESS_CACHE_BYTES', 16 * 1024 * 1024))
+COMPRESS_MIMETYPES = {"application/json", "application/pdf", "text/csv", "application/x-ndjson"}
+
+# Streamed bodies are flushed to the client once this much input is pending,
+# so rows keep flowing while later Salesforce pages are fetched
+_STREAM_FLUSH_BYTES = 16 * 1024
+
+
+class CompressedBodyCache:
+    """
+    LRU of gzipped bodies keyed by a hash of the uncompressed bytes, so an
+    entry is valid for as long as it is kept and unchanged payloads such as
+    the full site list are compressed once instead of on every request.
+    (Not keyed by ETag: some views set one that leaves volatile fields out,
+    e.g. snapshot_age on /api/dashboard.)
+    """
+
+    def __init__(self, size, max_bytes):
+        self.size = size
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            self._bytes += len(body) - len(self._entries.pop(key, b""))
+            self._entries[key] = body
+            while len(self._entries) > self.size or self._bytes > self.max_bytes:
+                _, old = self._entries.popitem(last=False)
+                self._bytes -= len(old)
+
+
+compressed_bodies = CompressedBodyCache(COMPRESS_CACHE_SIZE, COMPRESS_CACHE_BYTES)
+
+
+def _gzip_stream(chunks):
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31)   # 31: gzip container
+    pending = 0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        out = compressor.compress(chunk)
+        pending = 0 if out else pending + len(chunk)
+        if pending >= _STREAM_FLUSH_BYTES:
+            out += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def compress_response(response):
+    """after_request hook: gzips the body when the client accepts it and it is big enough."""
+    if (response.status_code != 200
+            or response.mimetype not in COMPRESS_MIMETYPES
+            or "Content-Encoding" in response.headers
+            or request.accept_encodings["gzip"] <= 0):
+        return response
+    response.vary.add("Accept-Encoding")
+
+    if response.is_streamed and not response.direct_passthrough:
+        # Generator bodies (exports): size unknown up front, compress as they are sent
+        response.response = _gzip_stream(response.response)
+        response.headers.pop("Content-Length", None)
+        response.headers["Content-Encoding"] = "gzip"
+        return response
+
+    if response.direct_passthrough:
+        # send_file() of an in-memory PDF; a file of unknown size is left alone
+        if response.content_length is None or response.content_length < COMPRESS_MIN_SIZE:
+            return response
+        response.direct_passthrough = False
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+
+    etag, weak = response.get_etag()
+    # Only responses with a strong ETag (the cacheable ones) are worth keeping
+    key = hashlib.sha256(body).digest() if etag and not weak else None
+    compressed = compressed_bodies.get(key) if key else None
+    if compressed is None:
+        compressed = gzip.compress(body, COMPRESS_LEVEL, mtime=0)
+        if key:
+            compressed_bodies.put(key, compressed)
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = "gzip"
+    if etag:
+        # Same resource, different bytes: the strong ETag becomes weak, which
+        # If-None-Match still matches (weak comparison), so 304s keep working
+        response.set_etag(etag, weak=True)
+    return response
@@ -0,0 +1,274 @@
+import os
+import threading
+import time
+from datetime import datetime
+from account_cache import account_cache, ACCOUNT_FIELDS
+from sf_api import query, soql_escape, soql_in_lists, CompositeBatch
+
+# Child relationship names of the gii__Account__c lookups on sales orders and
+# quotes; override them if the org uses different names.
+ORDERS_RELATIONSHIP = os.getenv('SF_ACCOUNT_ORDERS_RELATIONSHIP', 'gii__SalesOrders__r')
+QUOTES_RELATIONSHIP = os.getenv('SF_ACCOUNT_QUOTES_RELATIONSHIP', 'gii__SalesQuotes__r')
+
+# Account fields behind the dashboard tiles
+DASHBOARD_FIELDS = [
+    "Battery_Blade_Connector_Count__c", "Battery_POGO_Connector_Count__c",
+    "Charger_Blade_Connector_Count__c", "Charger_POGO_Connector_Count__c",
+    "Controller_Blade_Connector_Count__c", "Controller_POGO_Connector_Count__c",
+    "DTG_Retrofit_Kit_Count__c", "PS_Security_Cart_Count__c",
+    "PS_Slam_Cart_Count__c", "PS_Cart_Count__c", "PS_Loss_Prevention_Cart_Count__c",
+    "Battery_Expiration_2022__c", "Battery_Expiration_2023__c",
+    "Battery_Expiration_2024__c", "Battery_Expiration_2025__c",
+    "Battery_Expiration_2026__c", "Battery_Expiration_2027__c",
+    "Battery_Expiration_2028__c", "Battery_Expiration_2029__c"
+]
+
+PRODUCT_TYPES = {
+    "Battery Blade Connector": "Battery_Blade_Connector_Count__c",
+    "Battery Pogo Connector": "Battery_POGO_Connector_Count__c",
+    "Charger - Blade Connector": "Charger_Blade_Connector_Count__c",
+    "Charger - Pogo Connector": "Charger_POGO_Connector_Count__c",
+    "Controller - Blade Connector": "Controller_Blade_Connector_Count__c",
+    "Controller - Pogo Connector": "Controller_POGO_Connector_Count__c",
+    "DTG Power Retrofit Kit": "DTG_Retrofit_Kit_Count__c",
+    "DTG Problem Solver Security Cart": "PS_Security_Cart_Count__c",
+    "DTG Slam Cart": "PS_Slam_Cart_Count__c",
+    "Problem Solver Cart": "PS_Cart_Count__c",
+    "Problem Solver Loss Prevention Cart": "PS_Loss_Prevention_Cart_Count__c"
+}
+
+
+def dashboard_soql(site_name):
+    """
+    The Account's tile fields plus its open orders and quotes, in one query.
+    Only Ids are selected in the subqueries; their totalSize is the count.
+    """
+    field_str = ", ".join(ACCOUNT_FIELDS + DASHBOARD_FIELDS)
+    return (
+        f"SELECT {field_str}, "
+        f"(SELECT Id FROM {ORDERS_RELATIONSHIP} WHERE gii__Status__c = 'Open'), "
+        f"(SELECT Id FROM {QUOTES_RELATIONSHIP} WHERE gii__Status__c = 'Open') "
+        f"FROM Account WHERE Name = '{soql_escape(site_name)}'"
+    )
+
+
+def open_child_count(account, relationship):
+    children = account.get(relationship)
+    return children.get("totalSize", 0) if children else 0
+
+
+def process_account_data(account):
+    current_year = datetime.now().year
+    # --- Product Summary ---
+    product_summary = []
+    for name, field in PRODUCT_TYPES.items():
+        qty = account.get(field, 0) or 0
+        if qty > 0:
+            product_summary.append({"type": name, "quantity": qty})
+
+    blade_expiry = []
+    for year in range(2025, 2030):
+        field = f"Battery_Expiration_{year}__c"
+        qty = account.get(field, 0) or 0
+        status = "good"
+        if year == current_year and qty > 0:
+            status = "upgrade"
+        blade_expiry.append({"year": year, "quantity": qty, "status": status})
+        # If you have separate Pogo expiry, replace above line with real field
+        # For now, treat all as Blade if that's your convention
+
+    return {
+        "product_summary": product_summary,
+        "batch_expiry": blade_expiry,
+    }
+
+
+def build_dashboard(account, open_orders, open_quotes):
+    """Builds the /api/dashboard body (part1/part_2/part_3) from an Account record and open counts."""
+    current_year = datetime.now().year
+    dashboard_data = process_account_data(account)
+    insights = {"text": "No Batteries To Replace", "quantity": None, "type": "positive"}
+    for x in dashboard_data['batch_expiry']:
+        if int(x['year']) == current_year and x['status'] == 'upgrade':
+            insights = {"text": "Batteries Expiring Soon", "quantity": x['quantity'], "type": "alert"}
+            break
+    return {
+        "part1": {"order": open_orders, "quotes": open_quotes},
+        "part_2": dashboard_data,
+        "part_3": insights,
+    }
+
+
+class DashboardCache:
+    """
+    Caches the /api/dashboard body by site name (e.g. "Amazon LAX9") for
+    DASHBOARD_CACHE_TTL seconds, together with the time it was computed.
+    Routes that change a site's open orders or quotes call invalidate(name);
+    invalidate() with no name clears every site. A body computed before the
+    latest invalidation of its site is not stored, so a slow snapshot run
+    cannot bring back data that a write has just made stale.
+
+    The cache, and so invalidate(), is per gunicorn worker: after a quote or
+    order is created or deleted through one worker, the others keep showing
+    the old open order/quote counts until their next snapshot run, i.e. for
+    up to DASHBOARD_SNAPSHOT_INTERVAL seconds (600 by default), or
+    DASHBOARD_CACHE_TTL when snapshots are off. Lower that interval if the
+    counts must catch up sooner.
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl if ttl is not None else int(os.getenv('DASHBOARD_CACHE_TTL', 900))
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> (expires_at, computed_at, body)
+        self._invalidated_at = {}  # key -> time of the last invalidate(name)
+        self._cleared_at = 0.0
+
+    @staticmethod
+    def _key(name):
+        return (name or "").strip().lower()
+
+    def lookup(self, name):
+        """Returns (body, age in seconds), or (None, None) if the site is not cached or has expired."""
+        entry = self._entries.get(self._key(name))
+        now = time.time()
+        if entry and entry[0] > now:
+            return entry[2], now - entry[1]
+        return None, None
+
+    def get(self, name):
+        return self.lookup(name)[0]
+
+    def put(self, name, body, computed_at=None):
+        computed_at = computed_at if computed_at is not None else time.time()
+        key = self._key(name)
+        with self._lock:
+            if computed_at < max(self._cleared_at, self._invalidated_at.get(key, 0.0)):
+                return
+            self._entries[key] = (computed_at + self.ttl, computed_at, body)
+
+    def invalidate(self, name=None):
+        now = time.time()
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+                self._invalidated_at.clear()
+                self._cleared_at = now
+            else:
+                self._entries.pop(self._key(name), None)
+                self._invalidated_at[self._key(name)] = now
+
+
+dashboard_cache = DashboardCache()
+
+
+def dashboard_from_records(site_name, records, computed_at):
+    """
+    Builds and caches the dashboard body from a dashboard_soql() result.
+    computed_at is the time.time() taken before that query was sent.
+    """
+    # Share the Id with the other routes that resolve this site
+    account_cache.prime(site_name, records[0] if records else None, computed_at)
+    if not records:
+        raise ValueError(f"No account found for Amazon_Site_Code__c = {site_name}")
+    account = records[0]
+    body = build_dashboard(account, open_child_count(account, ORDERS_RELATIONSHIP),
+                           open_child_count(account, QUOTES_RELATIONSHIP))
+    dashboard_cache.put(site_name, body, computed_at)
+    return body
+
+
+def load_dashboard(site_name):
+    """
+    Returns (body, age in seconds) for a site, from the cache (which the
+    snapshot job keeps filled) or, on a miss, from one Salesforce query.
+    """
+    body, age = dashboard_cache.lookup(site_name)
+    if body is None:
+        # Taken before the query, so an invalidate() while it runs keeps the result out of the cache
+        started = time.time()
+        records = query(dashboard_soql(site_name)).get("records", [])
+        body, age = dashboard_from_records(site_name, records, started), 0.0
+    return body, age
+
+
+# Seconds between snapshot runs; keep it below DASHBOARD_CACHE_TTL so
+# snapshots are replaced before they expire. 0 disables the job.
+SNAPSHOT_INTERVAL = int(os.getenv('DASHBOARD_SNAPSHOT_INTERVAL', 600))
+
+
+def _batch_records(handles):
+    records = []
+    for handle in handles:
+        if not handle.ok:
+            raise RuntimeError(f"Dashboard query failed: {handle.status_code} {handle.result}")
+        records.extend(handle.result.get("records", []))
+    return records
+
+
+def compute_dashboards(site_names, subqueries=()):
+    """
+    Computes the dashboard body of every named site and stores it in
+    dashboard_cache. Costs two composite batches for ~800 sites: one with
+    the Account fields (Name IN (...), IN_CHUNK names per query) and one
+    with the open order and quote counts grouped by Account. `subqueries`
+    are extra parent-child subqueries to select on each Account.
+    Returns {Account Id: (account record, dashboard body)} for the sites found.
+    """
+    computed_at = time.time()
+    names = list(dict.fromkeys(site_names))
+    field_str = ", ".join(["Name"] + ACCOUNT_FIELDS + DASHBOARD_FIELDS + list(subqueries))
+
+    batch = CompositeBatch()
+    handles = [batch.add_query(f"SELECT {field_str} FROM Account WHERE Name IN ({in_list})")
+               for in_list in soql_in_lists(names)]
+    batch.execute()
+    accounts = {rec["Id"]: rec for rec in _batch_records(handles)}
+
+    counts = {"gii__SalesOrder__c": {}, "gii__SalesQuote__c": {}}
+    batch = CompositeBatch()
+    handles = {sobject: [] for sobject in counts}
+    for in_list in soql_in_lists(accounts):
+        for sobject in counts:
+            handles[sobject].append(batch.add_query(
+                f"SELECT gii__Account__c, COUNT(Id) n FROM {sobject} "
+                f"WHERE gii__Status__c = 'Open' AND gii__Account__c IN ({in_list}) "
+                f"GROUP BY gii__Account__c"
+            ))
+    batch.execute()
+    for sobject, sobject_handles in handles.items():
+        for rec in _batch_records(sobject_handles):
+            counts[sobject][rec["gii__Account__c"]] = rec["n"]
+
+    dashboards = {}
+    for account_id, account in accounts.items():
+        body = build_dashboard(account, counts["gii__SalesOrder__c"].get(account_id, 0),
+                               counts["gii__SalesQuote__c"].get(account_id, 0))
+        dashboard_cache.put(account["Name"], body, computed_at)
+        account_cache.prime(account["Name"], account, computed_at)
+        dashboards[account_id] = (account, body)
+    return dashboards
+
+
+def snapshot_dashboards(site_names):
+    """Refreshes the cached dashboard of every named site; returns how many were found."""
+    return len(compute_dashboards(site_names))
+
+
+def start_snapshot_refresh(get_site_names, interval=SNAPSHOT_INTERVAL):
+    """
+    Snapshots every site now and again every `interval` seconds in a daemon
+    thread. get_site_names() is called on every run so new sites are picked up.
+    """
+    if not interval:
+        return
+
+    def _loop():
+        while True:
+            started = time.time()
+            try:
+                stored = snapshot_dashboards(get_site_names())
+                print(f"Dashboard snapshots refreshed: {stored} sites in {time.time() - started:.1f}s")
+            except Exception as e:
+                print("Dashboard snapshot refresh failed:", e)
+            time.sleep(interval)
+    threading.Thread(target=_loop, daemon=True).start()
@@ -0,0 +1,228 @@
+import csv
+import itertools
+import json
+import os
+import re
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from sf_api import iter_query_pages, query_all, soql_escape, soql_in_lists
+from catalog import product_catalog
+from account_data import ORDER_SELECT, build_order_data
+from quotes import (build_quote_lines, quote_lines_in_soql, quote_details_in_soql, open_quote_details_soql,
+                    parse_quote_details, build_pdf_data)
+from pdf_cache import pdf_cache
+from pdf_pool import pdf_render_pool, PdfPoolBusy, PDF_RENDER_TIMEOUT
+
+# Full-history exports for one Account. Records are read one Salesforce page
+# at a time (following nextRecordsUrl) and written out as they arrive, so
+# memory stays flat and the first rows go out before the last page is fetched.
+# An export may run for minutes: that needs gthread workers (gunicorn.conf.py),
+# and a gap of no more than one Salesforce page fetch between writes keeps the
+# router (Heroku: 55 s without data) from closing the connection.
+
+
+def iter_orders(account_id, instance_url):
+    """Yields every order of the Account (newest first) in the orders-tab shape, plus its date."""
+    soql = (f"SELECT {ORDER_SELECT} FROM gii__SalesOrder__c "
+            f"WHERE gii__Account__c = '{soql_escape(account_id)}' "
+            f"ORDER BY gii__OrderDate__c DESC NULLS LAST, Id DESC")
+    for page in iter_query_pages(soql):
+        for order in page:
+            yield {**build_order_data(order, instance_url), "date": order.get("gii__OrderDate__c")}
+
+
+def iter_quotes(account_id):
+    """Yields every quote of the Account (any status, newest first) with its lines."""
+    soql = (f"SELECT Id, Name, gii__Status__c, gii__QuoteDate__c FROM gii__SalesQuote__c "
+            f"WHERE gii__Account__c = '{soql_escape(account_id)}' "
+            f"ORDER BY gii__QuoteDate__c DESC NULLS LAST, Id DESC")
+    for page in iter_query_pages(soql):
+        # One lines query per page of quotes rather than one per quote
+        lines_by_quote = {}
+        for in_list in soql_in_lists(quote["Id"] for quote in page):
+            for line in query_all(quote_lines_in_soql(in_list)):
+                lines_by_quote.setdefault(line["gii__SalesQuote__c"], []).append(line)
+        product_details = product_catalog.get_product_details_many(
+            line["gii__Product__c"] for lines in lines_by_quote.values() for line in lines
+        )
+        for quote in page:
+            yield {
+                "name": quote["Name"],
+                "status": quote["gii__Status__c"],
+                "date": quote.get("gii__QuoteDate__c"),
+                "lines": build_quote_lines(lines_by_quote.get(quote["Id"], []), product_details)
+            }
+
+
+def to_ndjson(items):
+    """One JSON object per line. A failure part-way through ends the stream with an {"error": ...} line."""
+    try:
+        for item in items:
+            yield json.dumps(item, default=str) + "\n"
+    except Exception as e:
+        print("❌ Export failed:", e)
+        yield json.dumps({"error": str(e)}) + "\n"
+
+
+class _Echo:
+    """File-like object for csv.writer that hands each row back instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+ORDER_CSV_COLUMNS = ["order", "date", "status", "quote_name", "product", "qty", "price", "description",
+                     "tracking_links", "shipment_statuses"]
+QUOTE_CSV_COLUMNS = ["quote", "date", "status", "product", "qty", "price", "description"]
+
+
+def _order_rows(order):
+    shipments = order["shipments"]
+    head = [order["name"], order["date"], order["status"], order["quote_name"]]
+    tail = [" ".join(s["tracking_link"] for s in shipments if s.get("tracking_link")),
+            " ".join(s["shipment_status"] for s in shipments if s.get("shipment_status"))]
+    for line in order["lines"] or [{}]:
+        yield head + [line.get("name"), line.get("qty"), line.get("price"), line.get("description")] + tail
+
+
+def _quote_rows(quote):
+    head = [quote["name"], quote["date"], quote["status"]]
+    for line in quote["lines"] or [{}]:
+        yield head + [line.get("name"), line.get("qty"), line.get("price"), line.get("description")]
+
+
+def to_csv(items, kind):
+    """One CSV row per order/quote line (orders without lines get one row with empty line columns)."""
+    writer = csv.writer(_Echo())
+    columns, rows = (ORDER_CSV_COLUMNS, _order_rows) if kind == "orders" else (QUOTE_CSV_COLUMNS, _quote_rows)
+    yield writer.writerow(columns)
+    try:
+        for item in items:
+            for row in rows(item):
+                yield writer.writerow(row)
+    except Exception as e:
+        print("❌ Export failed:", e)
+        yield writer.writerow([f"# export failed: {e}"])
+
+
+# Most quotes in one bulk PDF export
+MAX_BULK_QUOTES = int(os.getenv('MAX_BULK_QUOTES', 200))
+
+
+def load_quotes_pdf_data(quote_names=None, account_id=None):
+    """
+    build_pdf_data() input for many quotes: the named ones, or the newest
+    MAX_BULK_QUOTES open quotes of the Account. Headers, lines and products
+    are each fetched once for the whole set (IN queries of up to 200 values).
+    Returns (pdf data list, names that were not found, whether the Account
+    has more open quotes than were included).
+    """
+    if quote_names is not None:
+        headers = []
+        for in_list in soql_in_lists(quote_names):
+            headers += query_all(quote_details_in_soql(in_list))
+        by_name = {rec["Name"]: rec for rec in headers}
+        headers = [by_name[name] for name in quote_names if name in by_name]
+        missing = [name for name in quote_names if name not in by_name]
+        truncated = False
+    else:
+        # One extra row tells whether the Account has more than the cap
+        headers = query_all(open_quote_details_soql(account_id, MAX_BULK_QUOTES + 1))
+        truncated = len(headers) > MAX_BULK_QUOTES
+        headers = headers[:MAX_BULK_QUOTES]
+        missing = []
+
+    lines_by_quote = {}
+    for in_list in soql_in_lists(rec["Id"] for rec in headers):
+        for line in query_all(quote_lines_in_soql(in_list)):
+            lines_by_quote.setdefault(line["gii__SalesQuote__c"], []).append(line)
+    product_details = product_catalog.get_product_details_many(
+        line["gii__Product__c"] for lines in lines_by_quote.values() for line in lines
+    )
+    pdf_data = [build_pdf_data(parse_quote_details([rec]), lines_by_quote.get(rec["Id"], []), product_details)
+                for rec in headers]
+    return pdf_data, missing, truncated
+
+
+def _render_pdf(data):
+    # Other requests share the render pool, so wait for room instead of failing
+    # the export. Waiting and rendering share one PDF_RENDER_TIMEOUT, which
+    # bounds the gap between two ZIP entries (see gunicorn.conf.py)
+    deadline = time.monotonic() + PDF_RENDER_TIMEOUT
+    while True:
+        try:
+            return pdf_cache.render(data, max(0.1, deadline - time.monotonic()))[0]
+        except PdfPoolBusy:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+def _rendered_in_order(pdf_data):
+    """Yields (data, future) in order while keeping at most one render per pool worker in flight."""
+    window = max(1, pdf_render_pool.workers)
+    items = iter(pdf_data)
+    with ThreadPoolExecutor(window, thread_name_prefix="bulk-pdf") as executor:
+        in_flight = deque((data, executor.submit(_render_pdf, data)) for data in itertools.islice(items, window))
+        while in_flight:
+            data, future = in_flight.popleft()
+            for nxt in itertools.islice(items, 1):
+                in_flight.append((nxt, executor.submit(_render_pdf, nxt)))
+            yield data, future
+
+
+class _ZipChunks:
+    """Write-only, unseekable file for zipfile: collects output until the generator takes it."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _zip_entry_name(quote_name, used):
+    name = re.sub(r'[^A-Za-z0-9._-]+', '_', quote_name or "quote")
+    candidate, n = f"{name}.pdf", 1
+    while candidate in used:
+        n += 1
+        candidate = f"{name}-{n}.pdf"
+    used.add(candidate)
+    return candidate
+
+
+def quote_pdfs_zip(pdf_data, missing=(), truncated=False):
+    """
+    Streams a ZIP with one PDF per quote. Each entry is sent as soon as its
+    PDF is ready, so only the PDFs being rendered are held in memory. A quote
+    that fails to render gets a .txt entry with the error instead, and a
+    truncated set gets a truncated.txt entry.
+    """
+    out = _ZipChunks()
+    used = set()
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for data, future in _rendered_in_order(pdf_data):
+            entry = _zip_entry_name(data["name"], used)
+            try:
+                zf.writestr(entry, future.result())
+            except Exception as e:
+                print(f"❌ Bulk PDF export: {data['name']} failed:", e)
+                zf.writestr(entry[:-4] + ".error.txt", f"{data['name']}: {e}\n")
+            yield out.take()
+        if missing:
+            zf.writestr("not_found.txt", "\n".join(missing) + "\n")
+        if truncated:
+            zf.writestr("truncated.txt", f"The account has more than {MAX_BULK_QUOTES} open quotes; "
+                                         f"only the newest {len(pdf_data)} are included.\n")
+    yield out.take()
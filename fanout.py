@@ -0,0 +1,48 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+
+# Shared, bounded pool for independent Salesforce reads made within one request.
+# Calls run outside the Flask request context, so pass them plain values.
+FANOUT_WORKERS = int(os.getenv('FANOUT_WORKERS', 8))
+FANOUT_TIMEOUT = float(os.getenv('FANOUT_TIMEOUT', 30))
+
+_executor = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix="fanout")
+
+
+def fan_out(*calls, timeout=FANOUT_TIMEOUT):
+    """
+    Runs independent calls in parallel and returns their results in order.
+
+    Each call is a zero-argument callable, or a (callable, timeout) pair to
+    override the default timeout for that call. Timeouts are counted from the
+    start of the fan-out. The first exception raised by any call is re-raised
+    (a call that runs out of time raises TimeoutError) and calls that have not
+    started yet are cancelled. Do not nest fan_out() inside a fanned-out call:
+    the pool is bounded and could deadlock.
+    """
+    start = time.monotonic()
+    deadlines = {}
+    for call in calls:
+        fn, call_timeout = call if isinstance(call, tuple) else (call, timeout)
+        deadlines[_executor.submit(fn)] = None if call_timeout is None else start + call_timeout
+
+    futures = list(deadlines)
+    pending = set(futures)
+    try:
+        while pending:
+            # Wake up on the first failure or the nearest per-call deadline
+            open_deadlines = [deadlines[f] for f in pending if deadlines[f] is not None]
+            wait_for = max(0.0, min(open_deadlines) - time.monotonic()) if open_deadlines else None
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_EXCEPTION)
+            for future in done:
+                if future.exception() is not None:
+                    raise future.exception()
+            now = time.monotonic()
+            if any(deadlines[f] is not None and deadlines[f] <= now for f in pending):
+                raise TimeoutError("fan_out call did not finish within its timeout")
+        return [future.result() for future in futures]
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
@@ -0,0 +1,23 @@
+import os
+
+# gunicorn settings for the Procfile's web process (gunicorn -c gunicorn.conf.py).
+
+# gthread workers: each worker process serves `threads` requests at once, so a
+# request waiting on Salesforce no longer holds up every other portal user on
+# that worker. The app's shared state (token manager, caches, HTTP pools) is
+# thread-safe. Worker processes come from WEB_CONCURRENCY, as before.
+# Streamed responses (the /api/account-data/export CSV/NDJSON exports and the
+# /api/get-quote-pdfs ZIP) depend on this too: a sync worker does not check
+# in with the master while it streams, so any export running past `timeout`
+# was killed mid-stream. Do not switch back to sync workers.
+worker_class = "gthread"
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+
+# Seconds a worker may go without checking in before the master kills it.
+# A sync worker cannot check in while it handles a request, so this was also
+# the longest any request could run. gthread workers check in from their main
+# thread while requests run, so the limit that still applies to a request is
+# the router's: on Heroku a response must start within 30 s. PDF_RENDER_TIMEOUT
+# (pdf_pool.py, default 20) stays below both, so a slow render is answered
+# with a 503 rather than a dropped connection; keep it that way if either changes.
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
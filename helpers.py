@@ -1,7 +1,7 @@
 import requests
 import json
-from check_sf_token import get_salesforce_access_token
-import os
+from check_sf_token import token_manager, salesforce_request
+from account_cache import account_cache
 from dotenv import load_dotenv
 import threading
 #from bs4 import BeautifulSoup
@@ -20,13 +20,13 @@ def contact_create_update(request_body):
     # ---- Helpers ----
     def query_soql(soql):
         url = f"{instance_url}/services/data/v61.0/query"
-        resp = requests.get(url, headers=headers, params={"q": soql})
+        resp = salesforce_request("GET", url, params={"q": soql})
         resp.raise_for_status()
         return resp.json()
 
     def create_record(object_name, data):
         url = f"{instance_url}/services/data/v61.0/sobjects/{object_name}/"
-        resp = requests.post(url, headers=headers, json=data)
+        resp = salesforce_request("POST", url, json=data)
         if not resp.ok:
             print("Salesforce Error:", resp.text)
             resp.raise_for_status()
@@ -34,13 +34,13 @@ def contact_create_update(request_body):
 
     def delete_record(object_name, record_id):
         url = f"{instance_url}/services/data/v61.0/sobjects/{object_name}/{record_id}"
-        resp = requests.delete(url, headers=headers)
+        resp = salesforce_request("DELETE", url)
         if resp.status_code != 204:
             print("Delete failed:", resp.text)
     
     def update_contact(contact_id, updates):
         url = f"{instance_url}/services/data/v61.0/sobjects/Contact/{contact_id}"
-        resp = requests.patch(url, headers=headers, json=updates)
+        resp = salesforce_request("PATCH", url, json=updates)
         if not resp.ok:
             print("Salesforce Error (update contact):", resp.text)
             resp.raise_for_status()
@@ -49,17 +49,7 @@ def contact_create_update(request_body):
 
 
     # ---- Auth ----
-    access_token, instance_url = get_salesforce_access_token(
-        client_id=os.getenv('SALESFORCE_CLIENT_ID'),
-        client_secret=os.getenv('SALESFORCE_CLIENT_SECRET'),
-        username=os.getenv('SALESFORCE_USERNAME'),
-        password=os.getenv('SALESFORCE_PASSWORD'),
-        security_token=os.getenv('SALESFORCE_SECURITY_TOKEN')
-    )
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
+    _, instance_url = token_manager.get()
 
     # ---- Input ----
     data = request_body
@@ -79,10 +69,10 @@ def contact_create_update(request_body):
     for name in incoming_account_names:
         if not name:
             continue
-        accs = query_soql(f"SELECT Id FROM Account WHERE Name = '{name.strip()}'")
-        if accs["totalSize"] == 0:
+        account = account_cache.get(name.strip())
+        if not account:
             raise ValueError(f"Account not found: {name}")
-        account_name_to_id[name] = accs["records"][0]["Id"]
+        account_name_to_id[name] = account["Id"]
 
     # ---- Step 2: Get or Create Contact ----
     cts = query_soql(f"SELECT Id, AccountId FROM Contact WHERE Email = '{email}'")
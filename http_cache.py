@@ -0,0 +1,45 @@
+import functools
+import json
+from flask import request, make_response
+from werkzeug.http import generate_etag
+
+
+def data_etag(data):
+    """Strong ETag for the JSON-serializable data a response is built from."""
+    return generate_etag(json.dumps(data, sort_keys=True, default=str).encode())
+
+
+def not_modified(etag):
+    """An empty 304 for a view that can tell the client's copy is current before building the body."""
+    response = make_response("", 304)
+    response.set_etag(etag)
+    return response
+
+
+def _finish(rv, cache_control):
+    response = make_response(rv)
+    if request.method != 'GET' or response.status_code != 200:
+        return response
+    response.headers['Cache-Control'] = cache_control
+    if response.is_streamed:
+        return response
+    if not response.get_etag()[0]:
+        response.add_etag()
+    return response.make_conditional(request)
+
+
+def conditional(cache_control="private, no-cache"):
+    """
+    Makes a GET view cacheable by clients. Successful responses get the given
+    Cache-Control header and a strong ETag, and a matching If-None-Match is
+    answered with an empty 304.
+
+    The ETag is a hash of the body unless the view already set one (e.g.
+    from data_etag() of the records it used, to leave out volatile fields).
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            return _finish(view(*args, **kwargs), cache_control)
+        return wrapper
+    return decorator
@@ -0,0 +1,36 @@
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+load_dotenv()
+
+# Pool size should match how many requests a gunicorn worker serves at once
+# (threads per worker, plus headroom for background work). Connect/read
+# timeouts apply to every call that does not pass its own timeout.
+POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', 10))
+CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 5))
+READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 30))
+
+
+class PooledSession(requests.Session):
+    """
+    A requests.Session with a sized keep-alive connection pool and a default
+    (connect, read) timeout. One instance is shared per upstream so repeated
+    calls reuse the same TCP+TLS connections.
+    """
+
+    def __init__(self, pool_size=POOL_SIZE, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)):
+        super().__init__()
+        self.timeout = timeout
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+# Connections are opened lazily, so each gunicorn worker builds its own pool
+salesforce_session = PooledSession()
+memberstack_session = PooledSession()
@@ -0,0 +1,63 @@
+import base64
+import binascii
+import json
+import re
+
+# Keyset ("seek") pagination for newest-first lists ordered by a date field
+# with Id as the tie-breaker. Unlike OFFSET it costs the same on every page
+# and is not capped at Salesforce's 2000-row OFFSET limit.
+
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}:\d{2}(\.\d{1,3})?(Z|[+-]\d{2}:?\d{2}))?")
+_ID_RE = re.compile(r"[A-Za-z0-9]{15,18}")
+
+
+def encode_cursor(record, date_field):
+    """Opaque cursor for the position just after `record`."""
+    payload = json.dumps([record.get(date_field), record["Id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Returns (date or None, Id) from encode_cursor(); raises ValueError for anything else."""
+    try:
+        date, record_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError("Invalid cursor")
+    # Both values end up in SOQL, so only accept what Salesforce could have returned
+    if not isinstance(record_id, str) or not _ID_RE.fullmatch(record_id):
+        raise ValueError("Invalid cursor")
+    if date is not None and (not isinstance(date, str) or not _DATE_RE.fullmatch(date)):
+        raise ValueError("Invalid cursor")
+    return date, record_id
+
+
+def _soql_datetime(value):
+    # Date fields come back as 2026-01-31 (already a SOQL literal), datetimes
+    # as 2026-01-31T12:00:00.000+0000 (always UTC)
+    return value if "T" not in value else value[:19] + "Z"
+
+
+def page_soql(date_field, page_size, page=1, after=None):
+    """
+    Returns (filter, tail) for one page: an " AND ..." condition to append to
+    the WHERE clause and the ORDER BY/LIMIT/OFFSET clause. With `after` (a
+    decoded cursor) the page starts right after that row; without it, `page`
+    is used with OFFSET. One extra row is requested so split_page() can tell
+    whether another page exists.
+    """
+    tail = f"ORDER BY {date_field} DESC NULLS LAST, Id DESC LIMIT {page_size + 1}"
+    if after is None:
+        return "", f"{tail} OFFSET {(page - 1) * page_size}"
+    date, record_id = after
+    if date is None:
+        return f" AND {date_field} = null AND Id < '{record_id}'", tail
+    date = _soql_datetime(date)
+    return (f" AND ({date_field} < {date} OR ({date_field} = {date} AND Id < '{record_id}')"
+            f" OR {date_field} = null)"), tail
+
+
+def split_page(records, date_field, page_size):
+    """Drops the extra row page_soql() asked for; returns (records, next_cursor or None)."""
+    if len(records) > page_size:
+        return records[:page_size], encode_cursor(records[page_size - 1], date_field)
+    return records, None
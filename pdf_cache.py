@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from singleflight import SingleFlight
+from pdf_pool import pdf_render_pool
+
+# Rendered quote PDFs keyed by a hash of what build_quote_pdf_bytes() draws.
+# Memory LRU first, then a directory of <key>.pdf files shared by every worker.
+# PDF_CACHE_DISK_BYTES is the budget of the whole directory, not per worker.
+
+PDF_CACHE_MEMORY_BYTES = int(os.getenv('PDF_CACHE_MEMORY_BYTES', 64 * 1024 * 1024))
+PDF_CACHE_DIR = os.getenv('PDF_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'dtg-pdf-cache'))
+# 0 turns the disk tier off
+PDF_CACHE_DISK_BYTES = int(os.getenv('PDF_CACHE_DISK_BYTES', 512 * 1024 * 1024))
+
+
+def _number(value):
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def pdf_cache_key(data):
+    """
+    sha256 of the fields the PDF is drawn from, so extra keys (first_name,
+    logo_url, ...) and 3 vs 3.0 do not split the cache. A quote without a
+    date is printed with today's date, so that is part of the key too.
+    """
+    normalized = {
+        "account_name": data.get("account_name") or "",
+        "name": data.get("name") or "QUOTE",
+        "status": data.get("status") or "",
+        "shipping_address": data.get("shipping_address") or "",
+        "quote_date": data.get("quote_date") or datetime.utcnow().strftime("%B %d, %Y"),
+        "notes": data.get("notes") or "",
+        "lines": [[line.get("description") or "", line.get("name") or "",
+                   _number(line.get("qty")), _number(line.get("price"))]
+                  for line in data.get("lines") or []],
+    }
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class PdfCache:
+    def __init__(self, memory_bytes, directory, disk_bytes):
+        self.memory_bytes = memory_bytes
+        self.directory = directory
+        self.disk_bytes = disk_bytes
+        self._memory = OrderedDict()   # key -> pdf bytes, least recently used first
+        self._memory_size = 0
+        self._disk = OrderedDict()     # key -> file size, oldest mtime first, as of the last scan
+        self._disk_size = 0
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self.hits = self.disk_hits = self.misses = 0
+        if disk_bytes > 0:
+            self._scan_disk()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pdf")
+
+    def _scan_disk(self):
+        """Rebuilds the disk index from the directory, which other workers write to as well."""
+        entries = []
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(".pdf"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue   # evicted by another worker meanwhile
+                entries.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        except OSError as e:
+            print("❌ PDF cache directory unavailable:", e)
+            self.disk_bytes = 0
+            return
+        entries.sort()
+        with self._lock:
+            self._disk = OrderedDict((key, size) for _, key, size in entries)
+            self._disk_size = sum(size for _, _, size in entries)
+
+    def _remember(self, key, pdf):
+        # Caller holds the lock
+        if key in self._memory or len(pdf) > self.memory_bytes:
+            return
+        self._memory[key] = pdf
+        self._memory_size += len(pdf)
+        while self._memory_size > self.memory_bytes:
+            _, old = self._memory.popitem(last=False)
+            self._memory_size -= len(old)
+
+    def _read_disk(self, key):
+        if self.disk_bytes <= 0:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                pdf = f.read()
+            os.utime(self._path(key))   # mtime is the LRU order after a restart
+        except OSError:
+            return None
+        with self._lock:
+            if key in self._disk:
+                self._disk.move_to_end(key)
+        return pdf
+
+    def _write_disk(self, key, pdf):
+        if self.disk_bytes <= 0 or len(pdf) > self.disk_bytes:
+            return
+        path = self._path(key)
+        try:
+            # Write then rename, so another worker never reads half a file
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(pdf)
+            os.replace(tmp, path)
+        except OSError as e:
+            print("❌ PDF cache write failed:", e)
+            return
+        # Evict by what is really in the directory, not by what this process
+        # wrote, so N workers together stay within one budget
+        self._scan_disk()
+        evicted = []
+        with self._lock:
+            while self._disk_size > self.disk_bytes:
+                old, size = self._disk.popitem(last=False)
+                self._disk_size -= size
+                evicted.append(old)
+        for old in evicted:
+            try:
+                os.remove(self._path(old))
+            except OSError:
+                pass
+
+    def get(self, key):
+        with self._lock:
+            pdf = self._memory.get(key)
+            if pdf is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return pdf
+        pdf = self._read_disk(key)
+        if pdf is not None:
+            with self._lock:
+                self.hits += 1
+                self.disk_hits += 1
+                self._remember(key, pdf)
+        return pdf
+
+    def put(self, key, pdf):
+        with self._lock:
+            self._remember(key, pdf)
+        self._write_disk(key, pdf)
+
+    def render(self, data, timeout=None):
+        """
+        Returns (pdf bytes, hit). Concurrent misses for the same quote render
+        it once. timeout is passed to pdf_render_pool.render().
+        """
+        key = pdf_cache_key(data)
+        pdf = self.get(key)
+        if pdf is not None:
+            return pdf, True
+
+        def build():
+            pdf = self.get(key)   # another request may have just finished it
+            if pdf is None:
+                with self._lock:
+                    self.misses += 1
+                pdf = pdf_render_pool.render(data, timeout)
+                self.put(key, pdf)
+            return pdf
+        return self._flights.do(key, build), False
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_size,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_size,
+            }
+
+
+pdf_cache = PdfCache(PDF_CACHE_MEMORY_BYTES, PDF_CACHE_DIR, PDF_CACHE_DISK_BYTES)
@@ -1,6 +1,9 @@
 # pip install reportlab requests
 import io, requests
+import copy
+import functools
 from datetime import datetime
+from reportlab import rl_config
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import LETTER
 from reportlab.lib.units import inch
@@ -39,6 +42,66 @@ def _fetch_logo(url: str):
     except Exception:
         return None
 
+# Write PDF streams as binary rather than ASCII85 text. reportlab's A85
+# encoder is pure Python, and re-encoding the logo took most of the time of a
+# small quote; binary files are also ~15% smaller.
+rl_config.useA85 = 0
+
+LOGO_PATH = "DTG_Logo_Black.png"
+PAGE_MARGINS = dict(leftMargin=0.6 * inch, rightMargin=0.6 * inch, topMargin=0.6 * inch, bottomMargin=0.7 * inch)
+
+
+class RenderContext:
+    """
+    The parts of a quote PDF that are the same for every quote: styles, the
+    decoded logo, the company address and the table styles. Built once per
+    process (render_context()) and only read by renders, so it can be shared
+    across threads; flowables are copied per render because drawing sets
+    state on them.
+    """
+
+    def __init__(self, logo_path=LOGO_PATH):
+        self.styles = getSampleStyleSheet()
+        self.styles.add(ParagraphStyle(name="HRight", fontSize=22, alignment=2))
+        self.styles.add(ParagraphStyle(name="SmallGray", fontSize=9, textColor=colors.grey))
+        self.styles.add(ParagraphStyle(name="Tight", leading=14))
+
+        with open(logo_path, "rb") as f:
+            self.logo = Image(io.BytesIO(f.read()), width=2.1*inch, height=0.65*inch)
+        # Decode now rather than in the first render (drawImage hashes the pixels)
+        self.logo._img.getRGBData()
+
+        self.address = Paragraph("35 Upton Dr<br/>Wilmington, MA 01887<br/>978-532-0444", self.styles["Tight"])
+
+        self.header_style = TableStyle([
+            ("VALIGN",(0,0),(-1,-1),"TOP"),
+            ("ALIGN",(1,0),(1,0),"RIGHT"),
+            ("BOTTOMPADDING",(0,0),(-1,-1),0),
+        ])
+        self.summary_style = TableStyle([
+            ("BACKGROUND",(0,0),(-1,0), colors.black),
+            ("TEXTCOLOR",(0,0),(-1,0), colors.white),
+            ("GRID",(0,0),(-1,-1), 1, colors.black),
+            ("VALIGN",(0,0),(-1,-1), "TOP"),
+        ])
+        self.items_style = TableStyle([
+            ("BACKGROUND",(0,0),(-1,0), colors.black),
+            ("TEXTCOLOR",(0,0),(-1,0), colors.white),
+            ("GRID",(0,0),(-1,-1), 1, colors.black),
+            ("VALIGN",(0,0),(-1,-1),"TOP"),
+            ("ALIGN",(2,1),(-1,-2),"RIGHT"),
+            ("ALIGN",(2,0),(2,-1),"CENTER"),         # QTY header center
+            ("FONTNAME",(-2,-1),(-1,-1),"Helvetica-Bold"),
+            ("SPAN",(0,-1),(2,-1)),                  # span blanks left of Total
+        ])
+        self.notes_style = TableStyle([("GRID",(0,0),(-1,-1),1,colors.black)])
+
+
+@functools.lru_cache(maxsize=None)
+def render_context() -> RenderContext:
+    return RenderContext()
+
+
 def build_quote_pdf_bytes(data: dict) -> bytes:
     """
     Expected data:
@@ -55,27 +118,19 @@ def build_quote_pdf_bytes(data: dict) -> bytes:
       "notes": str (optional)
     }
     """
+    ctx = render_context()
     buf = io.BytesIO()
-    left = right = 0.6 * inch
-    top = 0.6 * inch
-    bottom = 0.7 * inch
+    right = PAGE_MARGINS["rightMargin"]
 
-    doc = SimpleDocTemplate(
-        buf, pagesize=LETTER,
-        leftMargin=left, rightMargin=right, topMargin=top, bottomMargin=bottom
-    )
+    doc = SimpleDocTemplate(buf, pagesize=LETTER, **PAGE_MARGINS)
     avail = doc.width
 
-    styles = getSampleStyleSheet()
-    styles.add(ParagraphStyle(name="HRight", fontSize=22, alignment=2))
-    styles.add(ParagraphStyle(name="SmallGray", fontSize=9, textColor=colors.grey))
-    styles.add(ParagraphStyle(name="Tight", leading=14))
+    styles = ctx.styles
     story = []
 
     # --- Header (logo + quote info) ---
     #logo_stream = _fetch_logo_bytes(data.get("logo_url") or "https://i.ibb.co/hvF4nWd/dtg-logo.png")
-    logo_path = "DTG_Logo_Black.png"
-    logo = Image(logo_path, width=2.1*inch, height=0.65*inch)
+    logo = copy.copy(ctx.logo)
 
     quote_no = data.get("name") or "QUOTE"
     quote_dt = data.get("quote_date") or datetime.utcnow().strftime("%B %d, %Y")
@@ -89,15 +144,10 @@ def build_quote_pdf_bytes(data: dict) -> bytes:
          ]],
         colWidths=[0.5*avail, 0.5*avail]
     )
-    header.setStyle(TableStyle([
-        ("VALIGN",(0,0),(-1,-1),"TOP"),
-        ("ALIGN",(1,0),(1,0),"RIGHT"),
-        ("BOTTOMPADDING",(0,0),(-1,-1),0),
-    ]))
+    header.setStyle(ctx.header_style)
     story += [header, Spacer(1, 6)]
 
-    story += [Paragraph("35 Upton Dr<br/>Wilmington, MA 01887<br/>978-532-0444", styles["Tight"]),
-              Spacer(1, 12)]
+    story += [copy.copy(ctx.address), Spacer(1, 12)]
 
     # --- Summary (3 cols): Customer | Status | Ship To ---
     customer = data.get("account_name","")
@@ -110,12 +160,7 @@ def build_quote_pdf_bytes(data: dict) -> bytes:
         colWidths=[avail*0.22, avail*0.18, avail*0.60],
         repeatRows=1
     )
-    summary.setStyle(TableStyle([
-        ("BACKGROUND",(0,0),(-1,0), colors.black),
-        ("TEXTCOLOR",(0,0),(-1,0), colors.white),
-        ("GRID",(0,0),(-1,-1), 1, colors.black),
-        ("VALIGN",(0,0),(-1,-1), "TOP"),
-    ]))
+    summary.setStyle(ctx.summary_style)
     story += [summary, Spacer(1, 10)]
 
     # --- Items table (5 cols): Description | Part # | QTY | Unit | Ext ---
@@ -140,16 +185,7 @@ def build_quote_pdf_bytes(data: dict) -> bytes:
     widths = [avail*0.48, avail*0.20, avail*0.08, avail*0.12, avail*0.12]
 
     items_tbl = Table(rows, colWidths=widths, repeatRows=1)
-    items_tbl.setStyle(TableStyle([
-        ("BACKGROUND",(0,0),(-1,0), colors.black),
-        ("TEXTCOLOR",(0,0),(-1,0), colors.white),
-        ("GRID",(0,0),(-1,-1), 1, colors.black),
-        ("VALIGN",(0,0),(-1,-1),"TOP"),
-        ("ALIGN",(2,1),(-1,-2),"RIGHT"),
-        ("ALIGN",(2,0),(2,-1),"CENTER"),         # QTY header center
-        ("FONTNAME",(-2,-1),(-1,-1),"Helvetica-Bold"),
-        ("SPAN",(0,-1),(2,-1)),                  # span blanks left of Total
-    ]))
+    items_tbl.setStyle(ctx.items_style)
     story += [items_tbl, Spacer(1, 12)]
 
     # --- Notes (optional) ---
@@ -157,7 +193,7 @@ def build_quote_pdf_bytes(data: dict) -> bytes:
     if notes:
         story += [Paragraph("<b>Notes:</b>", styles["Normal"])]
         notes_tbl = Table([[Paragraph(notes, styles["Tight"])]], colWidths=[avail])
-        notes_tbl.setStyle(TableStyle([("GRID",(0,0),(-1,-1),1,colors.black)]))
+        notes_tbl.setStyle(ctx.notes_style)
         story += [notes_tbl]
 
     # --- Footer with page numbers ---
@@ -176,9 +212,10 @@ def build_quote_pdf_bytes(data: dict) -> bytes:
     buf.seek(0)
     return buf.read()
 
-def send_test_email_with_pdf(sample):
+def send_test_email_with_pdf(sample, pdf_bytes=None):
 
-    pdf_bytes = build_quote_pdf_bytes(sample)
+    if pdf_bytes is None:
+        pdf_bytes = build_quote_pdf_bytes(sample)
 
     gmail_user = os.getenv('GMAIL_USER')
     gmail_app_password = os.getenv('GMAIL_APP_PASSWORD')
@@ -0,0 +1,160 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from pdf_creator_1 import build_quote_pdf_bytes, render_context
+
+# reportlab is pure Python and CPU-bound, so quote PDFs are rendered in worker
+# processes instead of the request thread, where they would hold the GIL and
+# stall every other request on the gunicorn worker.
+
+# 0 renders in the calling thread, as before
+PDF_POOL_WORKERS = int(os.getenv('PDF_POOL_WORKERS', 2))
+# Renders that may wait for a free worker; more than that are turned away
+PDF_POOL_MAX_QUEUE = int(os.getenv('PDF_POOL_MAX_QUEUE', 8))
+# Seconds a caller waits for its PDF (queueing included). Kept well under the
+# 30 s a response has to start in (see gunicorn.conf.py), since the Salesforce
+# reads before the render use part of that
+PDF_RENDER_TIMEOUT = float(os.getenv('PDF_RENDER_TIMEOUT', 20))
+
+# Workers are forked from a forkserver (a clean single-threaded process
+# with reportlab already imported), never from the app process: a restart
+# happens while request and refresh threads run, and forking then can copy
+# a lock another thread holds. spawn where forkserver is not available.
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class PdfPoolBusy(Exception):
+    """Every worker is busy and the queue is full."""
+
+
+class PdfRenderTimeout(Exception):
+    """The PDF was not ready within PDF_RENDER_TIMEOUT."""
+
+
+def _warm_worker():
+    # Runs once in each worker: styles and the decoded logo are ready before
+    # the first job arrives
+    render_context()
+
+
+def _noop():
+    return None
+
+
+class PdfRenderPool:
+    def __init__(self, workers, max_queue, timeout):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(workers + max_queue) if workers > 0 else None
+        self.pending = self.max_pending_seen = 0
+        self.completed = self.rejected = self.timeouts = self.failures = 0
+        self._wait_seconds = 0.0
+
+    def start(self):
+        """Starts the workers now rather than on the first render."""
+        if self.workers <= 0:
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._new_executor()
+
+    def _new_executor(self):
+        # Caller holds the lock
+        context = multiprocessing.get_context(_START_METHOD)
+        if _START_METHOD == "forkserver":
+            context.set_forkserver_preload(["pdf_creator_1"])
+        executor = ProcessPoolExecutor(self.workers, mp_context=context, initializer=_warm_worker)
+        for _ in range(self.workers):
+            executor.submit(_noop)   # start every worker up front
+        print(f"✅ PDF render pool started with {self.workers} workers")
+        return executor
+
+    def _restart(self, broken):
+        with self._lock:
+            if self._executor is broken:
+                print("❌ PDF render pool broke (worker died), restarting")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor()
+
+    def _finished(self, future):
+        with self._lock:
+            self.pending -= 1
+        self._slots.release()
+
+    def render(self, data, timeout=None):
+        """
+        build_quote_pdf_bytes(data) in a worker process. Raises PdfPoolBusy
+        when the queue is full and PdfRenderTimeout after `timeout` seconds
+        (PDF_RENDER_TIMEOUT by default).
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if self.workers <= 0:
+            return build_quote_pdf_bytes(data)
+        self.start()
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PdfPoolBusy(f"PDF render queue is full ({self.max_queue} waiting)")
+
+        executor = self._executor
+        try:
+            future = executor.submit(build_quote_pdf_bytes, data)
+        except BrokenProcessPool:
+            self._slots.release()
+            with self._lock:
+                self.failures += 1
+            self._restart(executor)
+            raise
+        with self._lock:
+            self.pending += 1
+            self.max_pending_seen = max(self.max_pending_seen, self.pending)
+        # The slot is given back when the job really ends: a timed-out render
+        # keeps its worker busy until it finishes, so it still counts
+        future.add_done_callback(self._finished)
+
+        started = time.monotonic()
+        try:
+            pdf = future.result(timeout=timeout)
+        except FutureTimeout:
+            future.cancel()   # only helps while it is still queued
+            with self._lock:
+                self.timeouts += 1
+            raise PdfRenderTimeout(f"PDF render took longer than {timeout:g}s")
+        except BrokenProcessPool:
+            with self._lock:
+                self.failures += 1
+            self._restart(executor)
+            raise
+        except Exception:
+            with self._lock:
+                self.failures += 1
+            raise
+        with self._lock:
+            self.completed += 1
+            self._wait_seconds += time.monotonic() - started
+        return pdf
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "pending": self.pending,
+                "running": min(self.pending, self.workers),
+                "queued": max(0, self.pending - self.workers),
+                "max_pending_seen": self.max_pending_seen,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "failures": self.failures,
+                "avg_wait_ms": round(self._wait_seconds / self.completed * 1000, 1) if self.completed else None,
+            }
+
+
+pdf_render_pool = PdfRenderPool(PDF_POOL_WORKERS, PDF_POOL_MAX_QUEUE, PDF_RENDER_TIMEOUT)
@@ -0,0 +1,117 @@
+from account_data import PAGE_SIZE, price_to_float
+from sf_api import soql_escape
+from pagination import page_soql
+
+# SOQL and response shaping for the quote routes and exports
+
+
+def quotes_page_soql(account_id, page=1, after=None):
+    """Open quotes, newest first; split the result with pagination.split_page()."""
+    keyset, tail = page_soql("gii__QuoteDate__c", PAGE_SIZE, page, after)
+    return f"""
+    SELECT Id, Name, gii__Status__c, gii__QuoteDate__c
+    FROM gii__SalesQuote__c
+    WHERE gii__Account__c = '{soql_escape(account_id)}' and
+    gii__Status__c = 'Open'{keyset}
+    {tail}
+    """
+
+
+def open_quotes_count_soql(account_id):
+    return (f"SELECT COUNT() FROM gii__SalesQuote__c "
+            f"WHERE gii__Account__c = '{soql_escape(account_id)}' AND gii__Status__c = 'Open'")
+
+
+def quote_lines_soql(quote_id):
+    return ("SELECT Id, gii__Product__c, gii__OrderQuantity__c FROM gii__SalesQuoteLine__c "
+            f"WHERE gii__SalesQuote__c = '{soql_escape(quote_id)}'")
+
+
+def quote_lines_in_soql(in_list):
+    """Lines of many quotes; in_list comes from sf_api.soql_in_lists() over quote Ids."""
+    return ("SELECT Id, gii__SalesQuote__c, gii__Product__c, gii__OrderQuantity__c FROM gii__SalesQuoteLine__c "
+            f"WHERE gii__SalesQuote__c IN ({in_list})")
+
+
+def quote_lines_by_name_soql(quote_name):
+    return ("SELECT Id, gii__Product__c, gii__OrderQuantity__c FROM gii__SalesQuoteLine__c "
+            f"WHERE gii__SalesQuote__r.Name = '{soql_escape(quote_name)}'")
+
+
+QUOTE_DETAIL_FIELDS = (
+    "Id, Name, gii__Status__c, gii__QuoteDate__c, gii__Account__r.Name, "
+    "gii__Account__r.ShippingStreet, gii__Account__r.ShippingCity, gii__Account__r.ShippingState, "
+    "gii__Account__r.ShippingPostalCode, gii__Account__r.ShippingCountry"
+)
+
+
+def quote_details_soql(quote_name):
+    return f"SELECT {QUOTE_DETAIL_FIELDS} FROM gii__SalesQuote__c WHERE Name = '{soql_escape(quote_name)}' LIMIT 1"
+
+
+def quote_details_in_soql(in_list):
+    """Headers of many quotes; in_list comes from sf_api.soql_in_lists() over quote Names."""
+    return f"SELECT {QUOTE_DETAIL_FIELDS} FROM gii__SalesQuote__c WHERE Name IN ({in_list})"
+
+
+def open_quote_details_soql(account_id, limit):
+    """Headers of the newest `limit` open quotes of an Account, newest first."""
+    return (f"SELECT {QUOTE_DETAIL_FIELDS} FROM gii__SalesQuote__c "
+            f"WHERE gii__Account__c = '{soql_escape(account_id)}' AND gii__Status__c = 'Open' "
+            f"ORDER BY gii__QuoteDate__c DESC NULLS LAST, Id DESC LIMIT {int(limit)}")
+
+
+def parse_quote_details(records):
+    """Flattens the first quote_details_soql record (or {} if there is none)."""
+    if not records:
+        return {}
+    rec = records[0]
+    account = rec.get("gii__Account__r") or {}
+    return {
+        "Id": rec.get("Id"),
+        "Name": rec.get("Name"),
+        "Status": rec.get("gii__Status__c"),
+        "QuoteDate": rec.get("gii__QuoteDate__c"),
+        "AccountName": account.get("Name", ""),
+        "street": account.get("ShippingStreet", ""),
+        "city": account.get("ShippingCity", ""),
+        "state": account.get("ShippingState", ""),
+        "postal_code": account.get("ShippingPostalCode", ""),
+        "country": account.get("ShippingCountry", ""),
+    }
+
+
+def format_shipping_address(addr: dict) -> str:
+    """Safely combine address parts into a single string with newlines."""
+    parts = [
+        addr.get("street") or "",
+        " ".join([addr.get("city") or "", addr.get("state") or "", addr.get("postal_code") or ""]).strip(),
+        addr.get("country") or ""
+    ]
+    return "\n".join([p for p in parts if p])   # remove empty parts
+
+
+def build_quote_lines(quote_lines, product_details):
+    """Turns gii__SalesQuoteLine__c records into {"name", "qty", "price", "description"} dicts."""
+    lines = []
+    for ql in quote_lines:
+        pname, pprice, pdescription = product_details[ql["gii__Product__c"]]
+        lines.append({
+            "name": pname,
+            "qty": ql['gii__OrderQuantity__c'],
+            "price": price_to_float(pprice),
+            "description": pdescription
+        })
+    return lines
+
+
+def build_pdf_data(quote_info, quote_lines, product_details):
+    """Builds the build_quote_pdf_bytes() input for one quote."""
+    return {
+        "name": quote_info['Name'],
+        "status": quote_info['Status'],
+        "shipping_address": format_shipping_address(quote_info),
+        "account_name": quote_info.get("AccountName", ""),
+        "quote_date": quote_info['QuoteDate'],
+        "lines": build_quote_lines(quote_lines, product_details)
+    }
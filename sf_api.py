@@ -0,0 +1,295 @@
+import urllib.parse
+from check_sf_token import salesforce_request
+
+API_VERSION = "v60.0"
+# Salesforce accepts at most 25 subrequests per composite/batch call
+BATCH_LIMIT = 25
+
+PRODUCT_FIELDS = "Name, Amazon_Price__c, gii__Description__c"
+UNKNOWN_PRODUCT = ("Unknown", "N/A", "N/A")
+
+
+def soql_escape(value):
+    """Escapes a value for use inside a single-quoted SOQL string literal."""
+    return str(value).replace("\\", "\\\\").replace("'", "\\'")
+
+
+# Values per "IN (...)" list; keeps each query URL well under the length limit
+IN_CHUNK = 200
+
+
+def soql_in_lists(values, size=IN_CHUNK):
+    """Splits values into escaped "'a', 'b', ..." lists of at most `size` for IN (...) clauses."""
+    values = list(values)
+    return [", ".join(f"'{soql_escape(v)}'" for v in values[i:i + size]) for i in range(0, len(values), size)]
+
+
+def query(soql):
+    """Runs a SOQL query and returns the decoded response body."""
+    resp = salesforce_request("GET", f"/services/data/{API_VERSION}/query", params={"q": soql})
+    resp.raise_for_status()
+    return resp.json()
+
+
+def iter_query_pages(soql):
+    """Yields each page of records for a SOQL query, following nextRecordsUrl."""
+    page = query(soql)
+    while True:
+        yield page.get("records", [])
+        next_url = page.get("nextRecordsUrl")
+        if not next_url:
+            break
+        resp = salesforce_request("GET", next_url)
+        resp.raise_for_status()
+        page = resp.json()
+
+
+def query_all(soql):
+    """Runs a SOQL query and returns every record across all result pages."""
+    records = []
+    for page in iter_query_pages(soql):
+        records.extend(page)
+    return records
+
+
+def child_records(parent, relationship):
+    """
+    Returns all records of a parent-child subquery on `parent`. Salesforce
+    returns None for an empty subquery and pages large ones, so this follows
+    nextRecordsUrl until the child set is complete.
+    """
+    children = parent.get(relationship)
+    if not children:
+        return []
+    records = list(children.get("records", []))
+    next_url = children.get("nextRecordsUrl")
+    while next_url:
+        resp = salesforce_request("GET", next_url)
+        resp.raise_for_status()
+        page = resp.json()
+        records.extend(page.get("records", []))
+        next_url = page.get("nextRecordsUrl")
+    return records
+
+
+class BatchResult:
+    """Placeholder for one subrequest; filled in when its batch executes."""
+
+    def __init__(self):
+        self.status_code = None
+        self.result = None
+
+    @property
+    def ok(self):
+        return self.status_code is not None and 200 <= self.status_code < 300
+
+
+class CompositeBatch:
+    """
+    Collects independent Salesforce subrequests and sends them through
+    /composite/batch in groups of up to 25, so N lookups cost ceil(N / 25)
+    round trips. Each add() returns a BatchResult that is populated by
+    execute().
+    """
+
+    def __init__(self, halt_on_error=False):
+        self.halt_on_error = halt_on_error
+        self._pending = []
+
+    def add(self, method, url, body=None):
+        """`url` is relative to /services/data, e.g. "v60.0/sobjects/Account/001..."."""
+        sub = {"method": method, "url": url}
+        if body is not None:
+            sub["richInput"] = body
+        handle = BatchResult()
+        self._pending.append((sub, handle))
+        return handle
+
+    def add_query(self, soql):
+        return self.add("GET", f"{API_VERSION}/query?q={urllib.parse.quote(soql)}")
+
+    def execute(self):
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), BATCH_LIMIT):
+            chunk = pending[start:start + BATCH_LIMIT]
+            resp = salesforce_request(
+                "POST",
+                f"/services/data/{API_VERSION}/composite/batch",
+                json={"haltOnError": self.halt_on_error,
+                      "batchRequests": [sub for sub, _ in chunk]}
+            )
+            resp.raise_for_status()
+            results = resp.json().get("results", [])
+            for (_, handle), res in zip(chunk, results):
+                handle.status_code = res.get("statusCode")
+                handle.result = res.get("result")
+
+
+def get_product_details_many(product_ids):
+    """
+    Returns {product_id: (Name, Amazon_Price__c, gii__Description__c)} for the
+    given gii__Product2Add__c Ids, fetched with one composite batch per 25
+    distinct Ids. Missing products map to ("Unknown", "N/A", "N/A").
+    """
+    batch = CompositeBatch()
+    handles = {}
+    for product_id in dict.fromkeys(p for p in product_ids if p):
+        handles[product_id] = batch.add_query(
+            f"SELECT {PRODUCT_FIELDS} FROM gii__Product2Add__c WHERE Id = '{soql_escape(product_id)}' LIMIT 1"
+        )
+    batch.execute()
+
+    details = {}
+    for product_id, handle in handles.items():
+        records = (handle.result or {}).get("records", []) if handle.ok else []
+        if records:
+            rec = records[0]
+            details[product_id] = (rec["Name"], rec.get("Amazon_Price__c", "N/A"), rec.get("gii__Description__c", "N/A"))
+        else:
+            details[product_id] = UNKNOWN_PRODUCT
+    return details
+
+
+def get_product_ids_many(partnumbers):
+    """Returns {partnumber: gii__Product2Add__c Id or None} using composite batches."""
+    batch = CompositeBatch()
+    handles = {}
+    for partnumber in dict.fromkeys(p for p in partnumbers if p):
+        handles[partnumber] = batch.add_query(
+            f"SELECT Id FROM gii__Product2Add__c WHERE Name = '{soql_escape(partnumber)}' LIMIT 1"
+        )
+    batch.execute()
+
+    ids = {}
+    for partnumber, handle in handles.items():
+        records = (handle.result or {}).get("records", []) if handle.ok else []
+        ids[partnumber] = records[0]["Id"] if records else None
+    return ids
+
+
+# Composite graph limits: nodes per graph and graphs per request
+GRAPH_NODE_LIMIT = 500
+GRAPHS_PER_REQUEST = 75
+
+
+def _graph_request(graphs):
+    resp = salesforce_request("POST", f"/services/data/{API_VERSION}/composite/graph", json={"graphs": graphs})
+    resp.raise_for_status()
+    return resp.json().get("graphs", [])
+
+
+class QuoteGraphError(Exception):
+    """
+    The quote graph was rolled back. failures holds {"node", "errorCode",
+    "message"} per failed node; errors the same as "node: code: message".
+    """
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.errors = _describe_failures(failures)
+        super().__init__("Failed to create Sales Quote: " + "; ".join(self.errors))
+
+
+def _node_errors(node):
+    body = node.get("body")
+    if isinstance(body, list):
+        return [(e.get("errorCode"), e.get("message")) for e in body if isinstance(e, dict)]
+    return [(None, str(body))]
+
+
+def _graph_failures(graph):
+    """
+    {"node": referenceId, "errorCode", "message"} for each failed node. Once
+    a node fails, the rest of the graph only reports PROCESSING_HALTED, so
+    those are left out unless nothing else failed.
+    """
+    failed = [node for node in (graph.get("graphResponse") or {}).get("compositeResponse", [])
+              if node.get("httpStatusCode", 0) >= 300]
+    failures = [{"node": node.get("referenceId"), "errorCode": code, "message": message}
+                for node in failed for code, message in _node_errors(node)]
+    return [f for f in failures if f["errorCode"] != "PROCESSING_HALTED"] or failures
+
+
+def _describe_failures(failures):
+    return [f"{f['node']}: {f['errorCode']}: {f['message']}" if f["errorCode"] else f"{f['node']}: {f['message']}"
+            for f in failures]
+
+
+def _quote_line_nodes(lines, parent, first_index):
+    return [
+        {
+            "method": "POST",
+            "url": f"/services/data/{API_VERSION}/sobjects/gii__SalesQuoteLine__c",
+            "referenceId": f"line{first_index + i}",
+            "body": {**line, "gii__SalesQuote__c": parent}
+        }
+        for i, line in enumerate(lines)
+    ]
+
+
+def create_sales_quote_with_lines(quote_fields, lines):
+    """
+    Creates a gii__SalesQuote__c and its gii__SalesQuoteLine__c children in a
+    single composite graph request. Lines point at the header through the
+    "@{quote.id}" reference, and a trailing GET node returns the generated
+    quote Name, so small and large carts cost the same one round trip.
+
+    The header graph is all-or-nothing: if the quote or any of its lines is
+    rejected, Salesforce rolls the whole graph back and no quote is created
+    (one bad line no longer leaves a quote with that line missing). This
+    raises QuoteGraphError with the failing node's error, e.g.
+    "line3: FIELD_CUSTOM_VALIDATION_EXCEPTION: ...", where lineN is the
+    N-th (0-based) entry of `lines`; callers that dropped cart items before
+    building `lines` map it back themselves.
+
+    When the cart does not fit in one graph, the remaining lines are sent as
+    extra graphs (GRAPH_NODE_LIMIT nodes each) in one follow-up request once
+    the quote exists. Those are partial: a failed graph is logged and the
+    quote keeps the lines that were created.
+
+    Returns (quote_id, quote_name).
+    """
+    # Header graph holds the quote, as many lines as fit, and the Name lookup
+    head_count = GRAPH_NODE_LIMIT - 2
+    head_lines, rest = lines[:head_count], lines[head_count:]
+
+    nodes = [{
+        "method": "POST",
+        "url": f"/services/data/{API_VERSION}/sobjects/gii__SalesQuote__c",
+        "referenceId": "quote",
+        "body": quote_fields
+    }]
+    nodes += _quote_line_nodes(head_lines, "@{quote.id}", 0)
+    nodes.append({
+        "method": "GET",
+        "url": f"/services/data/{API_VERSION}/sobjects/gii__SalesQuote__c/@{{quote.id}}?fields=Name",
+        "referenceId": "quoteInfo"
+    })
+
+    graphs = _graph_request([{"graphId": "quote", "compositeRequest": nodes}])
+    graph = graphs[0] if graphs else {}
+    if not graph.get("isSuccessful"):
+        failures = _graph_failures(graph) or [{"node": "quote", "errorCode": None, "message": "no graph response"}]
+        print("❌ Failed to create Sales Quote:", _describe_failures(failures))
+        raise QuoteGraphError(failures)
+
+    responses = {node["referenceId"]: node.get("body") or {}
+                 for node in graph["graphResponse"]["compositeResponse"]}
+    quote_id = responses["quote"]["id"]
+    quote_name = responses["quoteInfo"].get("Name")
+    print(f"✅ Created Sales Quote with {len(head_lines)} lines")
+
+    # Chunked fallback: the header exists now, so later graphs use its real Id
+    extra = []
+    for start in range(0, len(rest), GRAPH_NODE_LIMIT):
+        chunk = rest[start:start + GRAPH_NODE_LIMIT]
+        extra.append({"graphId": f"lines{start}",
+                      "compositeRequest": _quote_line_nodes(chunk, quote_id, head_count + start)})
+    for start in range(0, len(extra), GRAPHS_PER_REQUEST):
+        for result in _graph_request(extra[start:start + GRAPHS_PER_REQUEST]):
+            if result.get("isSuccessful"):
+                print(f"✅ Created quote lines in graph {result.get('graphId')}")
+            else:
+                print(f"❌ Failed to create quote lines in graph {result.get('graphId')}:", _describe_failures(_graph_failures(result)))
+
+    return quote_id, quote_name
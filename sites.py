@@ -0,0 +1,1121 @@
+import heapq
+import os
+import threading
+import time
+from bisect import bisect_left
+from operator import itemgetter
+from sf_api import query_all
+
+# Every "Amazon XXXn" site Account the portal knows about
+ALL_SITES = ["Amazon ABE2",
+ "Amazon ABE3",
+ "Amazon ABE8",
+ "Amazon ABQ1",
+ "Amazon ABQ2",
+ "Amazon ABQ5",
+ "Amazon ACY1",
+ "Amazon ACY2",
+ "Amazon ACY5",
+ "Amazon ACY8",
+ "Amazon ACY9",
+ "Amazon AFW1",
+ "Amazon AFW2",
+ "Amazon AFW5",
+ "Amazon AGS1",
+ "Amazon AGS2",
+ "Amazon AGS5",
+ "Amazon AKC1",
+ "Amazon AKH4",
+ "Amazon AKR1",
+ "Amazon ALB1",
+ "Amazon AMA1",
+ "Amazon AMZ9",
+ "Amazon ATL2",
+ "Amazon ATL5",
+ "Amazon ATL6",
+ "Amazon ATL7",
+ "Amazon ATS3",
+ "Amazon ATS5",
+ "Amazon AUN2",
+ "Amazon AUS3",
+ "Amazon AUS5",
+ "Amazon AUV1",
+ "Amazon AVP1",
+ "Amazon AVP8",
+ "Amazon AVP9",
+ "Amazon AZA4",
+ "Amazon AZA5",
+ "Amazon BAN2",
+ "Amazon BDL2",
+ "Amazon BDL3",
+ "Amazon BDL4",
+ "Amazon BDL6",
+ "Amazon BDL7",
+ "Amazon BDU2",
+ "Amazon BFi3",
+ "Amazon BFI4",
+ "Amazon BFI5",
+ "Amazon BFI7",
+ "Amazon BFI9",
+ "Amazon BFL1",
+ "Amazon BFL2",
+ "Amazon BHM1",
+ "Amazon BJX1",
+ "Amazon BLV2",
+ "Amazon BNA2",
+ "Amazon BNA3",
+ "Amazon BNA5",
+ "Amazon BNA6",
+ "Amazon BNA7",
+ "Amazon BNA8",
+ "Amazon BNE1",
+ "Amazon BOI2",
+ "Amazon BOI5",
+ "Amazon BOS12",
+ "Amazon BOS27",
+ "Amazon BOS3",
+ "Amazon BOS4",
+ "Amazon BTR1",
+ "Amazon BUF5",
+ "Amazon BUF9",
+ "Amazon BUR7",
+ "Amazon BWI1",
+ "Amazon BWI2",
+ "Amazon BWI4",
+ "Amazon BWI5",
+ "Amazon BWU1",
+ "Amazon BWU6",
+ "Amazon CAE1",
+ "Amazon CAE3",
+ "Amazon CAK4",
+ "Amazon CDW5",
+ "Amazon CHA1",
+ "Amazon CHA2",
+ "Amazon CHM5",
+ "Amazon CLE2",
+ "Amazon CLE3",
+ "Amazon CLE5",
+ "Amazon CLE7",
+ "Amazon CLE9",
+ "Amazon CLT2",
+ "Amazon CLT3",
+ "Amazon CLT4",
+ "Amazon CLT5",
+ "Amazon CLT6",
+ "Amazon CLT9",
+ "Amazon CMH1",
+ "Amazon CMH3",
+ "Amazon CMH4",
+ "Amazon CMH5",
+ "Amazon CNO5",
+ "Amazon CNO8",
+ "Amazon COS5",
+ "Amazon CRG1",
+ "Amazon CSG1",
+ "Amazon CVG2",
+ "Amazon CVG5",
+ "Amazon CVG9",
+ "Amazon DAB2",
+ "Amazon DAE1",
+ "Amazon DAE3",
+ "Amazon DAL2",
+ "Amazon DAL3",
+ "Amazon DAL9",
+ "Amazon DAU1",
+ "Amazon DAU2",
+ "Amazon DAZ4",
+ "Amazon DBA5",
+ "Amazon DBA8",
+ "Amazon DBK1",
+ "Amazon DBL1",
+ 
+ "Amazon DBO6",
+ "Amazon DBO7",
+ "Amazon DBU1",
+ "Amazon DBV1",
+ "Amazon DCA1",
+ "Amazon DCA2",
+ "Amazon DCA6",
+ "Amazon DCD6",
+ "Amazon DCG2",
+ "Amazon DCG4",
+ "Amazon DCH6",
+ "Amazon DCK1",
+ "Amazon DCL2",
+ "Amazon DCL3",
+ "Amazon DCL4",
+ "Amazon DCM2",
+ "Amazon DCS3",
+ "Amazon DCW1",
+ "Amazon DCW8",
+ "Amazon DDC3",
+ "Amazon DDC4",
+ "Amazon DDE6",
+ "Amazon DDE8",
+ "Amazon DDF2",
+ "Amazon DDT1",
+ "Amazon DEN2",
+ "Amazon DEN3",
+ "Amazon DEN5",
+ "Amazon DEN7",
+ "Amazon DEN8",
+ "Amazon DET1",
+ "Amazon DET2",
+ "Amazon DET3",
+ "Amazon DET6",
+ "Amazon DET7",
+ "Amazon DEW5",
+ "Amazon DFH3",
+ "Amazon DFL4",
+ "Amazon DFM3",
+ "Amazon DFT4",
+ "Amazon DFW5",
+ "Amazon DFW6",
+ "Amazon DFW7",
+ "Amazon DFX3",
+ "Amazon DGE7",
+ "Amazon DGI3",
+ 
+ "Amazon DHT4",
+ "Amazon DIB7",
+ "Amazon DID2",
+ "Amazon DIL3",
+ "Amazon DIL5",
+ "Amazon DIN3",
+ "Amazon DJE1",
+ "Amazon DJE2",
+ "Amazon DJE3",
+ "Amazon DJE9",
+ "Amazon DJX2",
+ "Amazon DJX4",
+ "Amazon DJZ3",
+ "Amazon DJZ6",
+ "Amazon DKC3",
+ "Amazon DKO9",
+ "Amazon DKS3",
+ "Amazon DKY9",
+ "Amazon DLC8",
+ "Amazon DLD1",
+ "Amazon DLI4",
+ "Amazon DLI6",
+ "Amazon DLN2",
+ "Amazon DLN3",
+ "Amazon DLT3",
+ "Amazon DLT6",
+ "Amazon DLV3",
+ "Amazon DMD2",
+ "Amazon DMD9",
+ "Amazon DMI7",
+ "Amazon DML1",
+ "Amazon DML6",
+ "Amazon DMO3",
+ "Amazon DMO4",
+ "Amazon DMP1",
+ "Amazon DMT1",
+ "Amazon DMW1",
+ "Amazon DNA6",
+ "Amazon DNH2",
+ "Amazon DNK7",
+ "Amazon DOI4",
+ "Amazon DOI6",
+ "Amazon DOK2",
+ "Amazon DON3",
+ "Amazon DON9",
+ "Amazon DPD2",
+ "Amazon DPD4",
+ "Amazon DPH7",
+ "Amazon DPL2.",
+ "Amazon DPP1",
+ "Amazon DRC6",
+ "Amazon DRT3",
+ "Amazon DRT8",
+ "Amazon DSC3",
+ "Amazon DSC4",
+ "Amazon DSD4",
+ "Amazon DSF5",
+ "Amazon DSM5",
+ "Amazon DSM9",
+ "Amazon DSW3",
+ "Amazon DSX7",
+ "Amazon DTB4",
+ "Amazon DTN6",
+ "Amazon DTO3",
+ "Amazon DTO5",
+ "Amazon DTO9",
+ "Amazon DTU2",
+ "Amazon DTU8",
+ "Amazon DTW1",
+ "Amazon DTW3",
+ "Amazon DTW8",
+ "Amazon DTW9",
+ "Amazon DUT2",
+ "Amazon DUT4",
+ "Amazon DVB8",
+ "Amazon DVY2",
+ "Amazon DWA6",
+ "Amazon DWD6",
+ "Amazon DXT5",
+ "Amazon DYN3",
+ "Amazon DYT3",
+ "Amazon DYY6",
+ "Amazon ELP1",
+ "Amazon EUG5",
+ "Amazon EWR4",
+ "Amazon EWR7",
+ "Amazon EWR8",
+ "Amazon FAR1",
+ "Amazon FAT1",
+ "Amazon FAT2",
+ "Amazon FAT5",
+ "Amazon FOE1",
+ "Amazon FR1",
+ "Amazon FSD1",
+ "Amazon FTW1",
+ "Amazon FTW2",
+ "Amazon FTW3",
+ "Amazon FTW5",
+ "Amazon FTW6",
+ "Amazon FTW7",
+ "Amazon FTW8",
+ "Amazon FTW9",
+ "Amazon FTY9",
+ "Amazon FWA4",
+ "Amazon FWA6",
+ "Amazon GDL1",
+ "Amazon GDL2",
+ "Amazon GEG1",
+ "Amazon GEG2",
+ "Amazon GEU2",
+ "Amazon GEU3",
+ "Amazon GEU5",
+ "Amazon GLD2",
+ "Amazon GRR1",
+ "Amazon GRU8",
+ "Amazon GSO1",
+ "Amazon GSP1",
+ "Amazon GYR1",
+ "Amazon GYR2",
+ "Amazon GYR3",
+ "Amazon GYR4",
+ "Amazon HAT2",
+ "Amazon HAT9",
+ "Amazon HBA3",
+ "Amazon HBA9",
+ "Amazon HBF5",
+ "Amazon HBI2",
+ "Amazon HBN9",
+ "Amazon HCE2",
+ "Amazon HCH2",
+ "Amazon HCL9",
+ "Amazon HCM9",
+ "Amazon HCN1",
+ "Amazon HDA3",
+ "Amazon HDA9",
+ "Amazon HDC3",
+ "Amazon HDS9",
+ "Amazon HDT9",
+ "Amazon HEA1",
+ "Amazon HEA2",
+ "Amazon HEW9",
+ "Amazon HFD5",
+ "Amazon HGA3",
+ "Amazon HGA6",
+ "Amazon HGE2",
+ "Amazon HGR2",
+ "Amazon HGR5",
+ "Amazon HGR6",
+ "Amazon HHO2",
+ "Amazon HHO3",
+ "Amazon HIA1",
+ "Amazon HIL3",
+ "Amazon HIO2",
+ "Amazon HLA6",
+ "Amazon HLA8",
+ "Amazon HLA9",
+ "Amazon HLI1",
+ "Amazon HLI2",
+ "Amazon HLO9",
+ "Amazon HLR1",
+ "Amazon HLX1",
+ "Amazon HMC9",
+ "Amazon HMD3",
+ "Amazon HME9",
+ "Amazon HMI2",
+ "Amazon HMK9",
+ "Amazon HMO2",
+ "Amazon HMO3",
+ "Amazon HMS9",
+ "Amazon HMW1",
+ "Amazon HMW3",
+ "Amazon HMW4",
+ "Amazon HMY1",
+ "Amazon HNC3",
+ "Amazon HNE1",
+ "Amazon HNY2",
+ "Amazon HOU1",
+ "Amazon HOU2",
+ "Amazon Hou3",
+ "Amazon HOU5",
+ "Amazon HOU6",
+ "Amazon HOU7",
+ "Amazon HOU8",
+ "Amazon HOU9",
+ "Amazon HRN2",
+ "Amazon HSD1",
+ "Amazon HSE1",
+ "Amazon HSF2",
+ "Amazon HSL9",
+ "Amazon HSV1",
+ "Amazon HSV2",
+ "Amazon HTC2",
+ "Amazon HTP2",
+ "Amazon HWA4",
+ "Amazon HWE2",
+ "Amazon HYC2",
+ "Amazon HYE1",
+ "Amazon HYO1",
+ "Amazon HYV1",
+ "Amazon IAH1",
+ "Amazon IAH3",
+ "Amazon IAH5",
+ "Amazon ICT2",
+ "Amazon IDT1",
+ "Amazon IGQ1",
+ "Amazon IGQ2",
+ "Amazon IND1",
+ "Amazon IND2",
+ "Amazon IND5",
+ "Amazon IND8",
+ "Amazon IND9",
+ "Amazon JAN1",
+ "Amazon JAN1",
+ "Amazon JAX2",
+ "Amazon JAX3",
+ "Amazon JAX5",
+ "Amazon JAX7",
+ "Amazon JAX9",
+ "Amazon JFK2",
+ "Amazon JFK8",
+ "Amazon JHW1",
+ "Amazon JVL1",
+ "Amazon KAFW",
+ "Amazon KBWI",
+ "Amazon KCVG",
+ "Amazon KIL1",
+ "Amazon KILN",
+ "Amazon KLAL",
+ "Amazon KOH2",
+ "Amazon KRB1",
+ "Amazon KRB2",
+ "Amazon KRB3",
+ "Amazon KRB4",
+ "Amazon KRB5",
+ "Amazon KRB7",
+ "Amazon KRB9",
+ "Amazon KRFD",
+ "Amazon KSBD",
+ "Amazon Kuiper",
+ "Amazon LAL4",
+ "Amazon LAN2",
+ "Amazon LAS1",
+ "Amazon LAS2",
+ "Amazon LAS6",
+ "Amazon LAS7",
+ "Amazon LAS8",
+ "Amazon LAX5",
+ "Amazon LAX9",
+ "Amazon LBB5",
+ "Amazon LBE1",
+ "Amazon LDJ5",
+ "Amazon LEX1",
+ "Amazon LFT1",
+ "Amazon LGA5",
+ "Amazon LGA9",
+ "Amazon LGB3",
+ "Amazon LGB4",
+ "Amazon LGB5",
+ "Amazon LGB6",
+ "Amazon LGB7",
+ "Amazon LGB8",
+ "Amazon LGB9",
+ "Amazon LIT1",
+ "Amazon LIT2",
+ "Amazon LUK2",
+ "Amazon LUK7",
+ "Pillpack MAN1",
+ "Amazon MCE1",
+ "Amazon MCI3",
+ "Amazon MCI7",
+ "Amazon MCI9",
+ "Amazon MCO1",
+ "Amazon MCO2",
+ "Amazon MCO3",
+ "Amazon MCO4",
+ "Amazon MCO5",
+ "Amazon MCO9",
+ "Amazon MDT4",
+ "Amazon MDT5",
+ "Amazon MDT9",
+ "Amazon MDW2",
+ "Amazon MDW4",
+ "Amazon MDW5",
+ "Amazon MDW7",
+ "Amazon MDW8",
+ "Amazon MDW9",
+ "Amazon MEL1",
+ "Amazon MEL5",
+ "Amazon MEL8",
+ "Amazon MEM1",
+ "Amazon MEM2",
+ "Amazon MEM3",
+ "Amazon MEM4",
+ "Amazon MEM5",
+ "Amazon MEM6",
+ "Amazon MEM8",
+ "Amazon MEX1",
+ "Amazon MEX2",
+ "Amazon MEX5",
+ "Amazon MEX6",
+ "Amazon MGE1",
+ "Amazon MGE3",
+ "Amazon MGE5",
+ "Amazon MGE8",
+ "Amazon MGE9",
+ "Amazon MIA1",
+ "Amazon MIA2",
+ "Amazon MIA5",
+ "Amazon MIT2",
+ "Amazon MKC4",
+ "Amazon MKC6",
+ "Amazon MKE1",
+ "Amazon MKE2",
+ "Amazon MKE5",
+ "Amazon MLB1",
+ "Amazon MLI1",
+ "Amazon MMU9",
+ "Amazon MOB5",
+ "Amazon MQJ1",
+ "Amazon MQJ2",
+ "Amazon MQJ5",
+ "Amazon MQY1",
+ "Amazon MSP1",
+ "Amazon MSP6",
+ "Amazon MSP7",
+ "Amazon MSP8",
+ "Amazon MSP9",
+ "Amazon MTN1",
+ "Amazon MTN2",
+ "Amazon MTN3",
+ "Amazon MTN6",
+ "Amazon MTN7",
+ "Amazon MTN8",
+ "Amazon MTN9",
+ "Amazon MTY1",
+ "Amazon MTY2",
+ "Amazon MTY5",
+ "Amazon MWH1",
+ "Amazon OAK3",
+ "Amazon OAK4",
+ "Amazon OAK5",
+ "Amazon OAK7",
+ "Amazon OAK9",
+ "Amazon OKC1",
+ "Amazon OKC2",
+ "Amazon OKC5",
+ "Amazon OLM1",
+ "Amazon OMA2",
+ "Amazon OMA5",
+ "Amazon ONT1",
+ "Amazon ONT2",
+ "Amazon ONT5",
+ "Amazon ONT6",
+ "Amazon ONT8",
+ "Amazon ONT9",
+ "Amazon ORD2",
+ "Amazon ORD4",
+ "Amazon ORD5",
+ "Amazon ORD9",
+ "Amazon ORF2",
+ "Amazon ORF3",
+ "Amazon ORH3",
+ "Amazon ORH5",
+ "Amazon Otter",
+ "Amazon OWD5",
+ "Amazon OWD9",
+ "Amazon OXR1",
+ "Amazon PAE2",
+ "Amazon Parent",
+ "Pillpack PAU2",
+ "Amazon PBI2",
+ "Amazon PBI3",
+ "Amazon PCA1",
+ "Amazon PCW1",
+ "Amazon PDK2",
+ "Amazon PDX5",
+ "Amazon PDX6",
+ "Amazon PDX7",
+ "Amazon PDX8",
+ "Amazon PDX9",
+ "Amazon PER3",
+ "Amazon PGA1",
+ "Amazon PHL1",
+ "Amazon PHL4",
+ "Amazon PHL5",
+ "Amazon PHL6",
+ "Amazon PHL7",
+ "Amazon PHL9",
+ "Amazon PHX3",
+ "Amazon PHX5",
+ "Amazon PHX6",
+ "Amazon PHX7",
+ "Amazon PIN2",
+ "Amazon PIT2",
+ "Amazon PIT4",
+ "Amazon PIT5",
+ "Amazon PIT9",
+ "Amazon PKC1",
+ "Amazon PillPack PMI2",
+ "Amazon PNA1",
+ "Amazon PNE5",
+ "Amazon POC1",
+ "Amazon POC2",
+ "Amazon POC3",
+ "Amazon POH2",
+ "Amazon POR2",
+ "Amazon PPA2",
+ "Amazon PPO4",
+ "Amazon PPX1",
+ "Amazon PSC2",
+ "PillPack PSE1",
+ "Amazon PSP1",
+ "Amazon PVD2",
+ "Amazon QXY8",
+ "Amazon RAD1",
+ "Amazon RBD5",
+ "Amazon RDG1",
+ "Amazon RDU1",
+ "Amazon RDU2",
+ "Amazon RDU4",
+ "Amazon RDU5",
+ "Amazon RDU9",
+ "Amazon RFD1",
+ "Amazon RFD2",
+ "Amazon RFD3",
+ "Amazon RFD4",
+ "Amazon RFD7",
+ "Amazon RIC1",
+ "Amazon RIC2",
+ "Amazon RIC3",
+ "Amazon RIC5",
+ "Amazon RMN3",
+ "Amazon RNO4",
+ "Amazon RNT9",
+ "Amazon Robotics",
+ "Amazon ROC1",
+ "Amazon RSW5",
+ "Amazon RYY2",
+ "Amazon SAN3",
+ "Amazon SAN5",
+ "Amazon SAT1",
+ "Amazon SAT2",
+ "Amazon SAT3",
+ "Amazon SAT4",
+ "Amazon SAT9",
+ "Amazon SAV3",
+ "Amazon SAV4",
+ "Amazon SAV7",
+ "Amazon SAX1",
+ "Amazon SAX2",
+ "Amazon SAX3",
+ "Amazon SAX5-2",
+ "Amazon SAX7-1",
+ "Amazon SAZ1",
+ "Amazon SAZ2",
+ "Amazon SBD2",
+ "Amazon SBD3",
+ "Amazon SBD5",
+ "Amazon SBD6",
+ "Amazon SCA2",
+ "Amazon SCA3",
+ "Amazon SCA5",
+ "Amazon SCA7",
+ "Amazon SCK1",
+ "Amazon SCK3",
+ "Amazon SCK4",
+ "Amazon SCK6",
+ "Amazon SCK8",
+ "Amazon SCO1",
+ "Amazon SDC1",
+ "Amazon SDF1",
+ "Amazon SDF6",
+ "Amazon SDF8",
+ "Amazon SDF9",
+ "Amazon SEA124",
+ "Amazon SFL1",
+ "Amazon SFL3",
+ "Amazon SFL4",
+ "Amazon SFL6",
+ "Amazon SFL7",
+ "Amazon SFL8",
+ "Amazon SGA1",
+ "Amazon SGA2",
+ "Amazon SHV1",
+ "Amazon SIL1",
+ "Amazon SIL3",
+ "Amazon SIL4",
+ "Amazon SIN8",
+ "Amazon SIN9",
+ "Amazon SJC7",
+ "Amazon SLC1",
+ "Amazon SLC2",
+ "Amazon SLC3",
+ "Amazon SLC4",
+ "Amazon SLC9",
+ "Amazon SMA1",
+ "Amazon SMA2",
+ "Amazon SMD1",
+ "Amazon SMD2",
+ "Amazon SMF1",
+ "Amazon SMF3",
+ "Amazon SMF5",
+ "Amazon SMF6",
+ "Amazon SMF7",
+ "Amazon SMI1",
+ "Amazon SMN1",
+ "Amazon SMO1",
+ "Amazon SMO2",
+ "Amazon SNA3",
+ "Amazon SNA4",
+ "Amazon SNC3",
+ "Amazon SNE1",
+ "Amazon SNJ1",
+ "Amazon SNJ2",
+ "Amazon SNJ3",
+ "Amazon SNV1",
+ "Amazon SNY1",
+ "Amazon SNY2",
+ "Amazon SNY5",
+ "Amazon SOH1",
+ "Amazon SOH2",
+ "Amazon SOH3",
+ "Amazon SOR3",
+ "Amazon STL3",
+ "Amazon STL4",
+ "Amazon STL5",
+ "Amazon STL6",
+ "Amazon STL8",
+ "Amazon STL9",
+ "Amazon STN1",
+ "Amazon STP2",
+ "Amazon STX2",
+ "Amazon STX5",
+ "Amazon STX7",
+ "Amazon STX8",
+ "Amazon STX9",
+ "Amazon SUT1",
+ "Amazon SUT2",
+ "Amazon SWA1",
+ "Amazon SWA2",
+ "Amazon SWF1",
+ "Amazon SWF2",
+ "Amazon SWI1",
+ "Amazon SXWL",
+ "Amazon SYR1",
+ "Amazon SYS3",
+ "Amazon TCY1",
+ "Amazon TCY2",
+ "Amazon TCY5",
+ "Amazon TCY9",
+ "Amazon TEB3",
+ "Amazon TEB4",
+ "Amazon TEB6",
+ "Amazon TEB9",
+ "Amazon TEN1",
+ "Amazon TIJ1",
+ "Amazon TLH2",
+ "Amazon TMB8",
+ "Amazon TPA1",
+ "Amazon TPA2",
+ "Amazon TPA3",
+ "Amazon TPA4",
+ "Amazon TPA6",
+ "Amazon TTN2",
+ "Amazon TUL2",
+ "Amazon TUL5",
+ "Amazon TUS1",
+ "Amazon TUS2",
+ "Amazon TUS5",
+ "Amazon TYS1",
+ "Amazon TYS5",
+ "Amazon UAZ1",
+ "Amazon UCA5",
+ "Amazon UCO1",
+ "Amazon UFL4",
+ "Amazon UFL5",
+ "Amazon UGA2",
+ "Amazon UGA4",
+ "Amazon UIN1",
+ "Amazon UMD1",
+ "Amazon UMN1",
+ "Amazon UNC2",
+ "Amazon UNC3",
+ "Amazon UNJ1",
+ "Amazon UNV2",
+ "Amazon UNY2",
+ "Amazon UOH4",
+ "Amazon UOH5",
+ "Amazon UOR2",
+ "Amazon UPA1",
+ "Amazon USD1",
+ "Amazon USF1",
+ "Amazon USF2",
+ "Amazon UTN1",
+ "Amazon UTX3",
+ "Amazon UTX4",
+ "Amazon UTX8",
+ "Amazon UTX9",
+ "Amazon UVA1",
+ "Amazon UVA5",
+ "Amazon UWA1",
+ "Amazon UWA2",
+ "Amazon UWA6",
+ "Amazon VGT1",
+ "Amazon VGT2",
+ "Amazon VGT5",
+ "Amazon VUGP",
+ "Amazon WBW2",
+ "Amazon WFL2",
+ "Amazon WGE2",
+ "Amazon WID1",
+ "Amazon WIL1",
+ "Amazon WLF2",
+ "Amazon WMS1",
+ "Amazon WNE1",
+ "Amazon WNY4",
+ "Amazon WTX2",
+ "Amazon WWY3",
+ "Amazon WWY4",
+ "Amazon XCA2",
+ "Amazon XCH1",
+ "Amazon XCL1",
+ "Amazon XEW3",
+ "Amazon XEW4",
+ "Amazon XHH3",
+ "Amazon XLX3",
+ "Amazon XLX7",
+ "Amazon XME1",
+ "Amazon XNJ2",
+ "Amazon XPH1",
+ "Amazon XSE2",
+ "Amazon XUSO",
+ "Amazon YEG1",
+ "Amazon YEG4",
+ "Amazon YGK1",
+ "Amazon YHM1",
+ "Amazon YHM2",
+ "Amazon YHM5",
+ "Amazon YHM6",
+ "Amazon YHM8",
+ "Amazon YHM9",
+ "Amazon YOW1",
+ "Amazon YOW3",
+ "Amazon YUL9",
+ "Amazon YVR2",
+ "Amazon YVR3",
+ "Amazon YVR4",
+ "Amazon YVR7",
+ "Amazon YXU1",
+ "Amazon YXX1",
+ "Amazon YXX2",
+ "Amazon YYC1",
+ "Amazon YYC4",
+ "Amazon YYC5",
+ "Amazon YYC6",
+ "Amazon YYZ1",
+ "Amazon YYZ3",
+ "Amazon YYZ4",
+ "Amazon YYZ7",
+ "Amazon YYZ9",
+]
+
+
+# Casefolded, alphanumeric-only form of the "Amazon " prefix
+_PREFIX_KEY = "amazon"
+
+
+def site_code(text):
+    """
+    Normalizes a site name or query to its code: "Amazon LAX9", "lax 9" and
+    "amazon-lax9" all become "lax9".
+    """
+    key = "".join(ch for ch in text.casefold() if ch.isalnum())
+    if key.startswith(_PREFIX_KEY) and len(key) > len(_PREFIX_KEY):
+        return key[len(_PREFIX_KEY):]
+    return key
+
+
+def _trigrams(code):
+    padded = f"  {code} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, bound):
+    """
+    Optimal string alignment distance between a and b (an adjacent swap
+    such as "lxa9" -> "lax9" counts as one edit). Returns bound + 1 as soon
+    as the distance is known to exceed bound.
+    """
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    # Shared leading/trailing characters never change the distance
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    if not a or not b:
+        return len(a) + len(b)
+    if len(a) == len(b) == 1 or (len(a) == len(b) == 2 and a == b[::-1]):
+        return 1
+    if bound == 1:
+        # With both ends different, anything but one substitution or swap is 2+ edits
+        return 2
+    before, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            value = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, before[j - 2] + 1)
+            cur[j] = value
+        if min(cur) > bound:
+            return bound + 1
+        before, prev = prev, cur
+    return prev[-1]
+
+
+class SiteIndex:
+    """
+    Typeahead index over a fixed list of site names, built once at import.
+
+    Casefolded names are kept in a sorted array so a prefix is one bisect
+    range, and every 1-, 2- and 3-character substring maps to the (list
+    ordered) positions of the names containing it. Longer queries start from
+    their rarest trigram and only check those candidates, so no query scans
+    the whole list.
+
+    For rank(), each name is also indexed by its normalized site code: an
+    exact map, a sorted array for code prefixes, and padded trigrams for
+    fuzzy candidates.
+    """
+
+    NGRAM = 3
+    # Fuzzy candidates (most shared trigrams first) that get an edit distance
+    FUZZY_CANDIDATES = 64
+
+    def __init__(self, names):
+        self._names = list(names)
+        self._folded = [name.casefold() for name in self._names]
+        self._sorted_ids = sorted(range(len(self._folded)), key=self._folded.__getitem__)
+        self._sorted_keys = [self._folded[i] for i in self._sorted_ids]
+        grams = {}
+        for i, name in enumerate(self._folded):
+            for n in range(1, self.NGRAM + 1):
+                for start in range(len(name) - n + 1):
+                    grams.setdefault(name[start:start + n], {})[i] = None
+        self._grams = {gram: tuple(ids) for gram, ids in grams.items()}
+
+        self._codes = [site_code(name) for name in self._names]
+        self._sorted_code_ids = sorted(range(len(self._codes)), key=self._codes.__getitem__)
+        self._sorted_codes = [self._codes[i] for i in self._sorted_code_ids]
+        by_code, code_grams = {}, {}
+        for i, code in enumerate(self._codes):
+            by_code.setdefault(code, []).append(i)
+            for gram in _trigrams(code):
+                code_grams.setdefault(gram, []).append(i)
+        self._by_code = {code: tuple(ids) for code, ids in by_code.items()}
+        self._code_grams = {gram: tuple(ids) for gram, ids in code_grams.items()}
+
+    def _candidates(self, q):
+        if len(q) <= self.NGRAM:
+            return self._grams.get(q, ())
+        return min((self._grams.get(q[i:i + self.NGRAM], ()) for i in range(len(q) - self.NGRAM + 1)), key=len)
+
+    @property
+    def names(self):
+        return self._names
+
+    def _prefix_ids(self, q, limit):
+        lo = bisect_left(self._sorted_keys, q)
+        hi = bisect_left(self._sorted_keys, q + "\U0010ffff", lo)
+        return self._sorted_ids[lo:min(hi, lo + limit)]
+
+    def _search_ids(self, q, limit):
+        ids = self._prefix_ids(q, limit)
+        if len(ids) == limit:
+            return ids
+        folded = self._folded
+        exact = len(q) <= self.NGRAM
+        for i in self._candidates(q):
+            name = folded[i]
+            if name.startswith(q) or not (exact or q in name):
+                continue
+            ids.append(i)
+            if len(ids) == limit:
+                break
+        return ids
+
+    def prefix(self, q, limit=50):
+        """Returns up to `limit` names starting with q (case-insensitive), alphabetically."""
+        return [self._names[i] for i in self._prefix_ids(q.casefold(), limit)]
+
+    def search(self, q, limit=50):
+        """
+        Returns up to `limit` names containing q (case-insensitive). Prefix
+        hits come first in alphabetical order, then other substring hits in
+        list order.
+        """
+        q = q.casefold()
+        if not q:
+            return self._names[:limit]
+        return [self._names[i] for i in self._search_ids(q, limit)]
+
+    def _fuzzy_ids(self, code):
+        shared = {}
+        for gram in _trigrams(code):
+            for i in self._code_grams.get(gram, ()):
+                shared[i] = shared.get(i, 0) + 1
+        candidates = heapq.nlargest(self.FUZZY_CANDIDATES, shared.items(), key=itemgetter(1))
+        bound = 1 if len(code) <= 5 else 2
+        scored = []
+        for i, count in candidates:
+            other = self._codes[i]
+            distance = edit_distance(code, other, bound)
+            if distance > bound and len(other) > len(code):
+                # The query may be a code typed halfway
+                distance = edit_distance(code, other[:len(code)], bound)
+            if distance <= bound:
+                # Ties go to the code with more characters in common ("lxa9" -> "lax9" before "lga9")
+                common = sum(min(code.count(ch), other.count(ch)) for ch in set(code))
+                scored.append((distance, -common, -count, other, i))
+        scored.sort()
+        return [i for *_, i in scored]
+
+    def rank(self, q, limit=50):
+        """
+        Ranked, typo-tolerant site search. Returns up to `limit` names in this
+        order: exact site code matches ("lax 9" -> "Amazon LAX9"), site code
+        prefix matches, substring matches as in search(), then names within
+        a small edit distance of the query code ("LXA9" -> "Amazon LAX9").
+        """
+        code = site_code(q)
+        if not code:
+            return self.search(q, limit)
+        ranked = dict.fromkeys(self._by_code.get(code, ()))
+        lo = bisect_left(self._sorted_codes, code)
+        hi = bisect_left(self._sorted_codes, code + "\U0010ffff", lo)
+        ranked.update(dict.fromkeys(self._sorted_code_ids[lo:min(hi, lo + limit)]))
+        if len(ranked) < limit:
+            ranked.update(dict.fromkeys(self._search_ids(q.casefold(), limit)))
+        if len(ranked) < limit and len(code) >= self.NGRAM:
+            ranked.update(dict.fromkeys(self._fuzzy_ids(code)))
+        return [self._names[i] for i in list(ranked)[:limit]]
+
+
+site_index = SiteIndex(ALL_SITES)
+
+
+# Site Accounts are named "<family> <code>" ("Amazon LAX9", "Pillpack MAN1");
+# the families are the ones in ALL_SITES, compared case-insensitively
+SITE_NAME_PREFIXES = tuple(sorted({name.split()[0].casefold() + " " for name in ALL_SITES}))
+
+
+def is_site_name(name):
+    return name.casefold().startswith(SITE_NAME_PREFIXES)
+
+
+class AccountNameMirror:
+    """
+    In-memory copy of the Salesforce site Account names (every family in
+    SITE_NAME_PREFIXES, not just "Amazon "), so the site pickers never query
+    Salesforce per keystroke.
+
+    The first refresh() loads every name. Later refreshes only ask for
+    Accounts with LastModifiedDate at or after the newest one seen, which
+    also picks up new and renamed sites. Deleted Accounts do not show up
+    that way, so the full load is repeated every SITE_MIRROR_FULL_RELOAD
+    seconds. Until the first load succeeds, the hardcoded ALL_SITES is used.
+    """
+
+    def __init__(self, interval=None, full_reload=None):
+        self.interval = interval if interval is not None else int(os.getenv('SITE_MIRROR_REFRESH_INTERVAL', 60))
+        self.full_reload = (full_reload if full_reload is not None
+                            else int(os.getenv('SITE_MIRROR_FULL_RELOAD', 86400)))
+        self._lock = threading.Lock()
+        self._names_by_id = {}
+        self._watermark = None
+        self._loaded_at = 0.0
+        self._index = None
+
+    @property
+    def loaded(self):
+        return self._index is not None
+
+    def index(self):
+        """The SiteIndex to search: the mirror once loaded, else the ALL_SITES one."""
+        return self._index or site_index
+
+    def site_names(self):
+        return self.index().names
+
+    @staticmethod
+    def _soql_datetime(value):
+        # "2026-01-31T12:00:00.000+0000" -> 2026-01-31T12:00:00Z (the API returns UTC)
+        return value[:19] + "Z"
+
+    def refresh(self):
+        """Fetches names changed since the last refresh, or all of them when a full load is due."""
+        with self._lock:
+            full = (self._index is None or self._watermark is None
+                    or time.time() - self._loaded_at > self.full_reload)
+            if full:
+                # LIKE is case-insensitive, so "Pillpack " also matches "PillPack PSE1"
+                name_filter = " OR ".join(f"Name LIKE '{prefix}%'" for prefix in SITE_NAME_PREFIXES)
+                soql = f"SELECT Id, Name, LastModifiedDate FROM Account WHERE {name_filter}"
+            else:
+                # Not filtered by Name, so Accounts renamed away from a site name are dropped too
+                soql = (f"SELECT Id, Name, LastModifiedDate FROM Account "
+                        f"WHERE LastModifiedDate >= {self._soql_datetime(self._watermark)}")
+            records = query_all(soql)
+
+            names_by_id = {} if full else dict(self._names_by_id)
+            for rec in records:
+                if is_site_name(rec["Name"]):
+                    names_by_id[rec["Id"]] = rec["Name"]
+                else:
+                    names_by_id.pop(rec["Id"], None)
+                if self._watermark is None or rec["LastModifiedDate"] > self._watermark:
+                    self._watermark = rec["LastModifiedDate"]
+
+            if full or names_by_id != self._names_by_id:
+                self._index = SiteIndex(sorted(names_by_id.values(), key=str.casefold))
+                self._names_by_id = names_by_id
+                print(f"Site name mirror {'loaded' if full else 'updated'}: {len(names_by_id)} sites")
+            if full:
+                self._loaded_at = time.time()
+
+    def start_background_refresh(self):
+        """Loads the mirror now and keeps it refreshed every interval seconds."""
+        def _loop():
+            while True:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print("Site name mirror refresh failed:", e)
+                time.sleep(self.interval)
+        threading.Thread(target=_loop, daemon=True).start()
+
+
+account_mirror = AccountNameMirror()
@@ -0,0 +1,36 @@
+import time
+import account_cache as account_cache_module
+from account_cache import AccountCache
+
+SITE = "Amazon LAX9"
+ACCOUNT = {"Id": "001000000000000001", "ShippingStreet": "1 Old Rd", "ShippingCity": "Eastvale"}
+
+
+def test_only_the_id_is_cached_and_the_address_is_read_fresh(monkeypatch):
+    queries = []
+    street = ["1 Old Rd"]
+
+    def fake_query(soql):
+        queries.append(soql)
+        return {"records": [{**ACCOUNT, "ShippingStreet": street[0]}]}
+
+    monkeypatch.setattr(account_cache_module, "query", fake_query)
+    cache = AccountCache(ttl=300, negative_ttl=60)
+    cache.prime(SITE, ACCOUNT, time.time())
+    assert cache.get(SITE) == {"Id": ACCOUNT["Id"]}
+    assert queries == []
+
+    # Another worker PATCHes the address; this one still sees the new one
+    assert cache.with_address(SITE)["ShippingStreet"] == "1 Old Rd"
+    street[0] = "2 New Rd"
+    assert cache.with_address(SITE)["ShippingStreet"] == "2 New Rd"
+    assert len(queries) == 2 and "ShippingStreet" in queries[0]
+
+
+def test_prime_from_before_invalidate_is_ignored():
+    cache = AccountCache(ttl=300, negative_ttl=60)
+    fetch_started = time.time()
+    time.sleep(0.01)
+    cache.invalidate(SITE)   # the Account was just created
+    cache.prime(SITE, None, fetch_started)
+    assert SITE.lower() not in cache._entries
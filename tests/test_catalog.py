@@ -0,0 +1,44 @@
+import catalog
+from catalog import ProductCatalog
+from sf_api import UNKNOWN_PRODUCT
+
+PRODUCT = {"Id": "a1X000000000001", "Name": "DTG-PS-1", "Amazon_Price__c": 10.0, "gii__Description__c": "Cart"}
+
+
+def test_failed_initial_load_is_not_retried_on_every_lookup(monkeypatch):
+    loads, fallbacks = [], []
+
+    def failing_query_all(soql):
+        loads.append(soql)
+        raise RuntimeError("Salesforce unavailable")
+
+    monkeypatch.setattr(catalog, "query_all", failing_query_all)
+    monkeypatch.setattr(catalog, "get_product_details_many",
+                        lambda ids: fallbacks.append(list(ids)) or {i: UNKNOWN_PRODUCT for i in ids})
+    products = ProductCatalog(ttl=900)
+    for _ in range(3):
+        products.get_product_details_many(["a1X000000000009"])
+    assert len(loads) == 1
+    assert len(fallbacks) == 1   # and the miss itself is remembered
+
+
+def test_missing_products_are_negatively_cached(monkeypatch):
+    by_id, by_name = [], []
+    monkeypatch.setattr(catalog, "query_all", lambda soql: [PRODUCT])
+    monkeypatch.setattr(catalog, "get_product_details_many",
+                        lambda ids: by_id.append(list(ids)) or {i: UNKNOWN_PRODUCT for i in ids})
+    monkeypatch.setattr(catalog, "get_product_ids_many",
+                        lambda names: by_name.append(list(names)) or {n: None for n in names})
+    products = ProductCatalog(ttl=900)
+
+    for _ in range(3):
+        details = products.get_product_details_many([PRODUCT["Id"], "a1X000000000009"])
+        ids = products.get_product_ids_many(["dtg-ps-1", "NOPE"])
+    assert details == {PRODUCT["Id"]: ("DTG-PS-1", 10.0, "Cart"), "a1X000000000009": UNKNOWN_PRODUCT}
+    assert ids == {"dtg-ps-1": PRODUCT["Id"], "NOPE": None}
+    assert by_id == [["a1X000000000009"]] and by_name == [["NOPE"]]
+
+    # A reload forgets the misses (the product may exist now)
+    products.refresh()
+    products.get_product_details_many(["a1X000000000009"])
+    assert len(by_id) == 2
@@ -0,0 +1,12 @@
+from compression import CompressedBodyCache
+
+
+def test_cache_stays_within_its_byte_budget():
+    cache = CompressedBodyCache(size=64, max_bytes=10_000)
+    for i in range(10):
+        cache.put(i, bytes(3000))
+    assert cache._bytes == sum(len(body) for body in cache._entries.values()) <= 10_000
+    assert cache.get(9) is not None and cache.get(0) is None
+
+    cache.put("huge", bytes(20_000))   # bigger than the whole budget: not kept
+    assert cache.get("huge") is None and cache.get(9) is not None
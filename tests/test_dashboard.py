@@ -0,0 +1,35 @@
+import time
+import dashboard
+from dashboard import DashboardCache, load_dashboard
+
+SITE = "Amazon LAX9"
+
+
+def _account(open_orders):
+    return {"Id": "001000000000000001", "Name": SITE, "PS_Cart_Count__c": 3,
+            dashboard.ORDERS_RELATIONSHIP: {"totalSize": open_orders, "records": []}}
+
+
+def test_invalidate_during_load_keeps_stale_body_out(monkeypatch):
+    cache = DashboardCache(ttl=900)
+    monkeypatch.setattr(dashboard, "dashboard_cache", cache)
+    open_orders = [1]
+
+    def slow_query(soql):
+        # A new order is created (and the site invalidated) while this query is in flight
+        result = {"records": [_account(open_orders[0])]}
+        time.sleep(0.01)
+        open_orders[0] = 2
+        cache.invalidate(SITE)
+        return result
+
+    monkeypatch.setattr(dashboard, "query", slow_query)
+    body, age = load_dashboard(SITE)
+    assert body["part1"]["order"] == 1 and age == 0.0
+    assert cache.get(SITE) is None
+
+    # The next load is not raced and is cached
+    monkeypatch.setattr(dashboard, "query", lambda soql: {"records": [_account(open_orders[0])]})
+    body, _ = load_dashboard(SITE)
+    assert body["part1"]["order"] == 2
+    assert cache.get(SITE)["part1"]["order"] == 2
@@ -0,0 +1,25 @@
+import exports
+
+ACCOUNT = {"Name": "Amazon LAX9", "ShippingStreet": "1 Main St", "ShippingCity": "Eastvale"}
+
+
+def _quote(i):
+    return {"Id": f"a0Q{i:015d}", "Name": f"SQ-{i:03d}", "gii__Status__c": "Open",
+            "gii__QuoteDate__c": "2026-01-01", "gii__Account__r": ACCOUNT}
+
+
+def test_account_export_is_capped_and_reports_truncation(monkeypatch):
+    queries = []
+
+    def fake_query_all(soql):
+        queries.append(soql)
+        if "FROM gii__SalesQuote__c" in soql:
+            return [_quote(i) for i in range(exports.MAX_BULK_QUOTES + 1)]
+        return []
+
+    monkeypatch.setattr(exports, "query_all", fake_query_all)
+    monkeypatch.setattr(exports.product_catalog, "get_product_details_many", lambda ids: {})
+    pdf_data, missing, truncated = exports.load_quotes_pdf_data(account_id="001000000000000001")
+
+    assert queries[0].endswith(f"LIMIT {exports.MAX_BULK_QUOTES + 1}")
+    assert len(pdf_data) == exports.MAX_BULK_QUOTES and missing == [] and truncated
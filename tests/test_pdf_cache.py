@@ -0,0 +1,20 @@
+import os
+from pdf_cache import PdfCache
+
+
+def _disk_usage(directory):
+    return sum(entry.stat().st_size for entry in os.scandir(directory) if entry.name.endswith(".pdf"))
+
+
+def test_workers_sharing_a_directory_stay_within_one_budget(tmp_path):
+    budget = 10_000
+    # Two gunicorn workers: separate processes, one cache directory
+    workers = [PdfCache(0, str(tmp_path), budget), PdfCache(0, str(tmp_path), budget)]
+    for i in range(20):
+        workers[i % 2].put(f"{i:064x}", b"%PDF-" + bytes(3000))
+        assert _disk_usage(tmp_path) <= budget
+
+    # The newest PDFs are the ones kept, whichever worker wrote them
+    assert workers[0].get(f"{19:064x}") is not None
+    assert workers[1].get(f"{18:064x}") is not None
+    assert workers[0].get(f"{0:064x}") is None
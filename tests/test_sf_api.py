@@ -0,0 +1,34 @@
+import pytest
+import sf_api
+from sf_api import create_sales_quote_with_lines, QuoteGraphError
+
+
+class _Response:
+    def __init__(self, body):
+        self._body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._body
+
+
+def test_rejected_line_rolls_back_the_quote_and_names_the_line(monkeypatch):
+    halted = [{"errorCode": "PROCESSING_HALTED", "message": "The transaction was rolled back"}]
+    graph = {"graphId": "quote", "isSuccessful": False, "graphResponse": {"compositeResponse": [
+        {"referenceId": "quote", "httpStatusCode": 400, "body": halted},
+        {"referenceId": "line0", "httpStatusCode": 400, "body": halted},
+        {"referenceId": "line1", "httpStatusCode": 400, "body": [
+            {"errorCode": "FIELD_CUSTOM_VALIDATION_EXCEPTION", "message": "Quantity must be positive"}]},
+        {"referenceId": "quoteInfo", "httpStatusCode": 400, "body": halted},
+    ]}}
+    monkeypatch.setattr(sf_api, "salesforce_request", lambda *a, **k: _Response({"graphs": [graph]}))
+
+    lines = [{"gii__Product__c": "a1", "gii__OrderQuantity__c": 1},
+             {"gii__Product__c": "a2", "gii__OrderQuantity__c": -1}]
+    with pytest.raises(QuoteGraphError) as raised:
+        create_sales_quote_with_lines({"gii__Account__c": "001"}, lines)
+    assert raised.value.errors == ["line1: FIELD_CUSTOM_VALIDATION_EXCEPTION: Quantity must be positive"]
+    assert raised.value.failures == [{"node": "line1", "errorCode": "FIELD_CUSTOM_VALIDATION_EXCEPTION",
+                                      "message": "Quantity must be positive"}]
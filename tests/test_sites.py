@@ -0,0 +1,28 @@
+import sites
+from sites import AccountNameMirror
+
+PILLPACK = ["Pillpack MAN1", "Pillpack PAU2", "PillPack PSE1"]
+
+
+def _account(i, name):
+    return {"Id": f"001{i:015d}", "Name": name, "LastModifiedDate": "2026-01-01T00:00:00.000+0000"}
+
+
+def test_mirror_keeps_non_amazon_sites(monkeypatch):
+    queries = []
+
+    def fake_query_all(soql):
+        queries.append(soql)
+        return [_account(i, name) for i, name in enumerate(sites.ALL_SITES)] + [_account(9999, "Acme Corp")]
+
+    monkeypatch.setattr(sites, "query_all", fake_query_all)
+    mirror = AccountNameMirror(interval=60, full_reload=86400)
+    mirror.refresh()
+
+    assert "Name LIKE 'pillpack %'" in queries[0]
+    names = mirror.site_names()
+    assert sorted(names) == sorted(sites.ALL_SITES)
+    assert "Acme Corp" not in names
+    assert set(PILLPACK) <= set(mirror.index().rank("pillpack"))
+    for name in PILLPACK:
+        assert name in mirror.index().rank(name)